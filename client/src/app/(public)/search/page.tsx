@@ -70,7 +70,7 @@ function SearchResultsContent() {
                       {item.title}
                     </div>
                     <div className="text-xs text-muted-foreground line-clamp-2 mt-1">
-                      {item.snippet}
+                      <HighlightedSnippet snippet={item.snippet} highlights={item.highlights} />
                     </div>
                   </a>
                 </li>
@@ -100,6 +100,21 @@ function SearchResultsFallback() {
   )
 }
 
+function HighlightedSnippet({ snippet, highlights = [] }: Pick<SearchResult, "snippet" | "highlights">) {
+  // Offsets count characters (code points), not UTF-16 units
+  const chars = Array.from(snippet)
+  const parts: React.ReactNode[] = []
+  let last = 0
+  highlights.forEach(([start, end], i) => {
+    if (start < last) return
+    parts.push(chars.slice(last, start).join(""))
+    parts.push(<mark key={i} className="bg-transparent font-semibold text-foreground">{chars.slice(start, end).join("")}</mark>)
+    last = end
+  })
+  parts.push(chars.slice(last).join(""))
+  return <>{parts}</>
+}
+
 function getResultUrl(item: SearchResult): string {
   switch (item.type) {
     case "article":
@@ -116,6 +131,9 @@ function getResultUrl(item: SearchResult): string {
         .trim()
         .replace(/\s+/g, '-')
       return `/products/${fallback}`
+    case "user":
+      // Only admins get user results
+      return "/dashboard/admin/users"
     default:
       return "/"
   }
@@ -48,10 +48,14 @@ export class AuthAPI {
   /**
    * Upgrade user role
    */
-  static async upgradeRole(newRole: UserRole): Promise<ApiResponse> {
-    const response = await apiClient.post<ApiResponse>('/auth/role-upgrade', {
+  static async upgradeRole(newRole: UserRole): Promise<ApiResponse<{ access_token?: string }>> {
+    const response = await apiClient.post<ApiResponse<{ access_token?: string }>>('/auth/role-upgrade', {
       new_role: newRole
     })
+    // The previous token still carries the old role; switch to the reissued one
+    if (response.data.data?.access_token) {
+      tokenUtils.setToken(response.data.data.access_token)
+    }
     return response.data
   }
 
@@ -1,10 +1,12 @@
 import { apiClient } from './client'
 
 export interface SearchResult {
-    type: 'article' | 'course' | 'product'
+    type: 'article' | 'course' | 'product' | 'user'
     id: number
     title: string
     snippet: string
+    /** [start, end) offsets, in characters, of the matched words in snippet */
+    highlights?: [number, number][]
     slug?: string
 }
 
@@ -30,6 +30,7 @@ if config.config_file_name is not None:
 
 # Import your models' metadata here
 from app.models.base import Base
+from app.models.search_index import is_search_index_object
 target_metadata = Base.metadata
 
 # Get the naming convention from metadata
@@ -49,6 +50,9 @@ def include_object(object, name, type_, reflected, compare_to):
     # Example: ignore alembic_version table (Alembic manages it)
     if type_ == "table" and name == "alembic_version":
         return False
+    # full-text search columns, indexes and FTS5 tables are created by DDL, not mapped
+    if reflected and compare_to is None and is_search_index_object(name):
+        return False
     # ignore SQLAlchemy internal tables or those in pg_catalog
     return True
 
@@ -0,0 +1,39 @@
+"""token_revocation_sync_indexes
+
+Revision ID: 07fb586e899a
+Revises: 9721a89c2111
+Create Date: 2026-10-17 10:02:37.540193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '07fb586e899a'
+down_revision: Union[str, Sequence[str], None] = '9721a89c2111'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Incremental revocation sync reads by revoked_at watermark and prunes by expires_at
+    op.create_index('ix_token_blacklist_revoked_at', 'token_blacklist', ['revoked_at'], unique=False)
+    op.create_index('ix_token_blacklist_expires_at', 'token_blacklist', ['expires_at'], unique=False)
+
+    # Only users whose tokens were invalidated are read by the sync
+    op.create_index(
+        'ix_users_token_version_nonzero', 'users', ['token_version'], unique=False,
+        postgresql_where=sa.text('token_version > 0'),
+        sqlite_where=sa.text('token_version > 0'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_token_version_nonzero', table_name='users')
+    op.drop_index('ix_token_blacklist_expires_at', table_name='token_blacklist')
+    op.drop_index('ix_token_blacklist_revoked_at', table_name='token_blacklist')
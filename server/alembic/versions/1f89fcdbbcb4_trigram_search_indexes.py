@@ -0,0 +1,55 @@
+"""trigram_search_indexes
+
+Revision ID: 1f89fcdbbcb4
+Revises: b7f2fa86e0c9
+Create Date: 2026-10-17 17:48:12.903114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1f89fcdbbcb4'
+down_revision: Union[str, Sequence[str], None] = 'b7f2fa86e0c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# table -> columns searched by substring from admin filters
+TRIGRAM_COLUMNS = {
+    'users': ['email', 'full_name', 'username'],
+    'courses': ['title', 'description'],
+    'articles': ['title'],
+    'products': ['name', 'description'],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Trigram GIN indexes serve ILIKE '%term%' and the similarity operators;
+    # other dialects keep scanning
+    if op.get_context().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    with op.get_context().autocommit_block():
+        for table, columns in TRIGRAM_COLUMNS.items():
+            for column in columns:
+                op.execute(
+                    f'CREATE INDEX CONCURRENTLY ix_{table}_{column}_trgm ON {table} '
+                    f'USING gin ({column} gin_trgm_ops)'
+                )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        for table, columns in TRIGRAM_COLUMNS.items():
+            for column in columns:
+                op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_{column}_trgm')
+    # pg_trgm is left installed; other objects may depend on it
@@ -0,0 +1,46 @@
+"""keyset_pagination_indexes
+
+Revision ID: 23ee8982cfb9
+Revises: 07fb586e899a
+Create Date: 2026-10-17 04:11:16.757097
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '23ee8982cfb9'
+down_revision: Union[str, Sequence[str], None] = '07fb586e899a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Composite (sort column, id) indexes backing keyset pagination; the
+    # leading filter column lets each list seek within its WHERE clause
+    op.create_index('ix_courses_status_created_at_id', 'courses', ['status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_products_status_created_at_id', 'products', ['status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_articles_status_created_at_id', 'articles', ['status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+    op.create_index('ix_enrollments_enrolled_at_id', 'enrollments', ['enrolled_at', 'id'], unique=False)
+    op.create_index('ix_orders_buyer_id_created_at_id', 'orders', ['buyer_id', 'created_at', 'id'], unique=False)
+    op.create_index(
+        'ix_role_applications_user_id_applied_at_id', 'role_applications',
+        ['user_id', 'applied_at', 'id'], unique=False,
+    )
+    op.create_index('ix_role_applications_applied_at_id', 'role_applications', ['applied_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_role_applications_applied_at_id', table_name='role_applications')
+    op.drop_index('ix_role_applications_user_id_applied_at_id', table_name='role_applications')
+    op.drop_index('ix_orders_buyer_id_created_at_id', table_name='orders')
+    op.drop_index('ix_enrollments_enrolled_at_id', table_name='enrollments')
+    op.drop_index('ix_users_created_at_id', table_name='users')
+    op.drop_index('ix_articles_status_created_at_id', table_name='articles')
+    op.drop_index('ix_products_status_created_at_id', table_name='products')
+    op.drop_index('ix_courses_status_created_at_id', table_name='courses')
@@ -0,0 +1,68 @@
+"""query_shaped_composite_indexes
+
+Revision ID: 50a51b3a277f
+Revises: 23ee8982cfb9
+Create Date: 2026-10-17 14:32:08.415620
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '50a51b3a277f'
+down_revision: Union[str, Sequence[str], None] = '23ee8982cfb9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, single-column index it makes redundant)
+INDEXES = [
+    # Seller analytics join order_items to products by product_id and count
+    # distinct order_id; both come from the index
+    ('ix_order_items_product_id_order_id', 'order_items', ['product_id', 'order_id'], 'ix_order_items_product_id'),
+    # Public catalog filtered by category / by seller, newest first
+    (
+        'ix_products_status_category_created_at_id', 'products',
+        ['status', 'category', 'created_at', 'id'], None,
+    ),
+    (
+        'ix_products_seller_id_status_created_at_id', 'products',
+        ['seller_id', 'status', 'created_at', 'id'], 'ix_products_seller_id',
+    ),
+    # Mentor dashboard lists a mentor's courses newest first
+    ('ix_courses_mentor_id_created_at_id', 'courses', ['mentor_id', 'created_at', 'id'], 'ix_courses_mentor_id'),
+    # Public article list filtered by author
+    (
+        'ix_articles_author_id_status_created_at_id', 'articles',
+        ['author_id', 'status', 'created_at', 'id'], 'ix_articles_author_id',
+    ),
+    # Admin review queue filtered by status (pending first of all)
+    (
+        'ix_role_applications_status_applied_at_id', 'role_applications',
+        ['status', 'applied_at', 'id'], 'ix_role_applications_status',
+    ),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps the tables writable while Postgres builds the
+    # indexes; it cannot run inside a transaction. Other dialects ignore it.
+    with op.get_context().autocommit_block():
+        for name, table, columns, _ in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+        for _, table, _, replaced in INDEXES:
+            if replaced:
+                op.drop_index(replaced, table_name=table, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for _, table, columns, replaced in reversed(INDEXES):
+            if replaced:
+                op.create_index(replaced, table, columns[:1], unique=False, postgresql_concurrently=True)
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,44 @@
+"""revoked_users
+
+Revision ID: 5d1c7e9a04b2
+Revises: 1f89fcdbbcb4
+Create Date: 2026-10-17 16:20:11.402317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1c7e9a04b2'
+down_revision: Union[str, Sequence[str], None] = '1f89fcdbbcb4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Deleted users whose tokens every process must reject until they expire
+    op.create_table('revoked_users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('revocation_reason', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_revoked_users_id', 'revoked_users', ['id'], unique=False)
+    op.create_index('ix_revoked_users_user_id', 'revoked_users', ['user_id'], unique=False)
+    op.create_index('ix_revoked_users_expires_at', 'revoked_users', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_revoked_users_expires_at', table_name='revoked_users')
+    op.drop_index('ix_revoked_users_user_id', table_name='revoked_users')
+    op.drop_index('ix_revoked_users_id', table_name='revoked_users')
+    op.drop_table('revoked_users')
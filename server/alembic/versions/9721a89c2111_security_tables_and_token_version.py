@@ -0,0 +1,123 @@
+"""security_tables_and_token_version
+
+Revision ID: 9721a89c2111
+Revises: 6c22d8219c48
+Create Date: 2026-10-17 09:12:04.118702
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9721a89c2111'
+down_revision: Union[str, Sequence[str], None] = '6c22d8219c48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Token version signed into access tokens (claims-only auth)
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.add_column(
+            sa.Column('token_version', sa.Integer(), server_default='0', nullable=False)
+        )
+
+    # Token blacklist table
+    op.create_table('token_blacklist',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('token', sa.String(), nullable=False),
+        sa.Column('token_type', sa.String(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('revocation_reason', sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_token_blacklist_id', 'token_blacklist', ['id'], unique=False)
+    op.create_index('ix_token_blacklist_token', 'token_blacklist', ['token'], unique=True)
+
+    # Login attempts table
+    op.create_table('login_attempts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('ip_address', sa.String(), nullable=False),
+        sa.Column('user_agent', sa.String(), nullable=True),
+        sa.Column('successful', sa.Boolean(), nullable=False),
+        sa.Column('attempted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('failure_reason', sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_login_attempts_email', 'login_attempts', ['email'], unique=False)
+    op.create_index('ix_login_attempts_id', 'login_attempts', ['id'], unique=False)
+
+    # Password history table
+    op.create_table('password_history',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('hashed_password', sa.String(), nullable=False),
+        sa.Column('set_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('set_by', sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_password_history_id', 'password_history', ['id'], unique=False)
+
+    # User sessions table
+    op.create_table('user_sessions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('session_token', sa.String(), nullable=False),
+        sa.Column('device_info', sa.JSON(), nullable=True),
+        sa.Column('ip_address', sa.String(), nullable=False),
+        sa.Column('user_agent', sa.String(), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('last_activity', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_user_sessions_id', 'user_sessions', ['id'], unique=False)
+    op.create_index('ix_user_sessions_session_token', 'user_sessions', ['session_token'], unique=True)
+
+    # Security events table
+    op.create_table('security_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('event_type', sa.String(), nullable=False),
+        sa.Column('severity', sa.String(), nullable=False),
+        sa.Column('ip_address', sa.String(), nullable=False),
+        sa.Column('user_agent', sa.String(), nullable=True),
+        sa.Column('details', sa.JSON(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_security_events_id', 'security_events', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('security_events')
+    op.drop_table('user_sessions')
+    op.drop_table('password_history')
+    op.drop_table('login_attempts')
+    op.drop_table('token_blacklist')
+
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('token_version')
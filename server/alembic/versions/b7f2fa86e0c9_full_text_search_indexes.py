@@ -0,0 +1,81 @@
+"""full_text_search_indexes
+
+Revision ID: b7f2fa86e0c9
+Revises: 50a51b3a277f
+Create Date: 2026-10-17 16:05:41.208337
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7f2fa86e0c9'
+down_revision: Union[str, Sequence[str], None] = '50a51b3a277f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# table -> (column, tsvector weight), as of this revision
+SEARCH_COLUMNS = {
+    'articles': [('title', 'A'), ('excerpt', 'B'), ('content', 'C')],
+    'courses': [('title', 'A'), ('short_description', 'B'), ('description', 'C')],
+    'products': [('name', 'A'), ('description', 'C')],
+}
+
+
+def upgrade_postgresql() -> None:
+    for table, columns in SEARCH_COLUMNS.items():
+        vector = ' || '.join(
+            f"setweight(to_tsvector('english', coalesce({column}, '')), '{weight}')"
+            for column, weight in columns
+        )
+        # Adding a stored generated column rewrites the table
+        op.execute(f'ALTER TABLE {table} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({vector}) STORED')
+
+    with op.get_context().autocommit_block():
+        for table in SEARCH_COLUMNS:
+            op.execute(f'CREATE INDEX CONCURRENTLY ix_{table}_search_vector ON {table} USING gin (search_vector)')
+
+
+def upgrade_sqlite() -> None:
+    for table, columns in SEARCH_COLUMNS.items():
+        fts = f'{table}_fts'
+        names = ', '.join(column for column, _ in columns)
+        new_values = ', '.join(f'new.{column}' for column, _ in columns)
+        old_values = ', '.join(f'old.{column}' for column, _ in columns)
+        delete = f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values});"
+        insert = f'INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values});'
+
+        op.execute(
+            f"CREATE VIRTUAL TABLE {fts} USING fts5({names}, content='{table}', content_rowid='id', "
+            "tokenize='porter unicode61')"
+        )
+        op.execute(f'CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN {insert} END')
+        op.execute(f'CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN {delete} END')
+        op.execute(f'CREATE TRIGGER {fts}_au AFTER UPDATE OF {names} ON {table} BEGIN {delete} {insert} END')
+        # Index the rows that already exist
+        op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_context().dialect.name
+    if dialect == 'postgresql':
+        upgrade_postgresql()
+    elif dialect == 'sqlite':
+        upgrade_sqlite()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_context().dialect.name
+    for table in reversed(list(SEARCH_COLUMNS)):
+        if dialect == 'postgresql':
+            op.execute(f'DROP INDEX IF EXISTS ix_{table}_search_vector')
+            op.execute(f'ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector')
+        elif dialect == 'sqlite':
+            for suffix in ('au', 'ad', 'ai'):
+                op.execute(f'DROP TRIGGER IF EXISTS {table}_fts_{suffix}')
+            op.execute(f'DROP TABLE IF EXISTS {table}_fts')
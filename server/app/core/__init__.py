@@ -1,13 +1,19 @@
-from .security import (
-    verify_password,
-    get_password_hash, 
-    create_access_token,
-    verify_token
-)
-
+# Security helpers are re-exported lazily so that importing a light module
+# such as `app.core.config` does not load jose and passlib.
 __all__ = [
     "verify_password",
     "get_password_hash",
+    "verify_password_async",
+    "verify_and_update_password",
+    "verify_and_update_password_async",
+    "get_password_hash_async",
     "create_access_token", 
     "verify_token"
 ]
+
+
+def __getattr__(name: str):
+    if name in __all__:
+        from . import security
+        return getattr(security, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
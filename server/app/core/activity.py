@@ -0,0 +1,350 @@
+"""
+Write-behind recording of security activity for KFATS LMS application.
+Login attempts, security events and session activity are buffered in memory
+and written in batches so logins and authenticated requests never wait on
+these INSERT/UPDATE round trips.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, insert, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.core.config import settings
+from app.models.security import LoginAttempt, SecurityEvent, UserSession
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityRecorder:
+    """
+    Buffers activity rows and flushes them by size or time.
+
+    Each flush writes each buffered table with a multi-row INSERT per batch,
+    all in a single transaction. Session activity is coalesced per session
+    token so a busy session costs one UPDATE row per flush however many
+    requests it made; sessions whose token is already recorded are skipped.
+    If the database rejects the batch (an integrity or data error, e.g. a
+    row for a user deleted since it was queued), the tables are written
+    separately and the failing one row by row, dropping and logging the
+    rejected rows so they cannot block later flushes. Rows that could not
+    be written for other reasons are kept for the next flush up to
+    ``settings.activity_max_buffered``; beyond that new rows are dropped.
+    """
+
+    def __init__(self) -> None:
+        self.login_attempts: List[Dict[str, Any]] = []
+        self.security_events: List[Dict[str, Any]] = []
+        self.new_sessions: Dict[str, Dict[str, Any]] = {}
+        self.touched_sessions: Dict[str, datetime] = {}
+        self.ended_sessions: Dict[str, datetime] = {}
+        self.flushed = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.last_flush_ms = 0.0
+        self._flush_requested: Optional[asyncio.Event] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    def pending(self) -> int:
+        return (
+            len(self.login_attempts) + len(self.security_events) + len(self.new_sessions)
+            + len(self.touched_sessions) + len(self.ended_sessions)
+        )
+
+    def _accept(self) -> bool:
+        pending = self.pending()
+        if pending >= settings.activity_max_buffered:
+            self.dropped += 1
+            return False
+        if pending + 1 >= settings.activity_flush_batch_size and self._flush_requested:
+            self._flush_requested.set()
+        return True
+
+    def record_login_attempt(
+        self,
+        email: str,
+        ip_address: str,
+        user_agent: Optional[str],
+        successful: bool,
+        user_id: Optional[int] = None,
+        failure_reason: Optional[str] = None,
+    ) -> None:
+        """Queue a `login_attempts` row."""
+        if not self._accept():
+            return
+        now = datetime.now(timezone.utc)
+        self.login_attempts.append({
+            "user_id": user_id,
+            "email": email,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "successful": successful,
+            "attempted_at": now,
+            "failure_reason": failure_reason,
+            "created_at": now,
+            "updated_at": now,
+        })
+
+    def record_security_event(
+        self,
+        event_type: str,
+        ip_address: str,
+        user_agent: Optional[str] = None,
+        user_id: Optional[int] = None,
+        severity: str = "low",
+        details: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Queue a `security_events` row."""
+        if not self._accept():
+            return
+        now = datetime.now(timezone.utc)
+        self.security_events.append({
+            "user_id": user_id,
+            "event_type": event_type,
+            "severity": severity,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "details": details,
+            "created_at": now,
+            "updated_at": now,
+        })
+
+    def start_session(
+        self,
+        session_token: str,
+        user_id: int,
+        ip_address: str,
+        user_agent: Optional[str],
+        expires_in_seconds: int,
+    ) -> None:
+        """Queue a `user_sessions` row for a newly issued token."""
+        if not self._accept():
+            return
+        now = datetime.now(timezone.utc)
+        self.new_sessions[session_token] = {
+            "user_id": user_id,
+            "session_token": session_token,
+            "device_info": None,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "expires_at": now + timedelta(seconds=expires_in_seconds),
+            "last_activity": now,
+            "is_active": True,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+    def touch_session(self, session_token: str) -> None:
+        """Record activity on a session; repeated touches coalesce."""
+        now = datetime.now(timezone.utc)
+        pending = self.new_sessions.get(session_token)
+        if pending is not None:
+            pending["last_activity"] = now
+        elif session_token in self.ended_sessions:
+            return
+        elif session_token in self.touched_sessions or self._accept():
+            self.touched_sessions[session_token] = now
+
+    def end_session(self, session_token: str) -> None:
+        """Mark a session inactive (e.g. on logout)."""
+        now = datetime.now(timezone.utc)
+        pending = self.new_sessions.get(session_token)
+        if pending is not None:
+            pending["last_activity"] = now
+            pending["is_active"] = False
+            return
+        self.touched_sessions.pop(session_token, None)
+        self.ended_sessions[session_token] = now
+
+    async def flush(self) -> int:
+        """Write all buffered rows; returns the number of rows written."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if not self.pending():
+                return 0
+
+            attempts, self.login_attempts = self.login_attempts, []
+            events, self.security_events = self.security_events, []
+            sessions, self.new_sessions = self.new_sessions, {}
+            touched, self.touched_sessions = self.touched_sessions, {}
+            ended, self.ended_sessions = self.ended_sessions, {}
+
+            from app.core.database import AsyncSessionLocal
+
+            groups = [
+                (_write_login_attempts, attempts),
+                (_write_security_events, events),
+                (_write_new_sessions, list(sessions.values())),
+                (_write_touched_sessions, list(touched.items())),
+                (_write_ended_sessions, list(ended.items())),
+            ]
+            start = time.perf_counter()
+            try:
+                async with AsyncSessionLocal() as db:
+                    for write, rows in groups:
+                        if rows:
+                            await write(db, rows)
+                    await db.commit()
+                written = sum(len(rows) for _, rows in groups)
+            except (IntegrityError, DataError):
+                logger.warning("Activity batch rejected; writing tables separately to isolate bad rows")
+                written = await self._write_isolated(groups)
+            except Exception:
+                logger.exception("Activity flush failed; keeping rows for retry")
+                self._requeue(attempts, events, sessions, touched, ended)
+                return 0
+
+            self.last_flush_ms = (time.perf_counter() - start) * 1000
+            self.flushed += written
+            return written
+
+    async def _write_isolated(self, groups) -> int:
+        """Write each table on its own, dropping rows the database rejects.
+
+        A table whose batch is rejected is retried one row per transaction.
+        On any other error the rows not yet written are requeued.
+        """
+        from app.core.database import AsyncSessionLocal
+
+        written = 0
+        for index, (write, rows) in enumerate(groups):
+            if not rows:
+                continue
+            try:
+                async with AsyncSessionLocal() as db:
+                    await write(db, rows)
+                    await db.commit()
+                written += len(rows)
+                continue
+            except (IntegrityError, DataError):
+                pass
+            except Exception:
+                logger.exception("Activity flush failed; keeping rows for retry")
+                self._requeue_groups(groups[index:])
+                return written
+
+            for position, row in enumerate(rows):
+                try:
+                    async with AsyncSessionLocal() as db:
+                        await write(db, [row])
+                        await db.commit()
+                    written += 1
+                except (IntegrityError, DataError) as exc:
+                    self.rejected += 1
+                    logger.error(
+                        "Dropping %s row rejected by the database: %s", write.__name__[len("_write_"):], exc.orig
+                    )
+                except Exception:
+                    logger.exception("Activity flush failed; keeping rows for retry")
+                    self._requeue_groups([(write, rows[position:]), *groups[index + 1:]])
+                    return written
+        return written
+
+    def _requeue_groups(self, groups) -> None:
+        remaining = {write: rows for write, rows in groups}
+        self._requeue(
+            remaining.get(_write_login_attempts, []),
+            remaining.get(_write_security_events, []),
+            {row["session_token"]: row for row in remaining.get(_write_new_sessions, [])},
+            dict(remaining.get(_write_touched_sessions, [])),
+            dict(remaining.get(_write_ended_sessions, [])),
+        )
+
+    def _requeue(self, attempts, events, sessions, touched, ended) -> None:
+        self.login_attempts = attempts + self.login_attempts
+        self.security_events = events + self.security_events
+        self.new_sessions = {**sessions, **self.new_sessions}
+        self.touched_sessions = {**touched, **self.touched_sessions}
+        self.ended_sessions = {**ended, **self.ended_sessions}
+
+        overflow = self.pending() - settings.activity_max_buffered
+        if overflow > 0:
+            # Shed the oldest touches first; they are the least valuable rows
+            for token in list(self.touched_sessions)[:overflow]:
+                del self.touched_sessions[token]
+            self.dropped += overflow
+
+    async def run(self, interval_seconds: float) -> None:
+        """Flush every `interval_seconds`, or sooner when a batch fills, until cancelled."""
+        self._flush_requested = asyncio.Event()
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            # Shielded so cancellation at shutdown cannot lose a batch mid-write
+            await asyncio.shield(self.flush())
+
+    def stats(self) -> Dict[str, Any]:
+        """Return buffer depth and flush counters for monitoring."""
+        return {
+            "pending": self.pending(),
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+        }
+
+
+async def _insert_batches(
+    db, model, rows: List[Dict[str, Any]], unique_column: Optional[str] = None
+) -> None:
+    # One multi-row INSERT per batch keeps bind parameters under driver limits
+    size = max(1, settings.activity_flush_batch_size)
+    table = model.__table__
+    dialect = db.get_bind().dialect.name
+    for i in range(0, len(rows), size):
+        if unique_column and dialect in ("postgresql", "sqlite"):
+            # Rows already recorded under the same key are skipped
+            dialect_insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+            stmt = dialect_insert(table).values(rows[i:i + size]).on_conflict_do_nothing(
+                index_elements=[unique_column]
+            )
+        else:
+            stmt = insert(table).values(rows[i:i + size])
+        await db.execute(stmt)
+
+
+async def _write_login_attempts(db, rows: List[Dict[str, Any]]) -> None:
+    await _insert_batches(db, LoginAttempt, rows)
+
+
+async def _write_security_events(db, rows: List[Dict[str, Any]]) -> None:
+    await _insert_batches(db, SecurityEvent, rows)
+
+
+async def _write_new_sessions(db, rows: List[Dict[str, Any]]) -> None:
+    # Logins within the same second for one user issue the same JWT
+    await _insert_batches(db, UserSession, rows, unique_column="session_token")
+
+
+async def _write_touched_sessions(db, items: List[Tuple[str, datetime]]) -> None:
+    await db.execute(_session_update(), [{"b_token": token, "b_seen": seen} for token, seen in items])
+
+
+async def _write_ended_sessions(db, items: List[Tuple[str, datetime]]) -> None:
+    await db.execute(
+        _session_update().values(is_active=False),
+        [{"b_token": token, "b_seen": seen} for token, seen in items],
+    )
+
+
+def _session_update():
+    table = UserSession.__table__
+    return (
+        update(table)
+        .where(table.c.session_token == bindparam("b_token"))
+        .values(last_activity=bindparam("b_seen"), updated_at=bindparam("b_seen"))
+    )
+
+
+activity_recorder = ActivityRecorder()
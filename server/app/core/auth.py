@@ -7,6 +7,10 @@ from .security import *
 __all__ = [
     "verify_password",
     "get_password_hash", 
+    "verify_password_async",
+    "verify_and_update_password",
+    "verify_and_update_password_async",
+    "get_password_hash_async",
     "create_access_token",
     "verify_token"
 ]
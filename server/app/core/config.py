@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Dict, Optional, List
 from pathlib import Path
 from pydantic_settings import BaseSettings
 
@@ -12,11 +12,63 @@ class Settings(BaseSettings):
 
     # Database
     database_url: Optional[str] = None
+    # Connection pool, per worker process (in-memory SQLite has no pool)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0  # seconds to wait for a free connection
+    db_pool_recycle: int = 1800  # seconds; -1 keeps connections forever
+    db_pool_pre_ping: bool = True  # test connections on checkout
+    # asyncpg prepared statement cache; set 0 behind PgBouncer transaction pooling
+    db_statement_cache_size: int = 100
+    # Optional read replica for read-only endpoints (same pool settings)
+    read_database_url: Optional[str] = None
+    read_your_writes_seconds: float = 5.0  # reads stay on the primary after a write
+    read_your_writes_max_clients: int = 10000
+    # Estimated list totals fall back to a count cached this long (0 disables)
+    pagination_count_cache_seconds: int = 60
 
     # Security - CRITICAL: Change these in production!
     secret_key: str = "CHANGE_THIS_SECRET_KEY_IN_PRODUCTION_TO_A_LONG_RANDOM_STRING_64_CHARS_MINIMUM"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 1440
+    token_cache_max_size: int = 10000
+
+    # Password hashing (runs on a dedicated thread pool)
+    password_hash_workers: int = 4
+    password_hash_max_in_flight: int = 32
+    password_hash_scheme: str = "bcrypt"  # bcrypt or argon2
+    password_bcrypt_rounds: int = 12
+    password_argon2_memory_cost: int = 65536  # KiB
+    password_argon2_time_cost: int = 3
+    password_argon2_parallelism: int = 2
+
+    # Principal cache for get_current_user (ttl <= 0 disables it)
+    principal_cache_ttl_seconds: int = 30
+    principal_cache_max_size: int = 10000
+
+    # Claims-only authorization for require_role/require_roles (no DB lookup)
+    auth_stateless_mode: bool = False
+    revocation_sync_interval_seconds: int = 30
+    revocation_full_sync_seconds: int = 3600
+    revocation_filter_capacity: int = 100000
+
+    # Global search backend: "database" (Postgres full-text / SQLite FTS5) or
+    # "memory" (in-process inverted index, see app.core.inverted_index)
+    search_backend: str = "database"
+    search_index_snapshot_path: str = "search_index.snapshot"  # empty disables snapshots
+    # Sync cadence of the memory backend and of the suggestion index
+    search_index_sync_interval_seconds: int = 30
+    search_index_full_sync_seconds: int = 3600
+    # Per-type budget for multi-type searches; slower types are left out
+    search_type_timeout_seconds: float = 2.0
+    # Search result cache (ttl <= 0 disables it); see app.core.search_cache
+    search_cache_ttl_seconds: int = 60
+    search_cache_max_size: int = 5000
+
+    # Write-behind recording of login attempts, security events and sessions
+    activity_flush_interval_seconds: float = 5.0
+    activity_flush_batch_size: int = 500
+    activity_max_buffered: int = 20000  # rows beyond this are dropped
 
     # CORS
     cors_origins: str = "http://localhost:3000,https://kfats.vercel.app"
@@ -39,9 +91,21 @@ class Settings(BaseSettings):
     log_file: str = "logs/kfats.log"
     log_max_size: int = 10 * 1024 * 1024  # 10MB
     log_backup_count: int = 5
+    log_queue_size: int = 10000  # records beyond this are dropped, not blocked on
+    log_access_sample_rate: float = 1.0  # share of fast, successful requests logged
+    log_slow_request_ms: float = 1000.0  # slower requests are always logged
+    sql_query_count_threshold: int = 20  # requests issuing more are flagged query-heavy
+    sql_time_threshold_ms: float = 250.0  # requests spending longer in the DB are flagged
 
-    # Rate Limiting
+    # Rate Limiting (token bucket per client IP)
     rate_limit_requests_per_minute: int = 60
+    rate_limit_backend: str = "memory"  # memory or sqlite (shared by local workers)
+    rate_limit_sqlite_path: Optional[str] = None  # required by the sqlite backend
+    # How long a decision waits for another worker's lock (retried once, then denied)
+    rate_limit_sqlite_busy_timeout_ms: int = 5
+    rate_limit_max_keys: int = 10000
+    # Cost per request by path prefix; unmatched paths cost 1
+    rate_limit_route_costs: str = "/api/v1/auth/login=5,/api/v1/auth/register=5,/api/v1/password=3"
 
     class Config:
         # Load the repository `server/.env` file regardless of CWD
@@ -58,6 +122,16 @@ class Settings(BaseSettings):
         """Convert allowed image types string to list."""
         return [mime_type.strip() for mime_type in self.allowed_image_types.split(",")]
 
+    @property
+    def rate_limit_route_costs_map(self) -> Dict[str, float]:
+        """Convert `prefix=cost` pairs to a dict."""
+        costs = {}
+        for pair in self.rate_limit_route_costs.split(","):
+            if "=" in pair:
+                prefix, cost = pair.split("=", 1)
+                costs[prefix.strip()] = float(cost)
+        return costs
+
 
 settings = Settings()
 
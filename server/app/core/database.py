@@ -1,7 +1,12 @@
-from typing import AsyncGenerator, Generator, Optional, Tuple
+import hashlib
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, AsyncGenerator, Dict, Generator, Optional, Tuple
 from urllib.parse import parse_qsl, urlparse, urlunparse, urlencode
 
-from sqlalchemy import create_engine
+from fastapi import Depends, Request
+from sqlalchemy import create_engine, event, exc
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -10,7 +15,9 @@ from sqlalchemy.ext.asyncio import (
 )
 from sqlalchemy.orm import Session
 from sqlalchemy.orm import sessionmaker as sync_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 from app.models.base import Base
 
@@ -19,16 +26,24 @@ from app.models import (
     course,
     password_reset_token,
     product,
+    security,
     user,
 )
 
 __all__ = [
     "engine",
+    "read_engine",
     "AsyncSessionLocal",
-    "SessionLocal",
+    "AsyncReadSessionLocal",
+    "get_sync_engine",
+    "get_sync_sessionmaker",
     "get_async_db",
+    "get_async_read_db",
     "get_db",
     "create_tables",
+    "QueryStats",
+    "current_query_stats",
+    "pool_status",
 ]
 
 
@@ -72,38 +87,266 @@ def _make_async_url(url: str) -> Tuple[str, bool]:
 DATABASE_URL = settings.database_url or "sqlite+aiosqlite:///./test.db"
 ASYNC_DATABASE_URL, ssl_required = _make_async_url(DATABASE_URL)
 
-connect_args = {}
-if _is_postgres(DATABASE_URL):
-    connect_args = {"timeout": 10}
+
+
+def _connect_args(url: str, ssl_required: bool) -> Dict[str, Any]:
+    if not _is_postgres(url):
+        return {}
+    args: Dict[str, Any] = {"timeout": 10, "statement_cache_size": settings.db_statement_cache_size}
     if ssl_required:
-        connect_args["ssl"] = True
+        args["ssl"] = True
+    return args
 
 
-engine: AsyncEngine = create_async_engine(
-    ASYNC_DATABASE_URL,
-    echo=settings.debug,
-    pool_pre_ping=True,
-    connect_args=connect_args,
-)
+connect_args = _connect_args(DATABASE_URL, ssl_required)
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long checkouts wait for a connection.
+
+    A checkout waits when all ``pool_size + max_overflow`` connections are
+    in use; waits longer than ``pool_timeout`` raise and are counted as
+    timeouts. Counters start over if the pool is recreated.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.recent_waits: deque = deque(maxlen=1000)
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            wait = time.perf_counter() - start
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self.recent_waits.append(wait)
+
+
+def _create_pooled_engine(async_url: str, connect_args: Dict[str, Any]) -> AsyncEngine:
+    """Create an async engine with its own pool sized from settings."""
+    engine_kwargs: Dict[str, Any] = {"pool_pre_ping": settings.db_pool_pre_ping}
+    if ":memory:" not in async_url:
+        engine_kwargs.update(
+            poolclass=InstrumentedAsyncPool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+        )
+    return create_async_engine(
+        async_url,
+        echo=settings.debug,
+        connect_args=connect_args,
+        **engine_kwargs,
+    )
+
+
+engine: AsyncEngine = _create_pooled_engine(ASYNC_DATABASE_URL, connect_args)
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine, class_=AsyncSession, expire_on_commit=False
 )
 
+# Optional read replica with its own pool; without one, reads use the primary
+if settings.read_database_url:
+    _read_async_url, _read_ssl_required = _make_async_url(settings.read_database_url)
+    read_engine: AsyncEngine = _create_pooled_engine(
+        _read_async_url, _connect_args(settings.read_database_url, _read_ssl_required)
+    )
+else:
+    read_engine = engine
 
-SYNC_DATABASE_URL = DATABASE_URL.replace("+asyncpg", "").replace("+aiosqlite", "")
-sync_engine = create_engine(SYNC_DATABASE_URL, echo=settings.debug, pool_pre_ping=True)
-SessionLocal = sync_sessionmaker(
-    bind=sync_engine, autocommit=False, autoflush=False, class_=Session
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=read_engine, class_=AsyncSession, expire_on_commit=False
 )
 
+# Clients that committed a write recently, keyed by a hash of their
+# Authorization header. Their reads go to the primary until the entry
+# expires, so they see their own writes despite replica lag. Per process:
+# a client whose next request lands on another worker is not covered.
+recent_writers = TTLCache(
+    max_size=settings.read_your_writes_max_clients,
+    ttl=settings.read_your_writes_seconds,
+)
+
+
+SYNC_DATABASE_URL = DATABASE_URL.replace("+asyncpg", "").replace("+aiosqlite", "")
+
+# The sync engine (psycopg2 for Postgres) is only needed by `get_db` and
+# scripts, so it and its pool are created on first use rather than at import.
+_sync_engine = None
+_SessionLocal = None
+
+
+def get_sync_engine():
+    """Return the synchronous engine, creating it on first call."""
+    global _sync_engine
+    if _sync_engine is None:
+        _sync_engine = create_engine(
+            SYNC_DATABASE_URL, echo=settings.debug, pool_pre_ping=settings.db_pool_pre_ping
+        )
+        _listen_for_queries(_sync_engine)
+    return _sync_engine
+
+
+def get_sync_sessionmaker() -> sync_sessionmaker:
+    """Return the synchronous session factory, creating it on first call."""
+    global _SessionLocal
+    if _SessionLocal is None:
+        _SessionLocal = sync_sessionmaker(
+            bind=get_sync_engine(), autocommit=False, autoflush=False, class_=Session
+        )
+    return _SessionLocal
+
+
+def __getattr__(name: str):
+    # Keep `from app.core.database import sync_engine, SessionLocal` working;
+    # left out of __all__ so a star import does not create the engine
+    if name == "sync_engine":
+        return get_sync_engine()
+    if name == "SessionLocal":
+        return get_sync_sessionmaker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class QueryStats:
+    """SQL statement count and cumulative DB time for one request."""
+
+    __slots__ = ("request_id", "count", "duration")
+
+    def __init__(self, request_id: Optional[str] = None) -> None:
+        self.request_id = request_id
+        self.count = 0
+        self.duration = 0.0
 
-async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    @property
+    def duration_ms(self) -> float:
+        return round(self.duration * 1000, 2)
+
+
+# Set per request by RequestLoggingMiddleware; None outside a request
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_query_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_query_stats.get()
+    starts = conn.info.get("query_start_time")
+    if stats is None or not starts:
+        return
+    stats.count += 1
+    stats.duration += time.perf_counter() - starts.pop()
+
+
+def _listen_for_queries(target) -> None:
+    event.listen(target, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target, "after_cursor_execute", _after_cursor_execute)
+
+
+_listen_for_queries(engine.sync_engine)
+if read_engine is not engine:
+    _listen_for_queries(read_engine.sync_engine)
+
+
+def _writer_key(request: Request) -> Optional[str]:
+    authorization = request.headers.get("authorization")
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode("utf-8")).hexdigest()
+
+
+@event.listens_for(Session, "after_commit")
+def _record_recent_writer(session: Session) -> None:
+    # Set by get_async_db only when a replica is configured
+    writer_key = session.info.get("writer_key")
+    if writer_key:
+        recent_writers.set(writer_key, True)
+
+
+def _pool_stats(pool) -> Dict[str, Any]:
+    if not isinstance(pool, InstrumentedAsyncPool):
+        return {"pool_class": type(pool).__name__, "status": pool.status()}
+
+    waits = sorted(pool.recent_waits)
+
+    def wait_ms(seconds: float) -> float:
+        return round(seconds * 1000, 2)
+
+    return {
+        "pool_class": type(pool).__name__,
+        "size": pool.size(),
+        "max_overflow": settings.db_max_overflow,
+        "timeout_seconds": pool.timeout(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "checkouts": pool.checkouts,
+        "timeouts": pool.timeouts,
+        "wait_ms": {
+            "avg": wait_ms(pool.total_wait / pool.checkouts) if pool.checkouts else 0.0,
+            "p95_recent": wait_ms(waits[min(len(waits) - 1, int(len(waits) * 0.95))]) if waits else 0.0,
+            "max": wait_ms(pool.max_wait),
+        },
+    }
+
+
+def pool_status() -> Dict[str, Any]:
+    """Live state of the async engines' connection pools in this process."""
+    status = _pool_stats(engine.pool)
+    if read_engine is not engine:
+        status["replica"] = {
+            **_pool_stats(read_engine.pool),
+            "read_your_writes_clients": len(recent_writers),
+        }
+    return status
+
+
+async def get_async_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """Async FastAPI dependency that yields an AsyncSession.
 
     Use this in async endpoints / services that expect an AsyncSession.
+    With a read replica configured, a commit on this session opens the
+    caller's read-your-writes window (see `get_async_read_db`).
     """
     async with AsyncSessionLocal() as session:
+        if read_engine is not engine:
+            session.info["writer_key"] = _writer_key(request)
+        yield session
+
+
+async def get_async_read_db(
+    request: Request, primary: AsyncSession = Depends(get_async_db)
+) -> AsyncGenerator[AsyncSession, None]:
+    """Async FastAPI dependency that yields a session on the read replica.
+
+    For read-only endpoints. Yields the request's primary session when no
+    ``read_database_url`` is configured, and for callers that committed a
+    write within the last ``read_your_writes_seconds``.
+    """
+    if read_engine is engine:
+        yield primary
+        return
+
+    writer_key = _writer_key(request)
+    if writer_key and recent_writers.get(writer_key):
+        yield primary
+        return
+
+    async with AsyncReadSessionLocal() as session:
         yield session
 
 
@@ -113,7 +356,7 @@ def get_db() -> Generator[Session, None, None]:
     This preserves backwards compatibility for code that uses the sync ORM
     API (``db.query()``, ``db.commit()``, etc.).
     """
-    db = SessionLocal()
+    db = get_sync_sessionmaker()()
     try:
         yield db
     finally:
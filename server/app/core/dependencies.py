@@ -1,3 +1,4 @@
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from fastapi import HTTPException, status, Depends
@@ -5,32 +6,71 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.core.database import get_async_db
 from app.models.user import User as DBUser
 from app.schemas.user import User
+from app.schemas.auth import TokenPrincipal
 from app.schemas.common import UserRole, UserStatus
-from app.core.security import verify_token
+from app.core.security import verify_token, token_digest
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.revocation import revocation_list
+from app.core.activity import activity_recorder
 
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_async_db)
-) -> User:
-    """Get current authenticated user."""
+# Authenticated principals keyed by user id. Entries are dropped explicitly
+# by endpoints that change a user's identity and otherwise expire after a
+# short TTL (caches are per worker process).
+principal_cache = TTLCache(
+    max_size=settings.principal_cache_max_size,
+    ttl=settings.principal_cache_ttl_seconds,
+)
+
+
+def invalidate_principal(user_id: int, token_version: Optional[int] = None) -> None:
+    """Drop the cached principal for a user whose role/status/profile changed.
+
+    Pass the user's new ``token_version`` when the change must also
+    invalidate tokens already issued (claims-only auth).
+    """
+    principal_cache.pop(user_id)
+    if token_version is not None:
+        revocation_list.set_user_version(user_id, token_version)
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def _decode_credentials(credentials: HTTPAuthorizationCredentials, db: AsyncSession) -> dict:
+    """Verify the bearer token and reject it if it has been revoked."""
     token = credentials.credentials
     token_data = verify_token(token)
-    
+    digest = token_digest(token)
+    if await revocation_list.is_revoked(digest, db):
+        raise _unauthorized("Token has been revoked")
+    activity_recorder.touch_session(digest)
+    return token_data
+
+
+async def _load_user(token_data: dict, db: AsyncSession) -> User:
+    """Resolve the token's user from the principal cache or the database."""
+    cached_user = principal_cache.get(token_data["user_id"])
+    if cached_user is not None:
+        return cached_user
+
     result = await db.execute(
         select(DBUser).where(DBUser.id == token_data["user_id"])
     )
     user = result.scalars().first()
-    
+
     if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
+        raise _unauthorized("User not found")
+
     # Extract user data before session closes to avoid detached session issues
     user_data = {
         "id": user.id,
@@ -46,12 +86,34 @@ async def get_current_user(
         "updated_at": user.updated_at,
         "last_login": user.last_login,
     }
-    
-    return User.model_validate(user_data)
 
+    current_user = User.model_validate(user_data)
+    principal_cache.set(current_user.id, current_user)
+    return current_user
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
-    """Get current active user."""
+
+def _principal_from_claims(token_data: dict) -> Optional[TokenPrincipal]:
+    """Build a principal from verified claims, or None for older tokens.
+
+    Tokens issued before `status`/`ver` were signed in carry too little to
+    authorize statelessly and fall back to the database path.
+    """
+    if any(claim not in token_data for claim in ("user_id", "role", "status", "ver")):
+        return None
+
+    if revocation_list.is_stale(token_data["user_id"], token_data["ver"]):
+        raise _unauthorized("Token is no longer valid, please log in again")
+
+    return TokenPrincipal(
+        id=token_data["user_id"],
+        username=token_data.get("sub"),
+        email=token_data.get("email"),
+        role=token_data["role"],
+        status=token_data["status"],
+    )
+
+
+def _ensure_active(current_user):
     # Ensure we compare enum to enum (or its value)
     if isinstance(current_user.status, UserStatus):
         is_active = current_user.status == UserStatus.ACTIVE
@@ -66,9 +128,59 @@ async def get_current_active_user(current_user: User = Depends(get_current_user)
     return current_user
 
 
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """Get current authenticated user."""
+    token_data = await _decode_credentials(credentials, db)
+    return await _load_user(token_data, db)
+
+
+async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+    """Get current active user."""
+    return _ensure_active(current_user)
+
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """Get the active caller for role checks.
+
+    With `settings.auth_stateless_mode` enabled the caller is authorized from
+    the signed `role`/`status`/`ver` claims alone and no database query is
+    made; the returned principal then only carries id, username, email, role
+    and status. Otherwise this behaves like `get_current_active_user`.
+    """
+    token_data = await _decode_credentials(credentials, db)
+    if settings.auth_stateless_mode:
+        principal = _principal_from_claims(token_data)
+        if principal is not None:
+            return _ensure_active(principal)
+    return _ensure_active(await _load_user(token_data, db))
+
+
+async def get_optional_principal(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    db: AsyncSession = Depends(get_async_db)
+) -> Optional[User]:
+    """Get the caller like `get_current_principal`, or None for anonymous callers.
+
+    For public endpoints that show more to signed-in users; a missing,
+    expired, revoked or inactive token is treated as anonymous.
+    """
+    if credentials is None:
+        return None
+    try:
+        return await get_current_principal(credentials, db)
+    except HTTPException:
+        return None
+
+
 def require_role(required_role: UserRole):
     """Decorator factory to require specific user role."""
-    async def role_checker(current_user: User = Depends(get_current_active_user)):
+    async def role_checker(current_user: User = Depends(get_current_principal)):
         # Ensure robust enum comparison
         user_role = UserRole(current_user.role)
         if user_role != required_role:
@@ -82,14 +194,14 @@ def require_role(required_role: UserRole):
 
 def require_roles(allowed_roles: list[UserRole]):
     """Decorator factory to require one of multiple user roles."""
-    async def role_checker(current_user: User = Depends(get_current_active_user)):
+    async def role_checker(current_user: User = Depends(get_current_principal)):
         # Ensure robust enum comparison and admin bypass
         user_role = UserRole(current_user.role)
-        
+
         # Always allow admin access
         if user_role == UserRole.ADMIN:
             return current_user
-            
+
         # Check if user has one of the allowed roles
         if user_role not in allowed_roles:
             allowed_roles_str = ", ".join([role.value for role in allowed_roles])
@@ -0,0 +1,492 @@
+"""
+In-process full-text search index for KFATS LMS.
+
+An alternative to the database full-text indexes (`app.models.search_index`)
+for deployments without Postgres extensions: with ``settings.search_backend
+= "memory"`` global search is answered from this index once it is ready.
+
+The index is inverted with one pair of ``array('I')`` per term (document
+slots in ascending order and field-weighted term frequencies) and scores
+with BM25. Documents are appended to slots; re-indexing a document appends
+a new slot and a delete marks the old slot dead until the next compaction.
+
+It is kept fresh three ways:
+- routers call `index_document` / `remove_document` after committing a
+  create, update, delete or status change (these hooks also maintain the
+  suggestion index, `app.core.suggestions`, and invalidate the search
+  result cache, `app.core.search_cache`);
+- `run_search_index_sync` pulls rows changed by other processes by
+  ``updated_at`` watermark, and periodically reconciles ids to drop rows
+  deleted elsewhere;
+- the index is written to ``settings.search_index_snapshot_path`` after
+  full syncs and on shutdown. The next start memory-maps the posting lists
+  from the snapshot instead of rebuilding, then syncs what changed.
+"""
+
+import asyncio
+import heapq
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.search_cache import search_cache
+from app.core.suggestions import SUGGEST_SOURCES, suggestion_index, update_suggestion
+from app.models.search_index import HIGHLIGHT_END, HIGHLIGHT_START, SEARCH_COLUMNS, SEARCH_MODELS
+
+logger = logging.getLogger(__name__)
+
+WORD = re.compile(r"\w+", re.UNICODE)
+MAX_TOKEN_LENGTH = 64
+
+# Term frequency multiplier per column weight class (see SEARCH_COLUMNS)
+TF_WEIGHTS = {"A": 3, "B": 2, "C": 1}
+
+# Characters of the last (long text) column kept for result snippets
+SNIPPET_SOURCE_CHARS = 400
+SNIPPET_WIDTH = 160
+
+SNAPSHOT_MAGIC = b"KFSIDX01"
+SNAPSHOT_VERSION = 1
+
+# Incremental syncs re-read this much history before the watermark so rows
+# committed late are not missed
+WATERMARK_OVERLAP = timedelta(seconds=60)
+
+# Compact once this many slots are dead and they outnumber live documents
+COMPACT_MIN_DEAD = 1000
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens; single characters are not indexed."""
+    return [token for token in WORD.findall(text.lower()) if 1 < len(token) <= MAX_TOKEN_LENGTH]
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _timestamp(value: Optional[datetime]) -> float:
+    return _as_utc(value).timestamp() if value else 0.0
+
+
+def _snippet(text: str, pattern: "re.Pattern[str]") -> str:
+    match = pattern.search(text)
+    start = max(0, match.start() - SNIPPET_WIDTH // 4) if match else 0
+    excerpt = text[start:start + SNIPPET_WIDTH]
+    prefix = "..." if start else ""
+    suffix = "..." if start + SNIPPET_WIDTH < len(text) else ""
+    return prefix + pattern.sub(HIGHLIGHT_START + r"\1" + HIGHLIGHT_END, excerpt) + suffix
+
+
+class InvertedIndex:
+    """
+    BM25 inverted index over articles, courses and products.
+
+    Postings for a term are ``(slots, tfs)``: parallel uint32 sequences,
+    ``array('I')`` once written to, or read-only memoryviews into the
+    snapshot mapping until then. Per-slot document data lives in parallel
+    lists/arrays indexed by slot.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self.keys: List[Optional[Tuple[str, int]]] = []  # slot -> (type, id); None once removed
+        self.titles: List[str] = []
+        self.texts: List[str] = []
+        self.lengths = array("I")
+        self.updated = array("d")  # updated_at timestamps, to skip unchanged rows on sync
+        self.slots: Dict[Tuple[str, int], int] = {}
+        self.postings: Dict[str, Tuple[Sequence[int], Sequence[int]]] = {}
+        self.total_length = 0
+        self.dead = 0
+        self.ready = False
+        self.dirty = False
+        self.watermark: Optional[datetime] = None
+        self.last_full_sync: Optional[float] = None
+        self.searches = 0
+        self._snapshot: Optional[mmap.mmap] = None
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def add(
+        self, content_type: str, doc_id: int, fields: Sequence[Optional[str]], updated_at: Optional[datetime] = None
+    ) -> None:
+        """Index or re-index a document.
+
+        ``fields`` are the values of its table's SEARCH_COLUMNS, in order;
+        the first is the title and the last the text snippets come from.
+        """
+        key = (content_type, doc_id)
+        if key in self.slots:
+            self.remove(content_type, doc_id)
+
+        counts: Counter = Counter()
+        columns = SEARCH_COLUMNS[SEARCH_MODELS[content_type].__tablename__]
+        for (_, weight), value in zip(columns, fields):
+            if value:
+                for token in tokenize(value):
+                    counts[token] += TF_WEIGHTS[weight]
+
+        slot = len(self.keys)
+        length = sum(counts.values())
+        self.keys.append(key)
+        self.titles.append(fields[0] or "")
+        self.texts.append((fields[-1] or "")[:SNIPPET_SOURCE_CHARS])
+        self.lengths.append(length)
+        self.updated.append(_timestamp(updated_at))
+        self.slots[key] = slot
+        self.total_length += length
+        for term, tf in counts.items():
+            slots, tfs = self._writable_postings(term)
+            slots.append(slot)
+            tfs.append(tf)
+        self.dirty = True
+
+    def remove(self, content_type: str, doc_id: int) -> None:
+        """Drop a document; its slot is reclaimed by the next compaction."""
+        slot = self.slots.pop((content_type, doc_id), None)
+        if slot is None:
+            return
+        self.keys[slot] = None
+        self.titles[slot] = self.texts[slot] = ""
+        self.total_length -= self.lengths[slot]
+        self.dead += 1
+        self.dirty = True
+        if self.dead >= COMPACT_MIN_DEAD and self.dead > len(self.slots):
+            self.compact()
+
+    def _writable_postings(self, term: str) -> Tuple[array, array]:
+        entry = self.postings.get(term)
+        if entry is None:
+            entry = self.postings[term] = (array("I"), array("I"))
+        elif not isinstance(entry[0], array):
+            # Still mapped from the snapshot (read-only); copy on first write
+            entry = self.postings[term] = (array("I", entry[0]), array("I", entry[1]))
+        return entry
+
+    def compact(self) -> None:
+        """Drop dead slots and renumber live ones, keeping posting order."""
+        live = [slot for slot, key in enumerate(self.keys) if key is not None]
+        remap = array("i", [-1]) * len(self.keys)
+        for new_slot, slot in enumerate(live):
+            remap[slot] = new_slot
+
+        postings = {}
+        for term, (slots, tfs) in self.postings.items():
+            new_slots, new_tfs = array("I"), array("I")
+            for slot, tf in zip(slots, tfs):
+                target = remap[slot]
+                if target >= 0:
+                    new_slots.append(target)
+                    new_tfs.append(tf)
+            if new_slots:
+                postings[term] = (new_slots, new_tfs)
+
+        self.keys = [self.keys[slot] for slot in live]
+        self.titles = [self.titles[slot] for slot in live]
+        self.texts = [self.texts[slot] for slot in live]
+        self.lengths = array("I", (self.lengths[slot] for slot in live))
+        self.updated = array("d", (self.updated[slot] for slot in live))
+        self.slots = {key: slot for slot, key in enumerate(self.keys)}
+        self.postings = postings
+        self.dead = 0
+        # Nothing references the mapping any more
+        self._snapshot = None
+
+    def search(self, query: str, content_types: Iterable[str], limit: int) -> List[Dict[str, Any]]:
+        """Return the ``limit`` best BM25 matches containing every query term.
+
+        Hits have the same shape as `SearchService.search` results.
+        """
+        self.searches += 1
+        terms = list(dict.fromkeys(tokenize(query)))
+        live = len(self.slots)
+        if not terms or not live:
+            return []
+
+        postings = []
+        for term in terms:
+            entry = self.postings.get(term)
+            if entry is None:
+                # Every term must match, as with the database backends
+                return []
+            postings.append(entry)
+        # Intersect starting from the rarest term
+        postings.sort(key=lambda entry: len(entry[0]))
+
+        wanted = set(content_types)
+        keys, lengths = self.keys, self.lengths
+        k1, b = self.k1, self.b
+        avg_length = max(self.total_length / live, 1.0)
+
+        def weight(tf: int, slot: int) -> float:
+            return tf * (k1 + 1) / (tf + k1 * (1 - b + b * lengths[slot] / avg_length))
+
+        scores: Dict[int, float] = {}
+        for position, (slots, tfs) in enumerate(postings):
+            # Document frequency counts dead slots until the next compaction
+            df = len(slots)
+            idf = math.log(1 + (live - df + 0.5) / (df + 0.5))
+            matched: Dict[int, float] = {}
+            if position == 0:
+                for slot, tf in zip(slots, tfs):
+                    key = keys[slot]
+                    if key is not None and key[0] in wanted:
+                        matched[slot] = idf * weight(tf, slot)
+            elif len(scores) * 16 < df:
+                # Few candidates left: binary-search each one in the longer list
+                for slot, score in scores.items():
+                    i = bisect_left(slots, slot)
+                    if i < df and slots[i] == slot:
+                        matched[slot] = score + idf * weight(tfs[i], slot)
+            else:
+                for slot, tf in zip(slots, tfs):
+                    score = scores.get(slot)
+                    if score is not None:
+                        matched[slot] = score + idf * weight(tf, slot)
+            scores = matched
+            if not scores:
+                return []
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        pattern = re.compile(r"\b(%s)\b" % "|".join(re.escape(term) for term in terms), re.IGNORECASE)
+        return [
+            {
+                "type": keys[slot][0],
+                "id": keys[slot][1],
+                "title": self.titles[slot],
+                "snippet": _snippet(self.texts[slot], pattern),
+                "score": round(score, 6),
+            }
+            for slot, score in best
+        ]
+
+    async def sync(self, db: AsyncSession) -> bool:
+        """Index rows changed since the watermark; returns True if this was a full sync.
+
+        Only published articles and courses and active products are indexed.
+        The first sync builds the index. Full syncs, every
+        ``settings.search_index_full_sync_seconds`` and right after loading a
+        snapshot, also drop documents whose rows no longer exist or are no
+        longer visible.
+        """
+        full = (
+            self.last_full_sync is None
+            or time.monotonic() - self.last_full_sync >= settings.search_index_full_sync_seconds
+        )
+        since = self.watermark - WATERMARK_OVERLAP if self.watermark else None
+        watermark = self.watermark
+        changed = False
+
+        for content_type, model in SEARCH_MODELS.items():
+            visible = SUGGEST_SOURCES[content_type][2]
+            columns = [getattr(model, column) for column, _ in SEARCH_COLUMNS[model.__tablename__]]
+            stmt = select(model.id, model.updated_at, model.status, *columns)
+            if since is None:
+                stmt = stmt.where(model.status == visible)
+            else:
+                # Include rows that left the visible status so they are dropped
+                stmt = stmt.where(model.updated_at > since)
+            result = await db.stream(stmt.execution_options(yield_per=1000))
+            async for rows in result.partitions():
+                for doc_id, updated_at, status, *fields in rows:
+                    slot = self.slots.get((content_type, doc_id))
+                    if status != visible:
+                        if slot is not None:
+                            self.remove(content_type, doc_id)
+                            changed = True
+                    elif slot is None or self.updated[slot] != _timestamp(updated_at):
+                        self.add(content_type, doc_id, fields, updated_at)
+                        changed = True
+                    if updated_at and (watermark is None or _as_utc(updated_at) > watermark):
+                        watermark = _as_utc(updated_at)
+
+            if full and since is not None:
+                ids = set((await db.scalars(select(model.id).where(model.status == visible))).all())
+                for key in [key for key in self.slots if key[0] == content_type and key[1] not in ids]:
+                    self.remove(*key)
+                    changed = True
+
+        if changed:
+            # Cached results may include the documents just changed
+            search_cache.invalidate()
+        self.watermark = watermark or datetime.now(timezone.utc)
+        if full:
+            self.last_full_sync = time.monotonic()
+        self.ready = True
+        return full
+
+    def save_snapshot(self, path: str) -> None:
+        """Write the index to ``path`` (atomically replaced)."""
+        if self.dead:
+            self.compact()
+
+        terms = []
+        offset = 0
+        for term, (slots, _) in self.postings.items():
+            terms.append([term, offset, len(slots)])
+            offset += 2 * len(slots)
+
+        header = json.dumps({
+            "version": SNAPSHOT_VERSION,
+            "byteorder": sys.byteorder,
+            "k1": self.k1,
+            "b": self.b,
+            "watermark": self.watermark.isoformat() if self.watermark else None,
+            "keys": self.keys,
+            "titles": self.titles,
+            "texts": self.texts,
+            "terms": terms,
+        }, separators=(",", ":")).encode("utf-8")
+        # Keep the float64 section 8-byte aligned
+        padding = -(len(SNAPSHOT_MAGIC) + 8 + len(header)) % 8
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(len(header).to_bytes(8, "little"))
+            f.write(header)
+            f.write(b"\0" * padding)
+            self.updated.tofile(f)
+            self.lengths.tofile(f)
+            for slots, tfs in self.postings.values():
+                f.write(memoryview(slots).cast("B"))
+                f.write(memoryview(tfs).cast("B"))
+        os.replace(tmp_path, path)
+        self.dirty = False
+
+    def load_snapshot(self, path: str) -> bool:
+        """Map a snapshot written by `save_snapshot`; returns False if missing or unusable."""
+        try:
+            with open(path, "rb") as f:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+
+        try:
+            if mapping[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+                raise ValueError("bad magic")
+            start = len(SNAPSHOT_MAGIC) + 8
+            header_length = int.from_bytes(mapping[len(SNAPSHOT_MAGIC):start], "little")
+            header = json.loads(mapping[start:start + header_length])
+            if header["version"] != SNAPSHOT_VERSION or header["byteorder"] != sys.byteorder:
+                raise ValueError("incompatible snapshot")
+        except (ValueError, KeyError):
+            logger.warning("Ignoring unusable search index snapshot %s", path)
+            mapping.close()
+            return False
+
+        count = len(header["keys"])
+        data = start + header_length
+        data += -data % 8
+        view = memoryview(mapping)
+
+        self.__init__(header["k1"], header["b"])
+        self.keys = [tuple(key) for key in header["keys"]]
+        self.titles = header["titles"]
+        self.texts = header["texts"]
+        self.updated.frombytes(view[data:data + 8 * count])
+        self.lengths.frombytes(view[data + 8 * count:data + 12 * count])
+        self.slots = {key: slot for slot, key in enumerate(self.keys)}
+        self.total_length = sum(self.lengths)
+        postings = view[data + 12 * count:].cast("I")
+        self.postings = {
+            term: (postings[offset:offset + size], postings[offset + size:offset + 2 * size])
+            for term, offset, size in header["terms"]
+        }
+        self.watermark = datetime.fromisoformat(header["watermark"]) if header["watermark"] else None
+        self._snapshot = mapping
+        # Serve from the snapshot right away; the next sync catches up
+        self.ready = True
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Return index size and usage counters for monitoring."""
+        return {
+            "ready": self.ready,
+            "documents": len(self.slots),
+            "dead_slots": self.dead,
+            "terms": len(self.postings),
+            "searches": self.searches,
+            "watermark": self.watermark.isoformat() if self.watermark else None,
+        }
+
+
+inverted_index = InvertedIndex()
+
+
+def memory_search_enabled() -> bool:
+    return settings.search_backend == "memory"
+
+
+def index_document(content_type: str, document: Any) -> None:
+    """Re-index a committed article/course/product.
+
+    Refreshes its search suggestions, and its full-text entry on the
+    memory backend (dropping it if the status is no longer public), and
+    invalidates cached search results.
+    """
+    search_cache.invalidate()
+    update_suggestion(content_type, document)
+    if not memory_search_enabled():
+        return
+    if document.status != SUGGEST_SOURCES[content_type][2]:
+        inverted_index.remove(content_type, document.id)
+        return
+    columns = SEARCH_COLUMNS[SEARCH_MODELS[content_type].__tablename__]
+    # updated_at is set by the database on update and may not be loaded yet
+    updated_at = inspect(document).dict.get("updated_at")
+    inverted_index.add(
+        content_type, document.id, [getattr(document, column) for column, _ in columns], updated_at
+    )
+
+
+def remove_document(content_type: str, doc_id: int) -> None:
+    """Drop a deleted article/course/product from suggestions, the memory backend and cached results."""
+    search_cache.invalidate()
+    suggestion_index.remove(content_type, doc_id)
+    if memory_search_enabled():
+        inverted_index.remove(content_type, doc_id)
+
+
+async def run_search_index_sync(interval_seconds: float) -> None:
+    """Load or build `inverted_index`, then keep it in sync until cancelled."""
+    from app.core.database import AsyncSessionLocal
+
+    path = settings.search_index_snapshot_path
+    if path and inverted_index.load_snapshot(path):
+        logger.info("Loaded search index snapshot: %d documents", len(inverted_index))
+
+    while True:
+        try:
+            started = time.perf_counter()
+            async with AsyncSessionLocal() as db:
+                full = await inverted_index.sync(db)
+            if full:
+                logger.info(
+                    "Search index synced: %d documents in %.2fs",
+                    len(inverted_index), time.perf_counter() - started,
+                )
+                if path and inverted_index.dirty:
+                    inverted_index.save_snapshot(path)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Search index sync failed")
+        await asyncio.sleep(interval_seconds)
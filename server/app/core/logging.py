@@ -1,13 +1,21 @@
 """
 Logging configuration for KFATS LMS application.
 Provides structured logging with appropriate levels and formats.
+
+Loggers only enqueue records; a single background `QueueListener` thread
+formats them and writes to the console and rotating files, so slow disks
+never block the event loop.
 """
 
+import json
 import logging
 import logging.config
+import logging.handlers
+import queue
 import sys
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 from .config import settings
 
@@ -40,8 +48,7 @@ def get_logging_config() -> Dict[str, Any]:
                 "datefmt": "%Y-%m-%d %H:%M:%S"
             },
             "json": {
-                "format": "%(asctime)s %(name)s %(levelname)s %(request_id)s %(message)s",
-                "datefmt": "%Y-%m-%dT%H:%M:%S%z"
+                "()": "app.core.logging.JsonFormatter"
             }
         },
         "filters": {
@@ -91,6 +98,11 @@ def get_logging_config() -> Dict[str, Any]:
                 "handlers": ["console", "file", "error_file"],
                 "propagate": False
             },
+            "app.access": {
+                "level": logging.INFO,
+                "handlers": ["access_file"],
+                "propagate": False
+            },
             "uvicorn": {
                 "level": log_level,
                 "handlers": ["console", "access_file"],
@@ -135,14 +147,106 @@ class RequestIdFilter(logging.Filter):
         return True
 
 
+class JsonFormatter(logging.Formatter):
+    """
+    Format records as one JSON object per line.
+
+    Fields passed through ``extra=`` are included as top-level keys.
+    """
+
+    RESERVED = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in self.RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that hands records to the listener unformatted.
+
+    The stock QueueHandler formats the message on the calling thread so the
+    record can be pickled; the queue here is in-process, so formatting is
+    left to the listener thread. Records are routed to the handlers of the
+    logger they were attached to. When the queue is full the record is
+    dropped and counted rather than blocking the caller.
+    """
+
+    def __init__(self, log_queue: "queue.Queue", targets: List[logging.Handler]):
+        super().__init__(log_queue)
+        self.targets = targets
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait((self.targets, record))
+        except queue.Full:
+            self.dropped += 1
+
+
+class RoutingQueueListener(logging.handlers.QueueListener):
+    """Listener that writes each record to the handlers it was routed to."""
+
+    def enqueue_sentinel(self) -> None:
+        # Block rather than fail if the queue is full at shutdown
+        self.queue.put(self._sentinel)
+
+    def handle(self, item) -> None:
+        targets, record = item
+        for handler in targets:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+_listener: Optional[RoutingQueueListener] = None
+
+
+def _install_queue_handlers(logger_names: List[Optional[str]]) -> RoutingQueueListener:
+    """Move the handlers of the given loggers behind a shared queue."""
+    log_queue: "queue.Queue" = queue.Queue(maxsize=settings.log_queue_size)
+    for name in logger_names:
+        target_logger = logging.getLogger(name)
+        targets = list(target_logger.handlers)
+        if targets:
+            target_logger.handlers = [DeferredQueueHandler(log_queue, targets)]
+    listener = RoutingQueueListener(log_queue)
+    listener.start()
+    return listener
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def setup_logging() -> None:
     """
     Setup logging configuration for the application.
 
     This function should be called once during application startup.
     """
+    global _listener
+    shutdown_logging()
+
     config = get_logging_config()
     logging.config.dictConfig(config)
+    _listener = _install_queue_handlers([None, *config["loggers"]])
 
     # Set up root logger
     logger = logging.getLogger()
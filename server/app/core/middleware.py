@@ -1,170 +1,257 @@
 """
 Middleware components for KFATS LMS application.
 Provides request logging, error handling, and other cross-cutting concerns.
+
+All middleware here is plain ASGI: it wraps ``send`` to act on the
+``http.response.start`` message instead of buffering the response through
+Starlette's ``BaseHTTPMiddleware``, so streaming responses pass straight
+through and each layer costs one function call per message.
 """
 
 import logging
+import math
+import random
 import time
 import uuid
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from typing import Optional
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.database import QueryStats, current_query_stats
+from app.core.rate_limit import RateLimiter, build_rate_limiter
 
 logger = logging.getLogger(__name__)
+access_logger = logging.getLogger("app.access")
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
     """
     Middleware for logging HTTP requests and responses.
 
-    Logs request details, response status, and timing information.
+    Writes one structured line per request to the ``app.access`` logger
+    (JSON in access.log). Fast successful requests are sampled at
+    ``settings.log_access_sample_rate``; errors, requests slower than
+    ``settings.log_slow_request_ms`` and query-heavy requests are always
+    logged.
+
+    SQL statements issued while handling the request are counted and timed
+    (see `app.core.database.current_query_stats`) and reported in a
+    ``Server-Timing`` header and on the log line. Requests above
+    ``settings.sql_query_count_threshold`` statements or
+    ``settings.sql_time_threshold_ms`` of DB time are flagged query-heavy.
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.sample_rate = settings.log_access_sample_rate
+        self.slow_seconds = settings.log_slow_request_ms / 1000
+        self.query_count_threshold = settings.sql_query_count_threshold
+        self.query_time_threshold = settings.sql_time_threshold_ms / 1000
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Generate unique request ID
         request_id = str(uuid.uuid4())
+        request_id_header = (b"x-request-id", request_id.encode("latin-1"))
 
         # Add request ID to request state for use in handlers
-        request.state.request_id = request_id
-
-        # Log incoming request
-        start_time = time.time()
-        logger.info(
-            f"Request started: {request.method} {request.url}",
-            extra={
-                "request_id": request_id,
-                "method": request.method,
-                "url": str(request.url),
-                "headers": dict(request.headers),
-                "client_ip": request.client.host if request.client else None,
-            }
-        )
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        query_stats = QueryStats(request_id)
+        stats_token = current_query_stats.set(query_stats)
+
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                server_timing = (
+                    f'db;desc="{query_stats.count} queries";dur={query_stats.duration_ms}'
+                ).encode("latin-1")
+                # Add request ID and DB timing to response headers
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    request_id_header,
+                    (b"server-timing", server_timing),
+                ]
+            await send(message)
 
         try:
             # Process the request
-            response = await call_next(request)
-
-            # Calculate processing time
-            process_time = time.time() - start_time
-
-            # Log successful response
-            logger.info(
-                f"Request completed: {request.method} {request.url} - {response.status_code}",
-                extra={
-                    "request_id": request_id,
-                    "method": request.method,
-                    "url": str(request.url),
-                    "status_code": response.status_code,
-                    "process_time": f"{process_time:.4f}s",
-                }
-            )
-
-            # Add request ID to response headers
-            response.headers["X-Request-ID"] = request_id
-
-            return response
-
+            await self.app(scope, receive, send_wrapper)
         except Exception as exc:
             # Calculate processing time for failed requests
-            process_time = time.time() - start_time
+            process_time = time.perf_counter() - start_time
 
             # Log error response
             logger.error(
-                f"Request failed: {request.method} {request.url} - {type(exc).__name__}",
-                extra={
-                    "request_id": request_id,
-                    "method": request.method,
-                    "url": str(request.url),
-                    "exception_type": type(exc).__name__,
-                    "exception_message": str(exc),
-                    "process_time": f"{process_time:.4f}s",
-                },
+                "Request failed: %s %s - %s", scope["method"], scope["path"], type(exc).__name__,
+                extra=self._fields(scope, request_id, 500, process_time, query_stats),
                 exc_info=True
             )
 
             # Re-raise the exception to be handled by error handlers
             raise
+        finally:
+            current_query_stats.reset(stats_token)
+
+        # Calculate processing time
+        process_time = time.perf_counter() - start_time
+        slow = process_time >= self.slow_seconds
+        query_heavy = (
+            query_stats.count > self.query_count_threshold
+            or query_stats.duration > self.query_time_threshold
+        )
+
+        if status_code >= 400 or slow or query_heavy:
+            level = logging.WARNING
+        elif self.sample_rate >= 1 or random.random() < self.sample_rate:
+            level = logging.INFO
+        else:
+            return
 
+        if access_logger.isEnabledFor(level):
+            access_logger.log(
+                level, "%s %s - %s", scope["method"], scope["path"], status_code,
+                extra=self._fields(scope, request_id, status_code, process_time, query_stats, slow, query_heavy)
+            )
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+    @staticmethod
+    def _fields(
+        scope: Scope,
+        request_id: str,
+        status_code: int,
+        process_time: float,
+        query_stats: QueryStats,
+        slow: bool = False,
+        query_heavy: bool = False,
+    ) -> dict:
+        client = scope.get("client")
+        return {
+            "request_id": request_id,
+            "method": scope["method"],
+            "path": scope["path"],
+            "query": scope.get("query_string", b"").decode("latin-1"),
+            "status_code": status_code,
+            "duration_ms": round(process_time * 1000, 2),
+            "db_queries": query_stats.count,
+            "db_time_ms": query_stats.duration_ms,
+            "slow": slow,
+            "query_heavy": query_heavy,
+            "client_ip": client[0] if client else None,
+        }
+
+
+def _encode_headers(headers: dict) -> list:
+    return [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()]
+
+
+class SecurityHeadersMiddleware:
     """
     Middleware for adding security headers to responses.
 
-    Adds various security-related HTTP headers.
+    Adds various security-related HTTP headers. The encoded header lists are
+    built once; any header of the same name set by the endpoint is replaced.
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response = await call_next(request)
-
-        # Security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-
-        # Content Security Policy - allow necessary resources for API docs
-        if request.url.path in ["/docs", "/redoc", "/openapi.json"]:
-            response.headers["Content-Security-Policy"] = (
-                "default-src 'self'; "
-                "script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
-                "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
-                "img-src 'self' https://fastapi.tiangolo.com; "
-                "font-src 'self' https://cdn.jsdelivr.net; "
-                "connect-src 'self'"
-            )
-        else:
-            response.headers["Content-Security-Policy"] = "default-src 'self'"
+    BASE_HEADERS = {
+        "X-Content-Type-Options": "nosniff",
+        "X-Frame-Options": "DENY",
+        "X-XSS-Protection": "1; mode=block",
+        "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+        "Referrer-Policy": "strict-origin-when-cross-origin",
+    }
+
+    # Content Security Policy - allow necessary resources for API docs
+    DOCS_PATHS = frozenset(["/docs", "/redoc", "/openapi.json"])
+    DOCS_CSP = (
+        "default-src 'self'; "
+        "script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
+        "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
+        "img-src 'self' https://fastapi.tiangolo.com; "
+        "font-src 'self' https://cdn.jsdelivr.net; "
+        "connect-src 'self'"
+    )
+    DEFAULT_CSP = "default-src 'self'"
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.default_headers = _encode_headers(
+            {**self.BASE_HEADERS, "Content-Security-Policy": self.DEFAULT_CSP}
+        )
+        self.docs_headers = _encode_headers(
+            {**self.BASE_HEADERS, "Content-Security-Policy": self.DOCS_CSP}
+        )
+        self.header_names = frozenset(name for name, _ in self.default_headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        extra_headers = self.docs_headers if scope["path"] in self.DOCS_PATHS else self.default_headers
+        header_names = self.header_names
 
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *(header for header in message.get("headers", ()) if header[0].lower() not in header_names),
+                    *extra_headers,
+                ]
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_wrapper)
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+class RateLimitMiddleware:
     """
-    Basic rate limiting middleware.
+    Rate limiting middleware.
 
-    Tracks request counts per client IP and enforces limits.
-    Note: This is a simple in-memory implementation.
-    For production, consider using Redis or similar.
+    Charges each request to its client IP's token bucket (see
+    `app.core.rate_limit.RateLimiter`) and answers 429 with Retry-After
+    once the bucket is empty. Without an explicit limiter it uses
+    ``app.state.rate_limiter``, which the application lifespan builds from
+    settings (or builds one on the first request if the lifespan did not run).
     """
 
-    def __init__(self, app, requests_per_minute: int = 60):
-        super().__init__(app)
-        self.requests_per_minute = requests_per_minute
-        self.requests = {}  # In production, use Redis
+    def __init__(self, app: ASGIApp, limiter: Optional[RateLimiter] = None):
+        self.app = app
+        self.limiter = limiter
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        client_ip = request.client.host if request.client else "unknown"
+    def _limiter_for(self, scope: Scope) -> RateLimiter:
+        if self.limiter is not None:
+            return self.limiter
+        state = scope["app"].state
+        if getattr(state, "rate_limiter", None) is None:
+            state.rate_limiter = build_rate_limiter()
+        return state.rate_limiter
 
-        # Get current minute
-        current_minute = int(time.time() // 60)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Initialize or clean up old entries
-        if client_ip not in self.requests:
-            self.requests[client_ip] = {}
-        elif current_minute not in self.requests[client_ip]:
-            # Clean up old minutes
-            self.requests[client_ip] = {current_minute: 0}
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
 
-        # Check rate limit
-        if current_minute in self.requests[client_ip]:
-            self.requests[client_ip][current_minute] += 1
-        else:
-            self.requests[client_ip][current_minute] = 1
+        allowed, retry_after = self._limiter_for(scope).hit(client_ip, scope["path"])
 
-        if self.requests[client_ip][current_minute] > self.requests_per_minute:
+        if not allowed:
             logger.warning(
                 f"Rate limit exceeded for IP: {client_ip}",
                 extra={
                     "client_ip": client_ip,
-                    "request_count": self.requests[client_ip][current_minute],
-                    "limit": self.requests_per_minute
+                    "path": scope["path"],
+                    "limit": settings.rate_limit_requests_per_minute
                 }
             )
 
-            from fastapi.responses import JSONResponse
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=429,
                 content={
                     "success": False,
@@ -172,12 +259,14 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                         "code": "RATE_LIMIT_EXCEEDED",
                         "message": "Too many requests. Please try again later.",
                         "details": {
-                            "limit": self.requests_per_minute,
+                            "limit": settings.rate_limit_requests_per_minute,
                             "window": "minute"
                         }
                     }
-                }
+                },
+                headers={"Retry-After": str(math.ceil(retry_after))}
             )
+            await response(scope, receive, send)
+            return
 
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send)
@@ -0,0 +1,197 @@
+"""
+Pagination helpers for KFATS LMS list endpoints.
+
+Lists are paged by OFFSET by default. Passing a ``cursor`` query parameter
+(empty for the first page) switches to keyset pagination: rows are ordered
+by ``(sort column, id)`` and each page seeks past the last row of the
+previous one with ``WHERE (sort_col, id) < (:value, :id)``, so deep pages
+cost the same as the first. The response's ``next_cursor`` is an opaque
+token for the following page, or None on the last page.
+
+Offset pages get their total from ``count(*) OVER ()`` in the page query
+itself, so a list costs one round trip instead of a count plus a fetch.
+Admin lists can ask for an estimated total when unfiltered.
+
+Public lists accept ``view=summary`` to return card-sized items;
+`summary_load` restricts the row load to the columns such a schema uses.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import DateTime, Select, func, inspect, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.exceptions import ValidationError
+
+CURSOR_DESCRIPTION = (
+    "Opaque cursor from a previous page's next_cursor; pass it empty to start "
+    "keyset pagination"
+)
+ESTIMATE_TOTAL_DESCRIPTION = "Return an estimated total instead of counting rows (unfiltered lists only)"
+VIEW_DESCRIPTION = "full: complete items; summary: card fields only, without the long text columns"
+
+
+def encode_cursor(sort_key: str, sort_value: Any, row_id: int) -> str:
+    """Encode the sort key and position of the last row on a page."""
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps({"k": sort_key, "v": sort_value, "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: str, sort_column) -> Tuple[Any, int]:
+    """Decode a cursor produced by `encode_cursor` for ``sort_key``.
+
+    Raises ValidationError if the cursor is malformed or was issued for a
+    different sort order.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        sort_value, row_id = data["v"], int(data["id"])
+        if data["k"] != sort_key:
+            raise ValueError("cursor sort key mismatch")
+        if sort_value is not None and isinstance(sort_column.type, DateTime):
+            sort_value = datetime.fromisoformat(sort_value)
+    except (ValueError, TypeError, KeyError):
+        raise ValidationError("Invalid pagination cursor", details={"cursor": cursor})
+    return sort_value, row_id
+
+
+def summary_load(model, schema, *extra):
+    """Loader option that fetches only the columns of ``model`` named in ``schema``.
+
+    Long text columns the schema does not declare are never selected;
+    touching one on a loaded row raises instead of lazy loading. ``extra``
+    adds columns the caller reads itself.
+    """
+    names = inspect(model).column_attrs.keys()
+    columns = [getattr(model, name) for name in schema.model_fields if name in names]
+    return load_only(*columns, *extra, raiseload=True)
+
+
+class Page(NamedTuple):
+    """One page of rows plus the list total."""
+
+    items: List[Any]
+    total: int
+    next_cursor: Optional[str] = None
+    total_estimated: bool = False
+
+
+# Estimated totals per table for unfiltered lists (when pg_class has none)
+_estimated_counts = TTLCache(max_size=256, ttl=settings.pagination_count_cache_seconds)
+
+
+async def estimate_total(db: AsyncSession, table) -> int:
+    """Approximate row count of ``table`` without scanning it on every call.
+
+    Postgres reads the planner estimate from ``pg_class.reltuples`` (kept
+    current by autovacuum/ANALYZE). Elsewhere, or before the table has been
+    analysed, an exact count is cached for
+    ``settings.pagination_count_cache_seconds``.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        reltuples = await db.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+            {"table": table.name},
+        )
+        if reltuples is not None and reltuples >= 0:
+            return int(reltuples)
+
+    total = _estimated_counts.get(table.name)
+    if total is None:
+        total = await db.scalar(select(func.count()).select_from(table)) or 0
+        _estimated_counts.set(table.name, total)
+    return total
+
+
+async def _count(db: AsyncSession, query: Select) -> int:
+    return await db.scalar(select(func.count()).select_from(query.order_by(None).subquery())) or 0
+
+
+async def fetch_page(
+    db: AsyncSession,
+    query: Select,
+    *,
+    sort_column,
+    id_column,
+    size: int,
+    page: int = 1,
+    cursor: Optional[str] = None,
+    descending: bool = True,
+    offset: Optional[int] = None,
+    scalars: bool = True,
+    estimate_table=None,
+) -> Page:
+    """Order ``query`` by (sort_column, id_column) and fetch one page with its total.
+
+    Offset mode (``cursor`` is None) skips ``offset`` rows, or
+    ``(page - 1) * size`` when no offset is given, and reads the total from
+    ``count(*) OVER ()`` in the same statement. Keyset mode seeks past
+    ``cursor``, returns the cursor for the next page and counts separately
+    (the seek would otherwise narrow the window).
+
+    Pass ``estimate_table`` only for unfiltered lists: the total then comes
+    from `estimate_total` instead of counting matching rows. With
+    ``scalars=False`` rows are returned as tuples whose first entity owns
+    the sort and id columns.
+    """
+    sort_key = f"{sort_column.key}:{'desc' if descending else 'asc'}"
+    if descending:
+        ordered = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        ordered = query.order_by(sort_column.asc(), id_column.asc())
+
+    def entities(row):
+        return row[0] if scalars else tuple(row[:-1])
+
+    if cursor is None:
+        skip = offset if offset is not None else (page - 1) * size
+        if estimate_table is not None:
+            result = await db.execute(ordered.offset(skip).limit(size))
+            items = list(result.scalars().all() if scalars else result.all())
+            return Page(items, await estimate_total(db, estimate_table), total_estimated=True)
+
+        result = await db.execute(
+            ordered.add_columns(func.count().over().label("total_count")).offset(skip).limit(size)
+        )
+        rows = result.all()
+        if rows:
+            return Page([entities(row) for row in rows], rows[0][-1])
+        # Past the last page the window has no row to report the total on
+        return Page([], await _count(db, query) if skip else 0)
+
+    if estimate_table is not None:
+        total, total_estimated = await estimate_total(db, estimate_table), True
+    else:
+        total, total_estimated = await _count(db, query), False
+
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor, sort_key, sort_column)
+        if isinstance(sort_value, datetime) and db.get_bind().dialect.name == "sqlite":
+            # SQLite keeps datetimes as text and CURRENT_TIMESTAMP defaults have
+            # no fraction; compare in the stored format so equal rows match
+            sort_value = sort_value.strftime(
+                "%Y-%m-%d %H:%M:%S.%f" if sort_value.microsecond else "%Y-%m-%d %H:%M:%S"
+            )
+        position = tuple_(sort_column, id_column)
+        ordered = ordered.where(
+            position < tuple_(sort_value, row_id) if descending else position > tuple_(sort_value, row_id)
+        )
+
+    # One extra row tells whether another page follows
+    result = await db.execute(ordered.limit(size + 1))
+    rows = list(result.scalars().all() if scalars else result.all())
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        last = rows[-1] if scalars else rows[-1][0]
+        next_cursor = encode_cursor(sort_key, getattr(last, sort_column.key), getattr(last, id_column.key))
+    return Page(rows, total, next_cursor, total_estimated)
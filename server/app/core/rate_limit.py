@@ -0,0 +1,228 @@
+"""
+Rate limiting for KFATS LMS application.
+Token buckets per client key with per-route request costs. Buckets live
+either in process memory or in a local SQLite file shared by all worker
+processes on the host, so N uvicorn workers enforce one combined limit.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryRateLimitBackend:
+    """Per-process buckets in an LRU-bounded dict."""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def consume(self, key: str, cost: float, capacity: float, rate: float, now: float) -> Tuple[bool, float]:
+        tokens, updated = self._buckets.pop(key, (capacity, now))
+        allowed, tokens, retry_after = _refill_and_take(tokens, updated, cost, capacity, rate, now)
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.max_keys:
+            # Least recently seen clients are evicted first
+            self._buckets.popitem(last=False)
+        return allowed, retry_after
+
+    def close(self) -> None:
+        self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class SQLiteRateLimitBackend:
+    """
+    Buckets in a local SQLite file shared by worker processes.
+
+    Each decision is one short ``BEGIN IMMEDIATE`` transaction, which
+    serialises workers on the file lock. It runs on the event loop, so it
+    waits at most ``busy_timeout_ms`` for the lock rather than stall every
+    request on the worker; `RateLimiter.hit` retries a busy decision once
+    and then denies the request. Buckets idle long enough to have
+    refilled completely are deleted periodically (dropping them loses no
+    state), and the table is trimmed to the least recently seen ``max_keys``.
+    """
+
+    PRUNE_EVERY = 1000
+
+    def __init__(self, path: str, max_keys: int, busy_timeout_ms: int = 5):
+        self.path = path
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._calls = 0
+        # Setup may wait for workers starting at the same time; decisions may not
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False, timeout=1.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_rate_limit_buckets_updated ON rate_limit_buckets (updated)"
+        )
+        self._conn.execute(f"PRAGMA busy_timeout = {max(0, int(busy_timeout_ms))}")
+
+    def consume(self, key: str, cost: float, capacity: float, rate: float, now: float) -> Tuple[bool, float]:
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?", (key,)
+                ).fetchone()
+                tokens, updated = row if row else (capacity, now)
+                allowed, tokens, retry_after = _refill_and_take(tokens, updated, cost, capacity, rate, now)
+                conn.execute(
+                    "INSERT INTO rate_limit_buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                    (key, tokens, now),
+                )
+                self._calls += 1
+                if self._calls % self.PRUNE_EVERY == 0:
+                    self._prune(capacity / rate, now)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return allowed, retry_after
+
+    def _prune(self, refill_seconds: float, now: float) -> None:
+        self._conn.execute("DELETE FROM rate_limit_buckets WHERE updated < ?", (now - refill_seconds,))
+        self._conn.execute(
+            "DELETE FROM rate_limit_buckets WHERE key IN ("
+            "SELECT key FROM rate_limit_buckets ORDER BY updated DESC LIMIT -1 OFFSET ?)",
+            (self.max_keys,),
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM rate_limit_buckets").fetchone()[0]
+
+
+def _refill_and_take(
+    tokens: float, updated: float, cost: float, capacity: float, rate: float, now: float
+) -> Tuple[bool, float, float]:
+    """Refill a bucket up to `now` and try to take `cost` tokens.
+
+    Returns (allowed, remaining_tokens, retry_after_seconds).
+    """
+    tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+    if tokens >= cost:
+        return True, tokens - cost, 0.0
+    return False, tokens, (cost - tokens) / rate
+
+
+def _is_busy(exc: sqlite3.OperationalError) -> bool:
+    return "locked" in str(exc) or "busy" in str(exc)
+
+
+class RateLimiter:
+    """
+    Token bucket limiter: ``requests_per_minute`` tokens refill evenly over a
+    minute and a full bucket allows a burst of that many. Requests cost 1
+    token unless their path matches a prefix in ``route_costs`` (longest
+    prefix wins).
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        backend,
+        route_costs: Optional[Dict[str, float]] = None,
+    ):
+        self.capacity = float(requests_per_minute)
+        self.rate = requests_per_minute / 60.0
+        self.backend = backend
+        self.route_costs = sorted((route_costs or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        self.allowed = 0
+        self.limited = 0
+        self.errors = 0
+        self.busy = 0
+
+    def cost_for(self, path: str) -> float:
+        for prefix, cost in self.route_costs:
+            if path.startswith(prefix):
+                return cost
+        return 1.0
+
+    def hit(self, key: str, path: str) -> Tuple[bool, float]:
+        """Charge one request on `path` to `key`; returns (allowed, retry_after)."""
+        cost = min(self.cost_for(path), self.capacity)
+        try:
+            try:
+                allowed, retry_after = self.backend.consume(key, cost, self.capacity, self.rate, time.time())
+            except sqlite3.OperationalError as exc:
+                if not _is_busy(exc):
+                    raise
+                allowed, retry_after = self.backend.consume(key, cost, self.capacity, self.rate, time.time())
+        except sqlite3.OperationalError as exc:
+            if _is_busy(exc):
+                # The lock is held by workers serving a burst; letting requests
+                # through unmetered would lift the limit exactly when it matters
+                self.busy += 1
+                return False, cost / self.rate
+            # Fail open: a broken limiter store must not take the API down
+            self.errors += 1
+            logger.warning("Rate limiter backend error; allowing request", exc_info=True)
+            return True, 0.0
+        except sqlite3.Error:
+            self.errors += 1
+            logger.warning("Rate limiter backend error; allowing request", exc_info=True)
+            return True, 0.0
+
+        if allowed:
+            self.allowed += 1
+        else:
+            self.limited += 1
+        return allowed, retry_after
+
+    def close(self) -> None:
+        """Release the backend's storage."""
+        self.backend.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Return decision counters for monitoring."""
+        return {
+            "tracked_keys": len(self.backend),
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "errors": self.errors,
+            "busy": self.busy,
+        }
+
+
+def build_rate_limiter() -> RateLimiter:
+    """Build the limiter described by settings."""
+    if settings.rate_limit_backend == "sqlite":
+        if not settings.rate_limit_sqlite_path:
+            raise ValueError("RATE_LIMIT_SQLITE_PATH is required by the sqlite rate limit backend")
+        backend = SQLiteRateLimitBackend(
+            settings.rate_limit_sqlite_path,
+            settings.rate_limit_max_keys,
+            busy_timeout_ms=settings.rate_limit_sqlite_busy_timeout_ms,
+        )
+    elif settings.rate_limit_backend == "memory":
+        backend = MemoryRateLimitBackend(settings.rate_limit_max_keys)
+    else:
+        raise ValueError(f"Unsupported rate limit backend: {settings.rate_limit_backend}")
+
+    return RateLimiter(
+        settings.rate_limit_requests_per_minute,
+        backend,
+        route_costs=settings.rate_limit_route_costs_map,
+    )
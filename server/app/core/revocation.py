@@ -0,0 +1,252 @@
+"""
+Token revocation state for KFATS LMS application.
+Serves revocation checks from memory so authenticating a request only
+queries `token_blacklist` when the in-memory filter reports a possible hit.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.security import RevokedUser, TokenBlacklist
+from app.models.user import User as DBUser
+from app.schemas.common import UserRole
+
+logger = logging.getLogger(__name__)
+
+# Version assigned to deleted users (see `revoked_users`) so their tokens stop working
+DELETED_USER_VERSION = 2 ** 31 - 1
+
+# Role changes a user can make or be granted without giving anything up.
+# Tokens signed with the old role authorize less than the new one, so these
+# changes keep them valid.
+ROLE_UPGRADES = {
+    UserRole.USER: [UserRole.STUDENT, UserRole.MENTOR, UserRole.SELLER, UserRole.WRITER],
+    UserRole.STUDENT: [UserRole.MENTOR, UserRole.SELLER, UserRole.WRITER],
+}
+
+# Incremental syncs re-read this much history before the watermark so rows
+# committed late (revoked_at is set at INSERT time) are not missed
+WATERMARK_OVERLAP = timedelta(seconds=60)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over sha256 hex digests.
+
+    Digests are already uniformly distributed, so bit positions are derived
+    from the digest bytes with double hashing instead of rehashing.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.num_bits = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, digest: str) -> Iterator[int]:
+        raw = bytes.fromhex(digest)
+        h1 = int.from_bytes(raw[:8], "big")
+        h2 = int.from_bytes(raw[8:16], "big") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, digest: str) -> None:
+        for pos in self._positions(digest):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, digest: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(digest))
+
+
+class RevocationList:
+    """
+    In-memory view of revoked tokens and per-user token versions.
+
+    Revoked token digests (see `app.core.security.token_digest`) are kept in
+    a Bloom filter synced incrementally from `token_blacklist` by `revoked_at`
+    watermark; a periodic full sync rebuilds the filter without expired rows.
+    A filter hit is confirmed with one indexed lookup and the answer cached.
+    Tokens revoked by this process are held exactly until they expire.
+
+    `user_versions` holds the minimum `ver` claim a user's tokens must carry,
+    synced from `users.token_version` and, for deleted users, `revoked_users`.
+    """
+
+    def __init__(self) -> None:
+        self.filter = BloomFilter(settings.revocation_filter_capacity)
+        self.local: Dict[str, datetime] = {}
+        self.user_versions: Dict[int, int] = {}
+        self.watermark: Optional[datetime] = None
+        self.last_full_sync = 0.0
+        self.filter_hits = 0
+        self.db_checks = 0
+        self._confirmed = TTLCache(max_size=10000, ttl=settings.revocation_full_sync_seconds)
+
+    async def is_revoked(self, digest: str, db: AsyncSession) -> bool:
+        """Return True if the token digest has been revoked."""
+        if digest in self.local:
+            return True
+        if digest not in self.filter:
+            return False
+
+        self.filter_hits += 1
+        confirmed = self._confirmed.get(digest)
+        if confirmed is not None:
+            return confirmed
+
+        self.db_checks += 1
+        result = await db.execute(
+            select(TokenBlacklist.id).where(TokenBlacklist.token == digest).limit(1)
+        )
+        revoked = result.first() is not None
+        self._confirmed.set(digest, revoked)
+        return revoked
+
+    def is_stale(self, user_id: int, token_version: int) -> bool:
+        """Return True if a token's `ver` claim predates the user's current version."""
+        return token_version < self.user_versions.get(user_id, 0)
+
+    def add(self, digest: str, expires_at: datetime) -> None:
+        """Record a token revoked by this process."""
+        self.local[digest] = expires_at
+        self._confirmed.pop(digest)
+
+    def set_user_version(self, user_id: int, token_version: int) -> None:
+        """Record a user's new token version after a role/status change."""
+        if token_version > self.user_versions.get(user_id, 0):
+            self.user_versions[user_id] = token_version
+
+    async def sync(self, db: AsyncSession) -> None:
+        """Pull new revocations and token versions from the database."""
+        now = datetime.now(timezone.utc)
+        full = (
+            self.watermark is None
+            or time.monotonic() - self.last_full_sync >= settings.revocation_full_sync_seconds
+        )
+        if full:
+            await self._full_sync(db, now)
+        else:
+            await self._incremental_sync(db)
+        await self._sync_user_versions(db)
+
+        self.local = {
+            digest: expires_at for digest, expires_at in self.local.items()
+            if _as_utc(expires_at) > now
+        }
+
+    async def _full_sync(self, db: AsyncSession, now: datetime) -> None:
+        # Expired tokens fail signature verification anyway; drop their rows
+        await db.execute(delete(TokenBlacklist).where(TokenBlacklist.expires_at <= now))
+        await db.execute(delete(RevokedUser).where(RevokedUser.expires_at <= now))
+        await db.commit()
+
+        result = await db.execute(
+            select(TokenBlacklist.token, TokenBlacklist.revoked_at)
+            .where(TokenBlacklist.expires_at > now)
+        )
+        rows = result.all()
+
+        bloom = BloomFilter(max(settings.revocation_filter_capacity, 2 * len(rows)))
+        for digest, _ in rows:
+            bloom.add(digest)
+
+        self.filter = bloom
+        self._confirmed.clear()
+        self.watermark = max(
+            (_as_utc(revoked_at) for _, revoked_at in rows if revoked_at), default=now
+        )
+        self.last_full_sync = time.monotonic()
+
+    async def _incremental_sync(self, db: AsyncSession) -> None:
+        result = await db.execute(
+            select(TokenBlacklist.token, TokenBlacklist.revoked_at)
+            .where(TokenBlacklist.revoked_at > self.watermark - WATERMARK_OVERLAP)
+        )
+        for digest, revoked_at in result.all():
+            if digest not in self.filter:
+                self.filter.add(digest)
+            self._confirmed.pop(digest)
+            if revoked_at and _as_utc(revoked_at) > self.watermark:
+                self.watermark = _as_utc(revoked_at)
+
+    async def _sync_user_versions(self, db: AsyncSession) -> None:
+        result = await db.execute(
+            select(DBUser.id, DBUser.token_version).where(DBUser.token_version > 0)
+        )
+        versions = {user_id: version for user_id, version in result.all()}
+
+        # Deleted users have no users row left to sync from
+        result = await db.execute(
+            select(RevokedUser.user_id).where(RevokedUser.expires_at > datetime.now(timezone.utc))
+        )
+        for user_id in result.scalars():
+            versions[user_id] = DELETED_USER_VERSION
+
+        self.user_versions = versions
+
+    def stats(self) -> Dict[str, Any]:
+        """Return filter size and lookup counters for monitoring."""
+        return {
+            "filter_entries": self.filter.count,
+            "filter_bits": self.filter.num_bits,
+            "local_entries": len(self.local),
+            "filter_hits": self.filter_hits,
+            "db_checks": self.db_checks,
+            "watermark": self.watermark.isoformat() if self.watermark else None,
+        }
+
+
+def deleted_user_revocation(user_id: int, reason: Optional[str] = None) -> RevokedUser:
+    """Row that revokes a deleted user's tokens in every process.
+
+    Add it in the transaction that deletes the user; it is kept until the
+    last token the user could hold has expired.
+    """
+    return RevokedUser(
+        user_id=user_id,
+        expires_at=datetime.now(timezone.utc) + timedelta(minutes=settings.access_token_expire_minutes),
+        revocation_reason=reason,
+    )
+
+
+def role_change_revokes_tokens(old_role: UserRole, new_role: UserRole) -> bool:
+    """Return True if tokens carrying ``old_role`` must stop working.
+
+    Promotions in `ROLE_UPGRADES` keep them; the user picks up the new role
+    at the next login. Any other change (a demotion, or moving between
+    roles) bumps ``users.token_version``.
+    """
+    return old_role != new_role and new_role not in ROLE_UPGRADES.get(UserRole(old_role), [])
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+revocation_list = RevocationList()
+
+
+async def run_revocation_sync(interval_seconds: float) -> None:
+    """Periodically sync `revocation_list` until cancelled."""
+    from app.core.database import AsyncSessionLocal
+
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                await revocation_list.sync(db)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Token revocation sync failed")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,99 @@
+"""
+Result cache for global search.
+
+`SearchService.search` results are cached by normalized ``(query, types,
+limit)`` in an LRU with a TTL. Every key also carries a process-wide
+content version, which `invalidate` bumps whenever an article, course or
+product is committed (routers call it through
+`app.core.inverted_index.index_document` / `remove_document`): results
+computed before a change are never served again and simply age out of the
+LRU. Changes made by other worker processes, and to users, show up once
+entries expire (``settings.search_cache_ttl_seconds``).
+
+Concurrent misses for the same key are coalesced (single flight): the
+first runs the search in a task and the others await the same task.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+
+def normalize_query(query: str) -> str:
+    """Casefold and collapse whitespace; every search backend ignores both."""
+    return " ".join(query.casefold().split())
+
+
+class SearchCache:
+    """
+    Versioned LRU/TTL cache with single-flight misses.
+
+    Per-process and meant to be used from the event loop thread, like
+    `TTLCache`.
+
+    Attributes:
+        version: Content version; part of every key
+        coalesced: Lookups that joined a search already in flight
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.results = TTLCache(max_size=max_size, ttl=ttl)
+        self.version = 0
+        self.coalesced = 0
+        self._in_flight: Dict[Hashable, "asyncio.Task"] = {}
+
+    def invalidate(self) -> None:
+        """Make every cached result stale after searchable content changed."""
+        self.version += 1
+
+    async def get_or_search(
+        self, key: Hashable, search: Callable[[], Awaitable[Any]], cacheable: Callable[[Any], bool]
+    ) -> Any:
+        """Return the cached result for ``key`` or the result of ``search()``.
+
+        ``search`` must not depend on the calling request: it runs in a task
+        shared by every caller that misses on the same key, and keeps running
+        if they go away. Results for which ``cacheable`` is false are shared
+        with those callers but not stored.
+        """
+        key = (self.version, key)
+        cached = self.results.get(key)
+        if cached is not None:
+            return cached
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._search(key, search, cacheable))
+            self._in_flight[key] = task
+        else:
+            self.coalesced += 1
+        # Shielded so a caller that disconnects does not cancel the others
+        return await asyncio.shield(task)
+
+    async def _search(
+        self, key: Hashable, search: Callable[[], Awaitable[Any]], cacheable: Callable[[Any], bool]
+    ) -> Any:
+        try:
+            result = await search()
+            if cacheable(result):
+                self.results.set(key, result)
+            return result
+        finally:
+            self._in_flight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit-rate counters for monitoring."""
+        return {
+            **self.results.stats(),
+            "version": self.version,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+        }
+
+
+search_cache = SearchCache(
+    max_size=settings.search_cache_max_size,
+    ttl=settings.search_cache_ttl_seconds,
+)
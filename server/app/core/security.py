@@ -1,10 +1,49 @@
+import asyncio
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 from jose import jwt, JWTError, ExpiredSignatureError
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
+from app.core.cache import TTLCache
+from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+PASSWORD_HASH_SCHEMES = ("bcrypt", "argon2")
+
+
+def build_pwd_context(
+    scheme: str = settings.password_hash_scheme,
+    bcrypt_rounds: int = settings.password_bcrypt_rounds,
+    argon2_memory_cost: int = settings.password_argon2_memory_cost,
+    argon2_time_cost: int = settings.password_argon2_time_cost,
+    argon2_parallelism: int = settings.password_argon2_parallelism,
+) -> CryptContext:
+    """Build the password CryptContext for the configured hash policy.
+
+    The configured scheme hashes new passwords; the other supported scheme is
+    kept for verification but marked deprecated, and hashes weaker than the
+    configured cost are flagged for rehashing on the next successful login.
+    argon2 requires the optional ``argon2-cffi`` package.
+    """
+    if scheme not in PASSWORD_HASH_SCHEMES:
+        raise ValueError(f"Unsupported password hash scheme: {scheme}")
+
+    schemes = [scheme] + [s for s in PASSWORD_HASH_SCHEMES if s != scheme]
+    return CryptContext(
+        schemes=schemes,
+        deprecated="auto",
+        bcrypt__rounds=bcrypt_rounds,
+        bcrypt__min_rounds=bcrypt_rounds,
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__rounds=argon2_time_cost,
+        argon2__min_rounds=argon2_time_cost,
+        argon2__parallelism=argon2_parallelism,
+    )
+
+
+pwd_context = build_pwd_context()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -12,15 +51,132 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a replacement hash if its policy is outdated."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     """Generate password hash."""
     return pwd_context.hash(password)
 
 
+class PasswordHashingPool:
+    """Bounded executor that keeps password hashing off the event loop.
+
+    bcrypt is deliberately slow, so hashing runs on a dedicated thread pool
+    sized by ``settings.password_hash_workers``. At most
+    ``settings.password_hash_max_in_flight`` hashes may be submitted at once;
+    further callers wait on a semaphore instead of piling work onto the
+    executor queue.
+    """
+
+    def __init__(self) -> None:
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.max_workers = 0
+        self.max_in_flight = 0
+        self.in_flight = 0
+        self.waiting = 0
+        self.completed = 0
+        self.total_hash_time = 0.0
+        self.max_hash_time = 0.0
+
+    def _ensure_started(self) -> None:
+        if self._executor is None:
+            self.max_workers = max(1, settings.password_hash_workers)
+            self.max_in_flight = max(self.max_workers, settings.password_hash_max_in_flight)
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password-hash"
+            )
+
+        # asyncio primitives are bound to the loop that first waits on them
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._loop = loop
+
+    @staticmethod
+    def _timed(func: Callable[..., Any], *args: Any):
+        start = time.perf_counter()
+        result = func(*args)
+        return result, time.perf_counter() - start
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(*args)`` on the hashing pool and return its result."""
+        self._ensure_started()
+        semaphore = self._semaphore
+
+        self.waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            result, elapsed = await self._loop.run_in_executor(
+                self._executor, self._timed, func, *args
+            )
+            self.completed += 1
+            self.total_hash_time += elapsed
+            self.max_hash_time = max(self.max_hash_time, elapsed)
+            return result
+        finally:
+            self.in_flight -= 1
+            semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth and latency counters for monitoring."""
+        queued_in_executor = max(self.in_flight - self.max_workers, 0)
+        avg = self.total_hash_time / self.completed if self.completed else 0.0
+        return {
+            "workers": self.max_workers,
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting + queued_in_executor,
+            "completed": self.completed,
+            "avg_hash_ms": round(avg * 1000, 2),
+            "max_hash_ms": round(self.max_hash_time * 1000, 2),
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker threads (called from the application lifespan)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._semaphore = None
+        self._loop = None
+
+
+hashing_pool = PasswordHashingPool()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing pool without blocking the event loop."""
+    return await hashing_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Verify (and possibly rehash) a password on the hashing pool."""
+    return await hashing_pool.run(verify_and_update_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the hashing pool without blocking the event loop."""
+    return await hashing_pool.run(get_password_hash, password)
+
+
+def token_digest(token: str) -> str:
+    """Return the sha256 hex digest used to identify a token at rest."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token."""
-    from app.core.config import settings
-
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -32,13 +188,26 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+# Verified payloads keyed by token digest; each entry lives until the token's exp
+token_cache = TTLCache(
+    max_size=settings.token_cache_max_size,
+    ttl=settings.access_token_expire_minutes * 60,
+)
+
+
 def verify_token(token: str) -> dict:
-    """Verify and decode JWT token."""
-    from app.core.config import settings
+    """Verify and decode JWT token.
+
+    Successfully verified payloads are cached so repeat requests with the
+    same bearer token skip signature verification and JSON decoding.
+    """
+    digest = token_digest(token)
+    payload = token_cache.get(digest)
+    if payload is not None:
+        return payload
 
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-        return payload
     except ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -51,3 +220,8 @@ def verify_token(token: str) -> dict:
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    exp = payload.get("exp")
+    if exp is not None:
+        token_cache.set(digest, payload, ttl=exp - time.time())
+    return payload
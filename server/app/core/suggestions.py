@@ -0,0 +1,256 @@
+"""
+Prefix index for search-as-you-type suggestions.
+
+Serves ``/search/suggest`` from memory: every published article, published
+course and active product is indexed by its title (from each word on, so
+"horse" finds "Bronze horse") and its slug, in one sorted list searched
+with `bisect`. Matches are ranked by popularity (article views, course
+enrollments, product sales), with matches at the start of the title first.
+
+Kept fresh like `app.core.inverted_index`: routers refresh a document
+through `index_document` / `remove_document` after committing, and
+`run_suggestion_sync` pulls changes by ``updated_at`` watermark (which
+also picks up popularity counters) and rebuilds periodically.
+"""
+
+import asyncio
+import heapq
+import logging
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.search_index import SEARCH_MODELS
+from app.schemas.common import ArticleStatus, CourseStatus, ProductStatus
+
+logger = logging.getLogger(__name__)
+
+# content type -> (title attribute, popularity attribute, status that is suggested)
+SUGGEST_SOURCES = {
+    "article": ("title", "views_count", ArticleStatus.PUBLISHED),
+    "course": ("title", "enrolled_count", CourseStatus.PUBLISHED),
+    "product": ("name", "sold_quantity", ProductStatus.ACTIVE),
+}
+
+MAX_KEY_LENGTH = 64
+# Answers are memoized until the index next changes; short prefixes match
+# large key ranges, so repeated keystrokes should not rescan them
+RESULT_CACHE_SIZE = 10000
+WATERMARK_OVERLAP = timedelta(seconds=60)
+
+
+def normalize(text: str) -> str:
+    """Casefold and strip accents so "Étude" is found by "etu"."""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in text if not unicodedata.combining(char))
+
+
+def prefix_keys(title: str, slug: Optional[str]) -> List[Tuple[str, bool]]:
+    """Keys a document is found by, each flagged True if it starts the title."""
+    words = normalize(title).split()
+    keys = {" ".join(words[i:])[:MAX_KEY_LENGTH]: i == 0 for i in range(len(words))}
+    if slug:
+        keys.setdefault(slug.lower()[:MAX_KEY_LENGTH], False)
+    return list(keys.items())
+
+
+class Suggestion(NamedTuple):
+    title: str
+    slug: Optional[str]
+    popularity: int
+    keys: List[Tuple[str, bool]]
+
+
+class SuggestionIndex:
+    """Sorted ``(key, title_start, content_type, id)`` entries plus per-document data."""
+
+    def __init__(self) -> None:
+        self.entries: List[Tuple[str, bool, str, int]] = []
+        self.documents: Dict[Tuple[str, int], Suggestion] = {}
+        self.ready = False
+        self.watermark: Optional[datetime] = None
+        self.last_full_sync: Optional[float] = None
+        self.results = TTLCache(max_size=RESULT_CACHE_SIZE, ttl=settings.search_index_full_sync_seconds)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def update(
+        self, content_type: str, doc_id: int, title: Optional[str], slug: Optional[str],
+        popularity: Optional[int], status: Any,
+    ) -> None:
+        """Add, refresh or (when not in the suggested status) drop a document."""
+        if status != SUGGEST_SOURCES[content_type][2] or not title:
+            self.remove(content_type, doc_id)
+            return
+
+        key = (content_type, doc_id)
+        suggestion = Suggestion(title, slug, popularity or 0, prefix_keys(title, slug))
+        previous = self.documents.get(key)
+        if previous == suggestion:
+            return
+        if previous is not None and previous.keys != suggestion.keys:
+            self.remove(content_type, doc_id)
+            previous = None
+        if previous is None:
+            for prefix, title_start in suggestion.keys:
+                insort(self.entries, (prefix, title_start, content_type, doc_id))
+        self.documents[key] = suggestion
+        self.results.clear()
+
+    def remove(self, content_type: str, doc_id: int) -> None:
+        suggestion = self.documents.pop((content_type, doc_id), None)
+        if suggestion is None:
+            return
+        for prefix, title_start in suggestion.keys:
+            entry = (prefix, title_start, content_type, doc_id)
+            i = bisect_left(self.entries, entry)
+            if i < len(self.entries) and self.entries[i] == entry:
+                del self.entries[i]
+        self.results.clear()
+
+    def suggest(self, prefix: str, content_types: Iterable[str], limit: int) -> List[Dict[str, Any]]:
+        """Up to ``limit`` documents with a key starting with ``prefix``, best first."""
+        prefix = " ".join(normalize(prefix).split())[:MAX_KEY_LENGTH]
+        if not prefix:
+            return []
+        wanted = frozenset(content_types)
+        cache_key = (prefix, wanted, limit)
+        cached = self.results.get(cache_key)
+        if cached is not None:
+            return cached
+        entries = self.entries
+        start = bisect_left(entries, (prefix,))
+        end = bisect_left(entries, (prefix + "\U0010ffff",), start)
+
+        matches: Dict[Tuple[str, int], bool] = {}
+        for i in range(start, end):
+            _, title_start, content_type, doc_id = entries[i]
+            if content_type in wanted:
+                key = (content_type, doc_id)
+                matches[key] = matches.get(key, False) or title_start
+
+        documents = self.documents
+
+        def rank(item):
+            key, title_start = item
+            suggestion = documents[key]
+            return title_start, suggestion.popularity, -len(suggestion.title)
+
+        suggestions = [
+            {
+                "type": key[0],
+                "id": key[1],
+                "title": documents[key].title,
+                "slug": documents[key].slug,
+            }
+            for key, _ in heapq.nlargest(limit, matches.items(), key=rank)
+        ]
+        self.results.set(cache_key, suggestions)
+        return suggestions
+
+    async def sync(self, db: AsyncSession) -> bool:
+        """Apply rows changed since the watermark; returns True if the index was rebuilt.
+
+        The first sync, and one every ``settings.search_index_full_sync_seconds``,
+        rebuilds the whole index so rows deleted by other processes drop out.
+        """
+        full = (
+            self.last_full_sync is None
+            or time.monotonic() - self.last_full_sync >= settings.search_index_full_sync_seconds
+        )
+        since = None if full else self.watermark - WATERMARK_OVERLAP
+        target = SuggestionIndex() if full else self
+        watermark = None if full else self.watermark
+
+        for content_type, model in SEARCH_MODELS.items():
+            title, popularity, visible = SUGGEST_SOURCES[content_type]
+            stmt = select(
+                model.id, getattr(model, title), model.slug, getattr(model, popularity), model.status,
+                model.updated_at,
+            )
+            if since is None:
+                stmt = stmt.where(model.status == visible)
+            else:
+                # Include rows that left the suggested status so they are dropped
+                stmt = stmt.where(model.updated_at > since)
+            result = await db.stream(stmt.execution_options(yield_per=1000))
+            async for rows in result.partitions():
+                for doc_id, title_value, slug, popularity_value, status, updated_at in rows:
+                    if full:
+                        target._load(content_type, doc_id, title_value, slug, popularity_value)
+                    else:
+                        target.update(content_type, doc_id, title_value, slug, popularity_value, status)
+                    if updated_at:
+                        updated_at = updated_at if updated_at.tzinfo else updated_at.replace(tzinfo=timezone.utc)
+                        watermark = max(watermark, updated_at) if watermark else updated_at
+
+        if full:
+            target.entries.sort()
+            self.entries, self.documents = target.entries, target.documents
+            self.results.clear()
+            self.last_full_sync = time.monotonic()
+        self.watermark = watermark or datetime.now(timezone.utc)
+        self.ready = True
+        return full
+
+    def _load(
+        self, content_type: str, doc_id: int, title: Optional[str], slug: Optional[str], popularity: Optional[int]
+    ) -> None:
+        # Bulk load: append unsorted; the caller sorts once at the end
+        if not title:
+            return
+        keys = prefix_keys(title, slug)
+        self.documents[(content_type, doc_id)] = Suggestion(title, slug, popularity or 0, keys)
+        self.entries.extend((prefix, title_start, content_type, doc_id) for prefix, title_start in keys)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "documents": len(self.documents),
+            "keys": len(self.entries),
+            "result_cache": self.results.stats(),
+        }
+
+
+suggestion_index = SuggestionIndex()
+
+
+def update_suggestion(content_type: str, document: Any) -> None:
+    """Refresh a committed article/course/product in `suggestion_index`."""
+    if not suggestion_index.ready:
+        # The first sync will include it
+        return
+    title, popularity, _ = SUGGEST_SOURCES[content_type]
+    suggestion_index.update(
+        content_type, document.id, getattr(document, title), document.slug, getattr(document, popularity),
+        document.status,
+    )
+
+
+async def run_suggestion_sync(interval_seconds: float) -> None:
+    """Build `suggestion_index`, then keep it in sync until cancelled."""
+    from app.core.database import AsyncSessionLocal
+
+    while True:
+        try:
+            started = time.perf_counter()
+            async with AsyncSessionLocal() as db:
+                full = await suggestion_index.sync(db)
+            if full:
+                logger.info(
+                    "Suggestion index rebuilt: %d documents in %.2fs",
+                    len(suggestion_index), time.perf_counter() - started,
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Suggestion index sync failed")
+        await asyncio.sleep(interval_seconds)
@@ -6,6 +6,8 @@ from .article import Article
 from .product import Product
 from .order import Order
 from .order_item import OrderItem
+from .security import TokenBlacklist, RevokedUser, LoginAttempt, PasswordHistory, UserSession, SecurityEvent
+from . import search_index  # noqa: F401  (full-text index DDL for create_all)
 
 # Export all models
 __all__ = [
@@ -18,5 +20,11 @@ __all__ = [
     "Article",
     "Product",
     "Order",
-    "OrderItem"
+    "OrderItem",
+    "TokenBlacklist",
+    "RevokedUser",
+    "LoginAttempt",
+    "PasswordHistory",
+    "UserSession",
+    "SecurityEvent"
 ]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Enum as SQLEnum, Integer, DateTime, JSON, Boolean
+from sqlalchemy import Column, String, Text, Enum as SQLEnum, Integer, DateTime, JSON, Boolean, Index
 from sqlalchemy.schema import ForeignKey
 from sqlalchemy.orm import relationship
 from .base import BaseModel
@@ -24,6 +24,12 @@ def generate_slug(title: str) -> str:
 class Article(BaseModel):
     """Article database model."""
     __tablename__ = "articles"
+    __table_args__ = (
+        # Keyset pagination of the article list: (created_at, id) within a status
+        Index("ix_articles_status_created_at_id", "status", "created_at", "id"),
+        # An author's articles (also serves author_id lookups)
+        Index("ix_articles_author_id_status_created_at_id", "author_id", "status", "created_at", "id"),
+    )
     
     title = Column(String, nullable=False, index=True)
     slug = Column(String, nullable=False, unique=True, index=True)
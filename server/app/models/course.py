@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Enum as SQLEnum, Float, Integer, ForeignKey, DateTime, Boolean
+from sqlalchemy import Column, String, Text, Enum as SQLEnum, Float, Integer, ForeignKey, DateTime, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .base import BaseModel, Base
@@ -8,6 +8,12 @@ from ..schemas.common import CourseStatus, CourseLevel, EnrollmentStatus
 class Course(BaseModel):
     """Course database model."""
     __tablename__ = "courses"
+    __table_args__ = (
+        # Keyset pagination of the catalog: (created_at, id) within a status
+        Index("ix_courses_status_created_at_id", "status", "created_at", "id"),
+        # A mentor's courses, newest first (also serves mentor_id lookups)
+        Index("ix_courses_mentor_id_created_at_id", "mentor_id", "created_at", "id"),
+    )
     
     title = Column(String, nullable=False, index=True)
     slug = Column(String, nullable=True, unique=True, index=True)
@@ -37,6 +43,10 @@ class Course(BaseModel):
 class Enrollment(Base):
     """Course enrollment database model."""
     __tablename__ = "enrollments"
+    __table_args__ = (
+        # Keyset pagination of mentor student lists
+        Index("ix_enrollments_enrolled_at_id", "enrolled_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(ForeignKey("users.id"), index=True, nullable=False)
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, Float, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, Float, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 from sqlalchemy.sql import func
 
 class Order(BaseModel):
     __tablename__ = "orders"
+    __table_args__ = (
+        # Keyset pagination of a buyer's orders
+        Index("ix_orders_buyer_id_created_at_id", "buyer_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     buyer_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
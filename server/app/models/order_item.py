@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 from sqlalchemy.sql import func
@@ -6,8 +6,13 @@ from sqlalchemy.sql import func
 
 class OrderItem(BaseModel):
     __tablename__ = "order_items"
+    __table_args__ = (
+        # Seller analytics join items to the seller's products and count
+        # distinct orders; (product_id, order_id) answers both from the index
+        Index("ix_order_items_product_id_order_id", "product_id", "order_id"),
+    )
 
-    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False)
+    order_id = Column(Integer, ForeignKey("orders.id"), index=True, nullable=False)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
     unit_price = Column(Float, nullable=False)
     quantity = Column(Integer, nullable=False)
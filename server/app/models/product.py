@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Enum as SQLEnum, Float, Integer, ForeignKey, JSON, Boolean, DateTime
+from sqlalchemy import Column, String, Text, Enum as SQLEnum, Float, Integer, ForeignKey, JSON, Boolean, DateTime, Index
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 from ..schemas.common import ProductStatus, ProductCategory
@@ -7,6 +7,13 @@ from ..schemas.common import ProductStatus, ProductCategory
 class Product(BaseModel):
     """Product database model."""
     __tablename__ = "products"
+    __table_args__ = (
+        # Keyset pagination of the catalog: (created_at, id) within a status
+        Index("ix_products_status_created_at_id", "status", "created_at", "id"),
+        # Catalog filtered by category, and a seller's products (also serves seller_id lookups)
+        Index("ix_products_status_category_created_at_id", "status", "category", "created_at", "id"),
+        Index("ix_products_seller_id_status_created_at_id", "seller_id", "status", "created_at", "id"),
+    )
     
     name = Column(String, nullable=False, index=True)
     description = Column(Text, index=True, nullable=False)
@@ -0,0 +1,130 @@
+"""
+Full-text and trigram search indexes.
+
+The indexes are not mapped columns; they are created with DDL attached to
+each table's ``after_create`` event (and by the Alembic revisions for
+existing databases):
+
+- Postgres: a generated ``search_vector tsvector`` column on articles,
+  courses and products, weighted by column importance, with a GIN index.
+- SQLite: an external-content FTS5 table ``<table>_fts`` kept in sync by
+  insert/update/delete triggers.
+- Postgres: ``pg_trgm`` GIN indexes on the columns admin filters search
+  by substring (`TRIGRAM_COLUMNS`).
+
+`app.services.search_service` queries them.
+"""
+
+from typing import Dict, List, Tuple
+
+from sqlalchemy import DDL, event
+
+from .article import Article
+from .base import Base
+from .course import Course
+from .product import Product
+from .user import User
+
+TEXT_SEARCH_CONFIG = "english"
+
+# content type -> model, in the order results are listed for equal ranks
+SEARCH_MODELS = {
+    "article": Article,
+    "course": Course,
+    "product": Product,
+}
+
+# table -> (column, weight) pairs, most important first. The last column is
+# the long text that result snippets are cut from.
+SEARCH_COLUMNS: Dict[str, List[Tuple[str, str]]] = {
+    "articles": [("title", "A"), ("excerpt", "B"), ("content", "C")],
+    "courses": [("title", "A"), ("short_description", "B"), ("description", "C")],
+    "products": [("name", "A"), ("description", "C")],
+}
+
+# bm25() column weights on SQLite, matching the tsvector weight classes
+FTS5_WEIGHTS = {"A": 10.0, "B": 4.0, "C": 1.0}
+
+# Control characters the backends put around matched words in snippets;
+# `app.services.search_service` turns them into highlight offsets
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_END = "\x03"
+
+
+# table -> columns searched with ILIKE '%term%' / word similarity by admin filters
+TRIGRAM_COLUMNS: Dict[str, List[str]] = {
+    "users": ["email", "full_name", "username"],
+    "courses": ["title", "description"],
+    "articles": ["title"],
+    "products": ["name", "description"],
+}
+
+
+def fts_table_name(table: str) -> str:
+    return f"{table}_fts"
+
+
+def postgres_ddl(table: str) -> List[str]:
+    vector = " || ".join(
+        f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce({column}, '')), '{weight}')"
+        for column, weight in SEARCH_COLUMNS[table]
+    )
+    return [
+        f"ALTER TABLE {table} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({vector}) STORED",
+        f"CREATE INDEX ix_{table}_search_vector ON {table} USING gin (search_vector)",
+    ]
+
+
+def sqlite_ddl(table: str) -> List[str]:
+    fts = fts_table_name(table)
+    columns = [column for column, _ in SEARCH_COLUMNS[table]]
+    names = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    delete = f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values});"
+    insert = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values});"
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({names}, content='{table}', content_rowid='id', "
+        "tokenize='porter unicode61')",
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN {insert} END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN {delete} END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {names} ON {table} BEGIN {delete} {insert} END",
+    ]
+
+
+def trigram_index_name(table: str, column: str) -> str:
+    return f"ix_{table}_{column}_trgm"
+
+
+def trigram_ddl(table: str) -> List[str]:
+    return [
+        f"CREATE INDEX {trigram_index_name(table, column)} ON {table} USING gin ({column} gin_trgm_ops)"
+        for column in TRIGRAM_COLUMNS[table]
+    ]
+
+
+def is_search_index_object(name: str) -> bool:
+    """True for the unmapped search columns, indexes and FTS5 tables (for autogenerate)."""
+    return name == "search_vector" or name.endswith("_trgm") or any(
+        name == f"ix_{table}_search_vector" or name.startswith(fts_table_name(table))
+        for table in SEARCH_COLUMNS
+    )
+
+
+def _attach_ddl(table) -> None:
+    if table.name in SEARCH_COLUMNS:
+        for statement in postgres_ddl(table.name):
+            event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+        for statement in sqlite_ddl(table.name):
+            event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    if table.name in TRIGRAM_COLUMNS:
+        for statement in trigram_ddl(table.name):
+            event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+
+event.listen(
+    Base.metadata, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+for model in (Article, Course, Product, User):
+    _attach_ddl(model.__table__)
@@ -8,17 +8,31 @@ class TokenBlacklist(BaseModel):
     """Token blacklist for revoked tokens."""
     __tablename__ = "token_blacklist"
 
-    token = Column(String, unique=True, index=True, nullable=False)
+    token = Column(String, unique=True, index=True, nullable=False)  # sha256 digest of the JWT
     token_type = Column(String, nullable=False)  # access or refresh
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    expires_at = Column(DateTime(timezone=True), nullable=False)
-    revoked_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), index=True, nullable=False)
+    revoked_at = Column(DateTime(timezone=True), index=True, server_default=func.now())
     revocation_reason = Column(String, nullable=True)
 
     # Relationship
     user = relationship("User", back_populates="blacklisted_tokens")
 
 
+class RevokedUser(BaseModel):
+    """Tokens of a deleted user, revoked until the last one expires.
+
+    No foreign key: the user row is gone, and this row is what tells other
+    processes to stop accepting the user's claims-only tokens.
+    """
+    __tablename__ = "revoked_users"
+
+    user_id = Column(Integer, index=True, nullable=False)
+    expires_at = Column(DateTime(timezone=True), index=True, nullable=False)
+    revoked_at = Column(DateTime(timezone=True), server_default=func.now())
+    revocation_reason = Column(String, nullable=True)
+
+
 class LoginAttempt(BaseModel):
     """Track login attempts for brute force protection."""
     __tablename__ = "login_attempts"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Enum as SQLEnum, DateTime, ForeignKey
+from sqlalchemy import Column, String, Text, Integer, Enum as SQLEnum, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .base import BaseModel
@@ -8,6 +8,17 @@ from ..schemas.common import UserRole, UserStatus
 class User(BaseModel):
     """User database model."""
     __tablename__ = "users"
+    __table_args__ = (
+        # Revocation sync reads only users whose tokens were invalidated
+        Index(
+            "ix_users_token_version_nonzero",
+            "token_version",
+            postgresql_where=text("token_version > 0"),
+            sqlite_where=text("token_version > 0"),
+        ),
+        # Keyset pagination of the admin user list
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
     
     email = Column(String, unique=True, index=True, nullable=False)
     username = Column(String, unique=True, index=True, nullable=False)
@@ -19,6 +30,8 @@ class User(BaseModel):
     role = Column(SQLEnum(UserRole), default=UserRole.USER, nullable=False)
     status = Column(SQLEnum(UserStatus), default=UserStatus.ACTIVE, nullable=False)
     last_login = Column(DateTime(timezone=True), nullable=True)
+    # Bumped when an admin changes role/status; signed into access tokens as `ver`
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
     
     courses_created = relationship(
         "Course",
@@ -58,15 +71,28 @@ class User(BaseModel):
         back_populates="buyer",
         primaryjoin="Order.buyer_id==User.id",
     )
+    # security / audit records
+    blacklisted_tokens = relationship("TokenBlacklist", back_populates="user")
+    login_attempts = relationship("LoginAttempt", back_populates="user")
+    password_history = relationship("PasswordHistory", back_populates="user")
+    sessions = relationship("UserSession", back_populates="user")
+    security_events = relationship("SecurityEvent", back_populates="user")
 
 
 class RoleApplication(BaseModel):
     """Role application database model."""
     __tablename__ = "role_applications"
+    __table_args__ = (
+        # Keyset pagination of a user's applications and of the admin list
+        Index("ix_role_applications_user_id_applied_at_id", "user_id", "applied_at", "id"),
+        Index("ix_role_applications_applied_at_id", "applied_at", "id"),
+        # Admin review queue filtered by status (also serves status lookups)
+        Index("ix_role_applications_status_applied_at_id", "status", "applied_at", "id"),
+    )
     
     user_id = Column(ForeignKey("users.id"), index=True, nullable=False)
     requested_role = Column(String, index=True, nullable=False)  # mentor, seller, writer
-    status = Column(String, index=True, default="pending", nullable=False)  # pending, approved, rejected
+    status = Column(String, default="pending", nullable=False)  # pending, approved, rejected
     reason = Column(Text, nullable=False)  # User's application reason
     application_data = Column(String, nullable=True)  # JSON string for additional details
     admin_notes = Column(Text, nullable=True)  # Admin review notes
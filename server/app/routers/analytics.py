@@ -1,9 +1,10 @@
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import func, and_, select
+from sqlalchemy.orm import load_only
 from fastapi import APIRouter, Depends
-from app.core.database import get_async_db
-from app.core.dependencies import get_current_active_user, require_role
+from app.core.database import get_async_read_db, pool_status
+from app.core.dependencies import get_current_principal, require_role
 from app.models.user import User as DBUser
 from app.models.course import Course as DBCourse, Enrollment as DBEnrollment
 from app.models.article import Article as DBArticle
@@ -17,8 +18,8 @@ router = APIRouter(prefix="/analytics", tags=["Analytics"])
 # Overview Analytics
 @router.get("/overview")
 async def get_overview_analytics(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_async_db)
+    current_user: User = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get system overview analytics."""
     
@@ -84,7 +85,7 @@ async def get_overview_analytics(
 @router.get("/users")
 async def get_user_analytics(
     current_user: User = Depends(require_role(UserRole.ADMIN)),
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get detailed user analytics (Admin only)."""
     
@@ -144,8 +145,8 @@ async def get_user_analytics(
 # Course Analytics
 @router.get("/courses")
 async def get_course_analytics(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_async_db)
+    current_user: User = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get course performance analytics."""
     
@@ -248,8 +249,8 @@ async def get_course_analytics(
 # Article Analytics
 @router.get("/articles")
 async def get_article_analytics(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_async_db)
+    current_user: User = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get article and content analytics."""
     
@@ -332,8 +333,8 @@ async def get_article_analytics(
 # Product Analytics
 @router.get("/products")
 async def get_product_analytics(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_async_db)
+    current_user: User = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get product and marketplace analytics."""
     
@@ -415,8 +416,8 @@ async def get_product_analytics(
 # Activity Analytics
 @router.get("/activity")
 async def get_recent_activity(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_read_db),
     limit: int = 50
 ):
     """Get recent system activity."""
@@ -439,7 +440,9 @@ async def get_recent_activity(
     
     # Recent course creations
     recent_courses_result = await db.execute(
-        select(DBCourse).order_by(DBCourse.created_at.desc()).limit(10)
+        select(DBCourse)
+        .options(load_only(DBCourse.id, DBCourse.title, DBCourse.created_at, raiseload=True))
+        .order_by(DBCourse.created_at.desc()).limit(10)
     )
     recent_courses = recent_courses_result.scalars().all()
     
@@ -455,6 +458,8 @@ async def get_recent_activity(
     recent_articles_result = await db.execute(
         select(DBArticle).where(
             DBArticle.status == ArticleStatus.PUBLISHED
+        ).options(
+            load_only(DBArticle.id, DBArticle.title, DBArticle.published_at, DBArticle.created_at, raiseload=True)
         ).order_by(DBArticle.published_at.desc()).limit(10)
     )
     recent_articles = recent_articles_result.scalars().all()
@@ -473,3 +478,12 @@ async def get_recent_activity(
     return {
         "activities": activities[:limit]
     }
+
+
+# Database pool
+@router.get("/db-pool")
+async def get_db_pool_status(
+    current_user: User = Depends(require_role(UserRole.ADMIN))
+):
+    """Get connection pool usage and checkout wait times for this worker process."""
+    return pool_status()
@@ -1,12 +1,14 @@
-from typing import List, Optional
+from typing import List, Optional, Union
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import func, select
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from app.core.database import get_async_db
+from app.core.database import get_async_db, get_async_read_db
+from app.core.inverted_index import index_document, remove_document
+from app.core.pagination import CURSOR_DESCRIPTION, VIEW_DESCRIPTION, fetch_page, summary_load
 from app.models.article import Article as DBArticle, generate_slug
 from app.models.user import User as DBUser
-from app.schemas.article import Article, ArticleCreate, ArticleUpdate
+from app.schemas.article import Article, ArticleCreate, ArticleSummary, ArticleUpdate
 from app.schemas.common import ArticleStatus, UserRole, SuccessResponse, PaginatedResponse
 from app.schemas.user import User
 from app.core.dependencies import get_current_active_user, get_writer_or_admin
@@ -55,21 +57,29 @@ async def create_article(
     db.add(db_article)
     await db.commit()
     await db.refresh(db_article)
+    index_document("article", db_article)
     
     return Article.model_validate(db_article)
 
 
-@router.get("/", response_model=PaginatedResponse[Article])
+@router.get("/", response_model=PaginatedResponse[Union[Article, ArticleSummary]])
 async def get_articles(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
     status: Optional[ArticleStatus] = None,
     author_id: Optional[int] = None,
-    db: AsyncSession = Depends(get_async_db)
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    view: str = Query("full", regex="^(full|summary)$", description=VIEW_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """Get paginated list of articles."""
+    """Get paginated list of articles, newest first."""
     
-    query = select(DBArticle)
+    summary = view == "summary"
+    if summary:
+        # Cards need the length of the content for reading time, not the content
+        query = select(DBArticle, func.length(DBArticle.content)).options(summary_load(DBArticle, ArticleSummary))
+    else:
+        query = select(DBArticle)
     
     # Only show published articles to regular users
     query = query.where(DBArticle.status == ArticleStatus.PUBLISHED)
@@ -77,24 +87,28 @@ async def get_articles(
     if author_id:
         query = query.where(DBArticle.author_id == author_id)
     
-    # Get total count
-    count_query = select(func.count(DBArticle.id)).where(DBArticle.status == ArticleStatus.PUBLISHED)
-    if author_id:
-        count_query = count_query.where(DBArticle.author_id == author_id)
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-    
-    # Apply pagination
-    skip = (page - 1) * size
-    result = await db.execute(query.offset(skip).limit(size))
-    articles = result.scalars().all()
+    # Apply pagination; the total comes back with the page
+    result = await fetch_page(
+        db, query,
+        sort_column=DBArticle.created_at, id_column=DBArticle.id,
+        page=page, size=size, cursor=cursor, scalars=not summary,
+    )
     
+    if summary:
+        items = [
+            ArticleSummary.model_validate(article).model_copy(update={"content_length": content_length})
+            for article, content_length in result.items
+        ]
+    else:
+        items = [Article.model_validate(article) for article in result.items]
+
     return PaginatedResponse(
-        items=[Article.model_validate(article) for article in articles],
-        total=total,
+        items=items,
+        total=result.total,
         page=page,
         size=size,
-        pages=(total + size - 1) // size,
+        pages=(result.total + size - 1) // size,
+        next_cursor=result.next_cursor,
     )
 
 
@@ -243,6 +257,7 @@ async def update_article(
     
     await db.commit()
     await db.refresh(article)
+    index_document("article", article)
     
     return Article.model_validate(article)
 
@@ -274,6 +289,7 @@ async def delete_article(
     
     await db.delete(article)
     await db.commit()
+    remove_document("article", article_id)
     
     return SuccessResponse(
         message="Article deleted successfully",
@@ -1,20 +1,62 @@
+from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordRequestForm
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordRequestForm, HTTPAuthorizationCredentials
 from app.core.database import get_async_db
 from app.models.user import User as DBUser
+from app.models.security import TokenBlacklist
 from app.schemas.user import User
 from app.schemas.auth import RegisterRequest, LoginRequest, Token
 from app.schemas.common import UserRole, UserStatus, SuccessResponse
 from pydantic import BaseModel
-from app.core.security import get_password_hash
-from app.core.dependencies import get_current_active_user
+from app.core.security import get_password_hash, verify_token, token_digest
+from app.core.dependencies import security, get_current_user, get_current_active_user, invalidate_principal
+from app.core.revocation import ROLE_UPGRADES, revocation_list
+from app.core.activity import activity_recorder
 from app.services.auth_service import AuthService
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
+def _client_info(request: Request):
+    """Return (ip_address, user_agent) for activity records."""
+    ip_address = request.client.host if request.client else "unknown"
+    return ip_address, request.headers.get("user-agent")
+
+
+async def _login_and_record(db: AsyncSession, login_data: LoginRequest, request: Request) -> Token:
+    """Log the user in and queue the login attempt and session (write-behind)."""
+    ip_address, user_agent = _client_info(request)
+    try:
+        token = await AuthService.login_user(db, login_data)
+    except HTTPException as exc:
+        activity_recorder.record_login_attempt(
+            email=login_data.email,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            successful=False,
+            failure_reason=str(exc.detail),
+        )
+        raise
+
+    activity_recorder.record_login_attempt(
+        email=login_data.email,
+        ip_address=ip_address,
+        user_agent=user_agent,
+        successful=True,
+        user_id=token.user.id,
+    )
+    activity_recorder.start_session(
+        session_token=token_digest(token.access_token),
+        user_id=token.user.id,
+        ip_address=ip_address,
+        user_agent=user_agent,
+        expires_in_seconds=token.expires_in,
+    )
+    return token
+
+
 @router.post("/register", response_model=SuccessResponse)
 async def register(user_data: RegisterRequest, db: AsyncSession = Depends(get_async_db)):
     """Register a new user."""
@@ -23,13 +65,17 @@ async def register(user_data: RegisterRequest, db: AsyncSession = Depends(get_as
 
 
 @router.post("/login", response_model=Token)
-async def login(user_data: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+async def login(user_data: LoginRequest, request: Request, db: AsyncSession = Depends(get_async_db)):
     """Authenticate user and return access token."""
-    return await AuthService.login_user(db, user_data)
+    return await _login_and_record(db, user_data, request)
 
 
 @router.post("/login/oauth", response_model=Token)
-async def login_oauth(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+async def login_oauth(
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db)
+):
     """OAuth2 compatible login endpoint."""
     
     from app.schemas.auth import LoginRequest
@@ -41,6 +87,14 @@ async def login_oauth(form_data: OAuth2PasswordRequestForm = Depends(), db: Asyn
         user = result.scalars().first()
     
     if not user:
+        ip_address, user_agent = _client_info(request)
+        activity_recorder.record_login_attempt(
+            email=form_data.username,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            successful=False,
+            failure_reason="Invalid credentials",
+        )
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
@@ -49,7 +103,42 @@ async def login_oauth(form_data: OAuth2PasswordRequestForm = Depends(), db: Asyn
     
     login_request = LoginRequest(email=user.email, password=form_data.password)
     
-    return await AuthService.login_user(db, login_request)
+    return await _login_and_record(db, login_request, request)
+
+
+@router.post("/logout", response_model=SuccessResponse)
+async def logout(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Revoke the bearer token used for this request."""
+    token = credentials.credentials
+    token_data = verify_token(token)
+    digest = token_digest(token)
+    expires_at = datetime.fromtimestamp(token_data["exp"], tz=timezone.utc)
+
+    db.add(TokenBlacklist(
+        token=digest,
+        token_type="access",
+        user_id=current_user.id,
+        expires_at=expires_at,
+        revocation_reason="logout"
+    ))
+    await db.commit()
+    revocation_list.add(digest, expires_at)
+
+    ip_address, user_agent = _client_info(request)
+    activity_recorder.end_session(digest)
+    activity_recorder.record_security_event(
+        event_type="logout",
+        ip_address=ip_address,
+        user_agent=user_agent,
+        user_id=current_user.id,
+    )
+
+    return SuccessResponse(message="Logged out successfully")
 
 
 class RoleUpgradeBody(BaseModel):
@@ -64,14 +153,9 @@ async def upgrade_user_role(
 ):
     """Upgrade user role (e.g., user -> student when enrolling in a course)."""
     
-    upgrade_rules = {
-        UserRole.USER: [UserRole.STUDENT, UserRole.MENTOR, UserRole.SELLER, UserRole.WRITER],
-        UserRole.STUDENT: [UserRole.MENTOR, UserRole.SELLER, UserRole.WRITER],
-    }
-    
     current_role = UserRole(current_user.role)
     
-    if body.new_role not in upgrade_rules.get(current_role, []):
+    if body.new_role not in ROLE_UPGRADES.get(current_role, []):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Cannot upgrade from {current_role} to {body.new_role}"
@@ -81,8 +165,13 @@ async def upgrade_user_role(
     db_user = result.scalars().first()
     db_user.role = body.new_role
     await db.commit()
+    invalidate_principal(current_user.id)
     
     return SuccessResponse(
         message=f"Role upgraded to {body.new_role} successfully",
-        data={"old_role": current_role, "new_role": body.new_role}
+        data={
+            "old_role": current_role,
+            "new_role": body.new_role,
+            "access_token": AuthService.access_token_for(db_user),
+        }
     )
@@ -1,14 +1,17 @@
 from typing import Optional, Any
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import func, or_, desc, text, cast, String, select
+from sqlalchemy import func, desc, cast, String, select
+from sqlalchemy.orm import load_only
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from app.core.database import get_async_db
 from app.core.dependencies import require_role
+from app.core.inverted_index import index_document
 from app.models.user import User as DBUser
 from app.models.article import Article as DBArticle
 from app.models.course import Course as DBCourse
 from app.models.product import Product as DBProduct
+from app.services.search_service import substring_filter
 from app.schemas.user import User
 from app.schemas.common import UserRole, ArticleStatus, CourseStatus, ProductStatus, PaginatedResponse, SuccessResponse
 from app.schemas.content_management import (
@@ -52,6 +55,24 @@ def get_content_type_author_field(content_type: str) -> str:
     return author_fields.get(content_type, "author_id")
 
 
+# Optional ContentOverviewItem fields, loaded where the content model has them
+OVERVIEW_COLUMNS = (
+    "slug", "status", "created_at", "updated_at", "published_at", "views_count",
+    "is_featured", "admin_notes", "admin_action_by", "admin_action_at",
+)
+
+
+def overview_load(model, content_type: str):
+    """Load only what `map_content_to_overview_item` reads (not content/descriptions)."""
+    return load_only(
+        model.id,
+        getattr(model, get_content_type_name_field(content_type)),
+        getattr(model, get_content_type_author_field(content_type)),
+        *(getattr(model, name) for name in OVERVIEW_COLUMNS if hasattr(model, name)),
+        raiseload=True,
+    )
+
+
 def map_content_to_overview_item(content: Any, content_type: str, author_name: str, author_role: str) -> ContentOverviewItem:
     """Map database content model to ContentOverviewItem."""
     title = getattr(content, get_content_type_name_field(content_type))
@@ -98,7 +119,11 @@ async def get_all_content(
         if not model:
             continue
 
-        query = select(model).join(DBUser, getattr(model, get_content_type_author_field(ct)) == DBUser.id)
+        query = (
+            select(model)
+            .join(DBUser, getattr(model, get_content_type_author_field(ct)) == DBUser.id)
+            .options(overview_load(model, ct))
+        )
 
         if status_filter:
             # Normalize string status to Enum value per content type
@@ -117,36 +142,25 @@ async def get_all_content(
             query = query.where(DBUser.role == author_role)
 
         if search:
-            name_field = getattr(model, get_content_type_name_field(ct))
-            query = query.where(
-                or_(
-                    name_field.ilike(f"%{search}%"),
-                    model.description.ilike(f"%{search}%") if hasattr(model, 'description') else text("false"),
-                    DBUser.full_name.ilike(f"%{search}%")
-                )
-            )
+            search_fields = [getattr(model, get_content_type_name_field(ct)), DBUser.full_name]
+            if hasattr(model, 'description'):
+                search_fields.append(model.description)
+            query = query.where(substring_filter(db, search_fields, search))
 
-        count_result = await db.execute(select(func.count(model.id)).select_from(query.subquery()))
+        count_result = await db.execute(select(func.count()).select_from(query.subquery()))
         type_count = count_result.scalar()
         total_count += type_count or 0
 
         skip = (page - 1) * size
+        # Author name and role come from the join, not one lookup per item
         result = await db.execute(
-            query.order_by(desc(model.created_at)).offset(skip).limit(size)
+            query.add_columns(DBUser.full_name, DBUser.role)
+            .order_by(desc(model.created_at)).offset(skip).limit(size)
         )
-        results = result.scalars().all()
-
-        for item in results:
-            # Get author information
-            author_result = await db.execute(
-                select(DBUser).where(DBUser.id == getattr(item, get_content_type_author_field(ct)))
-            )
-            author = author_result.scalars().first()
-            if not author:
-                continue
 
+        for item, author_name, author_role_value in result.all():
             content_items.append(map_content_to_overview_item(
-                item, ct, str(author.full_name), str(author.role.value)
+                item, ct, str(author_name), str(author_role_value.value)
             ))
 
     content_items.sort(key=lambda x: x.created_at, reverse=True)
@@ -227,6 +241,8 @@ async def toggle_content_status(
             content.published_at = datetime.utcnow()
 
     await db.commit()
+    # Publishing state decides what search suggests
+    index_document(content_type[:-1], content)
 
     return SuccessResponse(
         message=f"Content {action_data.action}ed successfully",
@@ -1,11 +1,14 @@
-from typing import Optional
+from typing import Optional, Union
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import func, select
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from pydantic import BaseModel
-from app.core.database import get_async_db
+from app.core.database import get_async_db, get_async_read_db
+from app.core.inverted_index import index_document, remove_document
+from app.core.pagination import CURSOR_DESCRIPTION, VIEW_DESCRIPTION, fetch_page, summary_load
 from app.models.course import Course as DBCourse, Enrollment as DBEnrollment
-from app.schemas.course import Course, CourseCreate, CourseUpdate, Enrollment
+from app.services.search_service import substring_filter
+from app.schemas.course import Course, CourseCreate, CourseSummary, CourseUpdate, Enrollment
 from app.schemas.common import (
     CourseStatus,
     UserRole,
@@ -62,11 +65,12 @@ async def create_course(
     db.add(db_course)
     await db.commit()
     await db.refresh(db_course)
+    index_document("course", db_course)
 
     return Course.model_validate(db_course)
 
 
-@router.get("/", response_model=PaginatedResponse[Course])
+@router.get("/", response_model=PaginatedResponse[Union[Course, CourseSummary]])
 async def get_courses(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
@@ -75,61 +79,44 @@ async def get_courses(
     level: Optional[str] = None,
     sort_by: Optional[str] = Query(None, regex="^(title|price|created_at|enrolled_count)$"),
     sort_order: Optional[str] = Query("desc", regex="^(asc|desc)$"),
-    db: AsyncSession = Depends(get_async_db),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    view: str = Query("full", regex="^(full|summary)$", description=VIEW_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     """Get paginated list of published courses."""
+    item_schema = CourseSummary if view == "summary" else Course
     # Build base query
     query = select(DBCourse).where(DBCourse.status == CourseStatus.PUBLISHED)
-    count_query = select(func.count(DBCourse.id)).where(
-        DBCourse.status == CourseStatus.PUBLISHED
-    )
+    if item_schema is CourseSummary:
+        query = query.options(summary_load(DBCourse, CourseSummary))
 
     # Apply filters
     if mentor_id:
         query = query.where(DBCourse.mentor_id == mentor_id)
-        count_query = count_query.where(DBCourse.mentor_id == mentor_id)
 
     if search:
-        search_filter = f"%{search}%"
-        query = query.where(
-            (DBCourse.title.ilike(search_filter)) |
-            (DBCourse.description.ilike(search_filter))
-        )
-        count_query = count_query.where(
-            (DBCourse.title.ilike(search_filter)) |
-            (DBCourse.description.ilike(search_filter))
-        )
+        query = query.where(substring_filter(db, [DBCourse.title, DBCourse.description], search))
 
     if level and level != "all":
         query = query.where(DBCourse.level == level)
-        count_query = count_query.where(DBCourse.level == level)
-
-    # Apply sorting
-    if sort_by:
-        sort_column = getattr(DBCourse, sort_by)
-        if sort_order == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-    else:
-        # Default sorting by creation date (newest first)
-        query = query.order_by(DBCourse.created_at.desc())
 
-    # Get total count
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
-    # Apply pagination
-    skip = (page - 1) * size
-    result = await db.execute(query.offset(skip).limit(size))
-    items = result.scalars().all()
+    # Sort (default: newest first) with id as tie-breaker, then paginate;
+    # the total comes back with the page
+    result = await fetch_page(
+        db, query,
+        sort_column=getattr(DBCourse, sort_by or "created_at"),
+        id_column=DBCourse.id,
+        descending=sort_order != "asc",
+        page=page, size=size, cursor=cursor,
+    )
 
     return PaginatedResponse(
-        items=[Course.model_validate(c) for c in items],
-        total=total,
+        items=[item_schema.model_validate(c) for c in result.items],
+        total=result.total,
         page=page,
         size=size,
-        pages=(total + size - 1) // size,
+        pages=(result.total + size - 1) // size,
+        next_cursor=result.next_cursor,
     )
 
 
@@ -203,7 +190,7 @@ async def get_my_enrollments(
 
 
 @router.get("/slug/{slug}", response_model=Course)
-async def get_course_by_slug(slug: str, db: AsyncSession = Depends(get_async_db)):
+async def get_course_by_slug(slug: str, db: AsyncSession = Depends(get_async_read_db)):
     """Get course by slug."""
 
     result = await db.execute(select(DBCourse).where(DBCourse.slug == slug))
@@ -217,7 +204,7 @@ async def get_course_by_slug(slug: str, db: AsyncSession = Depends(get_async_db)
 
 
 @router.get("/{course_id}", response_model=Course)
-async def get_course(course_id: int, db: AsyncSession = Depends(get_async_db)):
+async def get_course(course_id: int, db: AsyncSession = Depends(get_async_read_db)):
     """Get course by ID."""
 
     result = await db.execute(select(DBCourse).where(DBCourse.id == course_id))
@@ -286,6 +273,7 @@ async def update_course(
 
     await db.commit()
     await db.refresh(course)
+    index_document("course", course)
 
     return Course.model_validate(course)
 
@@ -317,6 +305,7 @@ async def delete_course(
 
     await db.delete(course)
     await db.commit()
+    remove_document("course", course_id)
 
     return SuccessResponse(
         message="Course deleted successfully", data={"course_id": course_id}
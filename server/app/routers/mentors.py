@@ -4,8 +4,10 @@ from typing import Any, Dict, List, Optional, TypedDict
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy import and_, distinct, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
 from app.core.database import get_async_db
+from app.core.pagination import CURSOR_DESCRIPTION, fetch_page
 from app.core.dependencies import get_mentor_or_admin
 from app.models.course import Course as DBCourse, Enrollment as DBEnrollment
 from app.models.user import User as DBUser
@@ -111,7 +113,12 @@ async def get_mentor_overview(
 
     # Get course performance data
     courses_result = await db.execute(
-        select(DBCourse).where(DBCourse.mentor_id == current_user.id)
+        select(DBCourse)
+        .where(DBCourse.mentor_id == current_user.id)
+        .options(load_only(
+            DBCourse.id, DBCourse.title, DBCourse.status, DBCourse.created_at, DBCourse.updated_at,
+            raiseload=True,
+        ))
     )
     courses = courses_result.scalars().all()
     course_ids = [course.id for course in courses]
@@ -184,6 +191,7 @@ async def get_mentor_students(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
     course_id: Optional[int] = None,
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
     current_user: User = Depends(get_mentor_or_admin),
     db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
@@ -193,26 +201,13 @@ async def get_mentor_students(
         page: Page number (1-based)
         size: Number of items per page (max 100)
         course_id: Optional filter by specific course
+        cursor: Keyset pagination cursor (empty for the first page)
         current_user: Authenticated mentor user
         db: Database session
 
     Returns:
         Paginated response with student enrollment data
     """
-    # Get total count for pagination
-    count_query = (
-        select(func.count(DBEnrollment.id))
-        .join(DBCourse, DBEnrollment.course_id == DBCourse.id)
-        .join(DBUser, DBEnrollment.student_id == DBUser.id)
-        .where(DBCourse.mentor_id == current_user.id)
-    )
-    if course_id:
-        count_query = count_query.where(DBEnrollment.course_id == course_id)
-    
-    count_result = await db.execute(count_query)
-    total = count_result.scalar()
-
-    # Apply pagination at database level
     query = (
         select(DBEnrollment, DBUser, DBCourse)
         .join(DBCourse, DBEnrollment.course_id == DBCourse.id)
@@ -223,16 +218,17 @@ async def get_mentor_students(
     if course_id:
         query = query.where(DBEnrollment.course_id == course_id)
 
-    # Apply database-level pagination
-    result = await db.execute(
-        query.order_by(DBEnrollment.enrolled_at.desc())
-        .offset((page - 1) * size)
-        .limit(size)
+    # Apply database-level pagination; the total comes back with the page
+    page_result = await fetch_page(
+        db, query,
+        sort_column=DBEnrollment.enrolled_at, id_column=DBEnrollment.id,
+        page=page, size=size, cursor=cursor, scalars=False,
     )
-    items = result.all()
+    total = page_result.total
+    next_cursor = page_result.next_cursor
 
     results: List[MentorStudentItem] = []
-    for enrollment, student, course in items:
+    for enrollment, student, course in page_result.items:
         try:
             status_value = (
                 enrollment.status.value if hasattr(enrollment.status, 'value') else str(enrollment.status)
@@ -259,6 +255,7 @@ async def get_mentor_students(
         "page": page,
         "size": size,
         "pages": pages,
+        "next_cursor": next_cursor,
     }
 
 
@@ -287,6 +284,7 @@ async def get_mentor_activity(
     result = await db.execute(
         select(DBCourse)
         .where(DBCourse.mentor_id == current_user.id)
+        .options(load_only(DBCourse.id, DBCourse.title, DBCourse.created_at, raiseload=True))
         .order_by(DBCourse.created_at.desc())
         .limit(min(10, limit))
     )
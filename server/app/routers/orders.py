@@ -1,8 +1,9 @@
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Body, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import func, select
 from app.core.database import get_async_db
+from app.core.pagination import CURSOR_DESCRIPTION
 from app.core.dependencies import get_current_active_user, get_seller_or_admin, require_roles
 from app.schemas.order import OrderCreate, Order
 from app.schemas.common import PaginatedResponse
@@ -39,17 +40,21 @@ async def get_order(order_id: int, db: AsyncSession = Depends(get_async_db), cur
 async def list_orders(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
     db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     skip = (page - 1) * size
-    orders, total = await OrderService.list_orders(db, buyer_id=current_user.id, skip=skip, limit=size)
+    orders, total, next_cursor = await OrderService.list_orders(
+        db, buyer_id=current_user.id, skip=skip, limit=size, cursor=cursor
+    )
     return PaginatedResponse(
         items=[Order.model_validate(o) for o in orders],
         total=total,
         page=page,
         size=size,
         pages=(total + size - 1) // size,
+        next_cursor=next_cursor,
     )
 
 
@@ -3,13 +3,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.core.database import get_async_db
 from app.core.dependencies import get_current_active_user
-from app.core.security import verify_password, get_password_hash
+from app.core.security import verify_password_async, get_password_hash_async
 from app.models.user import User as DBUser
 from app.schemas.user import User
 from app.schemas.password import ChangePasswordRequest, ForgotPasswordRequest, ResetPasswordRequest, PasswordResetResponse
 from app.core.config import settings
 from app.schemas.common import SuccessResponse
-import asyncio
 
 router = APIRouter(prefix="/password", tags=["Password"])
 
@@ -28,18 +27,18 @@ async def change_password(
     if not db_user:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Current password is incorrect.")
 
-    # Run password verification in thread pool
-    current_password_valid = await asyncio.to_thread(verify_password, payload.current_password, str(db_user.hashed_password))
+    # Run password verification on the hashing pool
+    current_password_valid = await verify_password_async(payload.current_password, str(db_user.hashed_password))
     if not current_password_valid:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Current password is incorrect.")
 
     # Check if new password is different from current
-    new_password_same = await asyncio.to_thread(verify_password, payload.new_password, str(db_user.hashed_password))
+    new_password_same = await verify_password_async(payload.new_password, str(db_user.hashed_password))
     if new_password_same:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="New password must be different from the current password.")
 
-    # Hash new password in thread pool
-    new_password_hash = await asyncio.to_thread(get_password_hash, payload.new_password)
+    # Hash new password on the hashing pool
+    new_password_hash = await get_password_hash_async(payload.new_password)
     db_user.hashed_password = new_password_hash  # type: ignore
     await db.commit()
     return SuccessResponse(message="Password updated successfully.")
@@ -48,8 +47,6 @@ async def change_password(
 
 import secrets
 from datetime import datetime, timedelta
-import smtplib
-from email.mime.text import MIMEText
 from app.models.password_reset_token import PasswordResetToken
 
 RESET_TOKEN_EXPIRY_MINUTES = 30
@@ -60,6 +57,11 @@ def get_email_setting(attr: str, fallback: str = "") -> str:
     return str(val) if val is not None else fallback
 
 def send_reset_email(to_email: str, token: str):
+    # Imported here: only the forgot-password flow sends mail, so keep
+    # smtplib/ssl/email out of application startup
+    import smtplib
+    from email.mime.text import MIMEText
+
     frontend_url = get_email_setting("client_app_url", "https://kfats.vercel.app")
     reset_link = f"{frontend_url.rstrip('/')}/reset-password?token={token}"
     subject = "KFATS Password Reset"
@@ -148,8 +150,8 @@ async def reset_password(payload: ResetPasswordRequest, db: AsyncSession = Depen
     if not user:
         raise HTTPException(status_code=404, detail="User not found.")
 
-    # Hash new password in thread pool
-    new_password_hash = await asyncio.to_thread(get_password_hash, payload.new_password)
+    # Hash new password on the hashing pool
+    new_password_hash = await get_password_hash_async(payload.new_password)
     user.hashed_password = new_password_hash  # type: ignore
     db_token.used = 1  # type: ignore
     await db.commit()
@@ -4,9 +4,11 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_async_db
+from app.core.database import get_async_db, get_async_read_db
+from app.core.inverted_index import index_document, remove_document
+from app.core.pagination import CURSOR_DESCRIPTION, VIEW_DESCRIPTION, fetch_page, summary_load
 from app.models.product import Product as DBProduct
-from app.schemas.product import Product, ProductCreate, ProductUpdate
+from app.schemas.product import Product, ProductCreate, ProductSummary, ProductUpdate
 from app.schemas.common import (
     ProductStatus,
     ProductCategory,
@@ -87,6 +89,7 @@ async def create_product(
     db.add(db_product)
     await db.commit()
     await db.refresh(db_product)
+    index_document("product", db_product)
 
     return Product.model_validate(db_product)
 
@@ -99,9 +102,11 @@ async def get_products(
     seller_id: Optional[int] = None,
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
-    db: AsyncSession = Depends(get_async_db),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    view: str = Query("full", regex="^(full|summary)$", description=VIEW_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    """Get list of products."""
+    """Get list of products, newest first."""
 
     # Build base statement
     where_clauses = [DBProduct.status == ProductStatus.ACTIVE]
@@ -114,26 +119,28 @@ async def get_products(
     if max_price is not None:
         where_clauses.append(DBProduct.price <= max_price)
 
-    skip = (page - 1) * size
-    limit = size
-
-    # total count
-    count_stmt = select(func.count()).select_from(DBProduct).where(*where_clauses)
-    total = await db.scalar(count_stmt) or 0
+    item_schema = ProductSummary if view == "summary" else Product
+    query = select(DBProduct).where(*where_clauses)
+    if item_schema is ProductSummary:
+        query = query.options(summary_load(DBProduct, ProductSummary))
 
-    # fetch rows
-    stmt = select(DBProduct).where(*where_clauses).offset(skip).limit(limit)
-    res = await db.execute(stmt)
-    products = res.scalars().all()
+    # fetch rows and total count
+    result = await fetch_page(
+        db, query,
+        sort_column=DBProduct.created_at, id_column=DBProduct.id,
+        page=page, size=size, cursor=cursor,
+    )
+    total = result.total
 
     pages = math.ceil(total / size) if size > 0 else 1
 
     return PaginatedResponse(
-        items=[Product.model_validate(product) for product in products],
+        items=[item_schema.model_validate(product) for product in result.items],
         total=int(total),
         page=page,
         size=size,
         pages=pages,
+        next_cursor=result.next_cursor,
     )
 
 
@@ -177,7 +184,7 @@ async def get_my_products(
 
 
 @router.get("/{product_id}", response_model=Product)
-async def get_product(product_id: int, db: AsyncSession = Depends(get_async_db)):
+async def get_product(product_id: int, db: AsyncSession = Depends(get_async_read_db)):
     """Get product by ID."""
 
     stmt = select(DBProduct).where(
@@ -195,7 +202,7 @@ async def get_product(product_id: int, db: AsyncSession = Depends(get_async_db))
 
 
 @router.get("/slug/{slug}", response_model=Product)
-async def get_product_by_slug(slug: str, db: AsyncSession = Depends(get_async_db)):
+async def get_product_by_slug(slug: str, db: AsyncSession = Depends(get_async_read_db)):
     """Get product by slug (slug is derived from product name)."""
     normalized = slug.lower()
 
@@ -277,6 +284,7 @@ async def update_product(
 
     await db.commit()
     await db.refresh(product)
+    index_document("product", product)
 
     return Product.model_validate(product)
 
@@ -339,6 +347,7 @@ async def delete_product(
 
     await db.delete(product)
     await db.commit()
+    remove_document("product", product_id)
 
     return SuccessResponse(
         message="Product deleted successfully", data={"product_id": product_id}
@@ -350,7 +359,7 @@ async def get_products_by_category(
     category: ProductCategory,
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get paginated products by category."""
     
@@ -6,13 +6,15 @@ from sqlalchemy.orm import joinedload
 from sqlalchemy import and_, select, func
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from app.core.database import get_async_db
+from app.core.pagination import CURSOR_DESCRIPTION, ESTIMATE_TOTAL_DESCRIPTION, fetch_page
 from app.models.user import User as DBUser, RoleApplication as DBRoleApplication
 from app.schemas.user import RoleApplication, RoleApplicationCreate, RoleApplicationUpdate, User
 from app.schemas.common import (
     RoleApplicationStatus, ApplicationableRole, UserRole, SuccessResponse,
     PaginatedResponse
 )
-from app.core.dependencies import get_current_active_user, require_role
+from app.core.dependencies import get_current_active_user, require_role, invalidate_principal
+from app.core.revocation import role_change_revokes_tokens
 
 router = APIRouter(prefix="/role-applications", tags=["Role Applications"])
 
@@ -98,6 +100,7 @@ async def apply_for_role(
 async def get_my_applications(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
     current_user: DBUser = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_async_db)
 ):
@@ -108,29 +111,21 @@ async def get_my_applications(
         DBRoleApplication.user_id == current_user.id
     )
     
-    # Get total count
-    count_query = select(func.count(DBRoleApplication.id)).where(
-        DBRoleApplication.user_id == current_user.id
-    )
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-    
-    # Apply pagination
-    skip = (page - 1) * size
-    applications_result = await db.execute(
-        select(DBRoleApplication)
-        .where(DBRoleApplication.user_id == current_user.id)
-        .order_by(DBRoleApplication.applied_at.desc())
-        .offset(skip).limit(size)
+    # Apply pagination; the total comes back with the page
+    page_result = await fetch_page(
+        db, query,
+        sort_column=DBRoleApplication.applied_at, id_column=DBRoleApplication.id,
+        page=page, size=size, cursor=cursor,
     )
-    applications = applications_result.scalars().all()
+    total = page_result.total
     
     return PaginatedResponse(
-        items=[RoleApplication.model_validate(app) for app in applications],
+        items=[RoleApplication.model_validate(app) for app in page_result.items],
         total=total,
         page=page,
         size=size,
         pages=(total + size - 1) // size,
+        next_cursor=page_result.next_cursor,
     )
 
 
@@ -140,6 +135,8 @@ async def get_all_applications(
     role: Optional[ApplicationableRole] = Query(None, description="Filter by requested role"),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    estimate_total: bool = Query(False, description=ESTIMATE_TOTAL_DESCRIPTION),
     current_user: DBUser = Depends(require_role(UserRole.ADMIN)),
     db: AsyncSession = Depends(get_async_db)
 ):
@@ -158,24 +155,17 @@ async def get_all_applications(
     if role:
         query = query.where(DBRoleApplication.requested_role == role)
     
-    # Get total count
-    count_query = select(func.count(DBRoleApplication.id))
-    if status:
-        count_query = count_query.where(DBRoleApplication.status == status)
-    if role:
-        count_query = count_query.where(DBRoleApplication.requested_role == role)
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-    
-    # Get paginated results
-    applications_result = await db.execute(
-        query.order_by(DBRoleApplication.applied_at.desc())
-        .offset((page - 1) * size).limit(size)
+    # Get paginated results; the total comes back with the page
+    page_result = await fetch_page(
+        db, query,
+        sort_column=DBRoleApplication.applied_at, id_column=DBRoleApplication.id,
+        page=page, size=size, cursor=cursor,
+        estimate_table=DBRoleApplication.__table__ if estimate_total and not (status or role) else None,
     )
-    applications = applications_result.scalars().all()
+    total = page_result.total
     
     result = []
-    for app in applications:
+    for app in page_result.items:
         app_data = RoleApplication.model_validate(app)
         if app.applicant:
             app_data.user = app.applicant
@@ -188,7 +178,9 @@ async def get_all_applications(
         total=total,
         page=page,
         size=size,
-        pages=(total + size - 1) // size
+        pages=(total + size - 1) // size,
+        next_cursor=page_result.next_cursor,
+        total_estimated=page_result.total_estimated
     )
 
 
@@ -198,6 +190,8 @@ async def get_all_applications_simple(
     role: Optional[ApplicationableRole] = Query(None, description="Filter by requested role"),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    estimate_total: bool = Query(False, description=ESTIMATE_TOTAL_DESCRIPTION),
     current_user: DBUser = Depends(require_role(UserRole.ADMIN)),
     db: AsyncSession = Depends(get_async_db)
 ):
@@ -216,25 +210,17 @@ async def get_all_applications_simple(
     if role:
         query = query.where(DBRoleApplication.requested_role == role)
     
-    # Get total count
-    count_query = select(func.count(DBRoleApplication.id))
-    if status:
-        count_query = count_query.where(DBRoleApplication.status == status)
-    if role:
-        count_query = count_query.where(DBRoleApplication.requested_role == role)
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-    
-    # Apply pagination
-    skip = (page - 1) * size
-    applications_result = await db.execute(
-        query.order_by(DBRoleApplication.applied_at.desc())
-        .offset(skip).limit(size)
+    # Get paginated results; the total comes back with the page
+    page_result = await fetch_page(
+        db, query,
+        sort_column=DBRoleApplication.applied_at, id_column=DBRoleApplication.id,
+        page=page, size=size, cursor=cursor,
+        estimate_table=DBRoleApplication.__table__ if estimate_total and not (status or role) else None,
     )
-    applications = applications_result.scalars().all()
+    total = page_result.total
     
     result = []
-    for app in applications:
+    for app in page_result.items:
         app_data = RoleApplication.model_validate(app)
         if app.applicant:
             app_data.user = app.applicant
@@ -248,6 +234,8 @@ async def get_all_applications_simple(
         page=page,
         size=size,
         pages=(total + size - 1) // size,
+        next_cursor=page_result.next_cursor,
+        total_estimated=page_result.total_estimated,
     )
 
 
@@ -291,10 +279,15 @@ async def review_application(
         )
         user = user_result.scalar_one_or_none()
         if user:
-            user.role = UserRole(application.requested_role)
+            new_role = UserRole(application.requested_role)
+            if role_change_revokes_tokens(user.role, new_role):
+                user.token_version = (user.token_version or 0) + 1
+            user.role = new_role
             user.updated_at = datetime.utcnow()
     
     await db.commit()
+    if review_data.status == RoleApplicationStatus.APPROVED and user:
+        invalidate_principal(application.user_id, token_version=user.token_version)
     
     status_text = "approved" if review_data.status == RoleApplicationStatus.APPROVED else "rejected"
     return SuccessResponse(
@@ -1,85 +1,65 @@
 from typing import List, Optional
-from fastapi import APIRouter, Query, Depends
+from fastapi import APIRouter, Query, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import or_, select
-from app.core.database import get_async_db
-from app.models.article import Article as DBArticle
-from app.models.course import Course as DBCourse
-from app.models.product import Product as DBProduct
+from app.core.database import get_async_read_db
+from app.core.dependencies import get_optional_principal
+from app.schemas.common import UserRole
+from app.schemas.user import User
+from app.services.search_service import SEARCH_TYPES, SearchService
 
 router = APIRouter(prefix="/search", tags=["Global Search"])
 
+
+@router.get("/suggest", response_model=List[dict])
+async def suggest(
+    query: str = Query(..., min_length=1, max_length=64),
+    type: Optional[str] = Query(None, regex="^(article|course|product|all)$"),
+    limit: int = Query(8, ge=1, le=20),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Search-as-you-type suggestions.
+
+    Published articles and courses and active products whose title (or any
+    word of it onwards) or slug starts with ``query``, most viewed, enrolled
+    or sold first. Each result has type, id, title and slug.
+    """
+    content_types = SEARCH_TYPES if type in (None, "all") else [type]
+    return await SearchService.suggest(db, query, content_types, limit)
+
+
+
 @router.get("/", response_model=List[dict])
 async def global_search(
+    response: Response,
     query: str = Query(..., min_length=2),
     type: Optional[str] = Query(None, regex="^(user|article|course|product|all)$"),
     limit: int = Query(10, ge=1, le=50),
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_read_db),
+    principal: Optional[User] = Depends(get_optional_principal)
 ):
     """
     Global search across users, articles, courses, and products.
-    Returns a unified list of results with type, id, title/name, and snippet.
-    """
-    results = []
-    search_term = f"%{query}%"
 
-    # Articles
-    if type in (None, "all", "article"):
-        article_result = await db.execute(
-            select(DBArticle).where(
-                or_(
-                    DBArticle.title.ilike(search_term),
-                    DBArticle.content.ilike(search_term),
-                    DBArticle.excerpt.ilike(search_term)
-                )
-            ).limit(limit)
-        )
-        articles = article_result.scalars().all()
-        for article in articles:
-            results.append({
-                "type": "article",
-                "id": article.id,
-                "title": article.title,
-                "snippet": (article.excerpt or article.content[:100]) if article.content else ""
-            })
+    Full-text matches ranked across types (see
+    `app.services.search_service`); each result has type, id, title,
+    a plain-text snippet, the ``[start, end)`` offsets of the matched
+    words in it as ``highlights``, and its score. Types that timed out
+    are listed in the ``X-Search-Incomplete`` header.
 
-    # Courses
-    if type in (None, "all", "course"):
-        course_result = await db.execute(
-            select(DBCourse).where(
-                or_(
-                    DBCourse.title.ilike(search_term),
-                    DBCourse.description.ilike(search_term)
-                )
-            ).limit(limit)
-        )
-        courses = course_result.scalars().all()
-        for course in courses:
-            results.append({
-                "type": "course",
-                "id": course.id,
-                "title": course.title,
-                "snippet": course.description[:100] if course.description else ""
-            })
-
-    # Products
-    if type in (None, "all", "product"):
-        product_result = await db.execute(
-            select(DBProduct).where(
-                or_(
-                    DBProduct.name.ilike(search_term),
-                    DBProduct.description.ilike(search_term)
-                )
-            ).limit(limit)
+    Users are only searched for admins; other callers searching all types
+    get articles, courses and products.
+    """
+    is_admin = principal is not None and UserRole(principal.role) == UserRole.ADMIN
+    if type == "user" and not is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied. Required role: admin"
         )
-        products = product_result.scalars().all()
-        for product in products:
-            results.append({
-                "type": "product",
-                "id": product.id,
-                "title": product.name,
-                "snippet": product.description[:100] if product.description else ""
-            })
-
-    # Optionally sort or deduplicate results here
-    return results[:limit]
+    content_types = SEARCH_TYPES if type in (None, "all") else [type]
+    if not is_admin:
+        content_types = [content_type for content_type in content_types if content_type != "user"]
+    results = await SearchService.search(db, query, content_types, limit)
+    if results.incomplete:
+        response.headers["X-Search-Incomplete"] = ",".join(results.incomplete)
+    return results.hits
@@ -3,7 +3,7 @@ from datetime import datetime, timedelta
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import APIRouter, Depends
-from app.core.database import get_async_db
+from app.core.database import get_async_read_db
 from app.core.dependencies import require_role
 from app.models.product import Product as DBProduct
 from app.models.order import Order as DBOrder
@@ -17,7 +17,7 @@ router = APIRouter(prefix="/seller/analytics", tags=["Seller Analytics"])
 @router.get("/revenue")
 async def get_seller_revenue_analytics(
     current_user: User = Depends(require_role(UserRole.SELLER)),
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get revenue analytics for the current seller using order_items as the source of truth."""
     seller_id = current_user.id
@@ -62,7 +62,7 @@ async def get_seller_revenue_analytics(
 @router.get("/orders")
 async def get_seller_order_analytics(
     current_user: User = Depends(require_role(UserRole.SELLER)),
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get order analytics for the current seller based on orders that include their products."""
     seller_id = current_user.id
@@ -137,7 +137,7 @@ async def get_seller_order_analytics(
 @router.get("/products")
 async def get_seller_product_performance(
     current_user: User = Depends(require_role(UserRole.SELLER)),
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get product performance analytics for the current seller using order_items as source of truth."""
     seller_id = current_user.id
@@ -1,14 +1,17 @@
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import or_, String, select
+from sqlalchemy import or_, select
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from pydantic import BaseModel
 from app.core.database import get_async_db
+from app.core.pagination import CURSOR_DESCRIPTION, ESTIMATE_TOTAL_DESCRIPTION, fetch_page
 from app.models.user import User as DBUser
+from app.services.search_service import substring_filter
 from app.schemas.user import User, UserUpdate
 from app.schemas.common import UserRole, UserStatus, SuccessResponse, PaginatedResponse
-from app.core.dependencies import get_current_active_user, get_admin_user
+from app.core.dependencies import get_current_active_user, get_admin_user, invalidate_principal
 from app.core.exceptions import ConflictError, BusinessLogicError
+from app.core.revocation import DELETED_USER_VERSION, deleted_user_revocation, role_change_revokes_tokens
 from app.core.error_utils import (
     ensure_user_exists,
     handle_database_error,
@@ -60,6 +63,7 @@ async def update_current_user_profile(
 
         await db.commit()
         await db.refresh(db_user)
+        invalidate_principal(current_user.id)
 
         return User.model_validate(db_user)
 
@@ -77,10 +81,12 @@ async def list_users(
     email: Optional[str] = Query(None, description="Search by email, name, username, or role"),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    estimate_total: bool = Query(False, description=ESTIMATE_TOTAL_DESCRIPTION),
     admin_user: User = Depends(get_admin_user),
     db: AsyncSession = Depends(get_async_db)
 ):
-    """Get paginated list of users (Admin only)."""
+    """Get paginated list of users, newest first (Admin only)."""
     
     query = select(DBUser)
     
@@ -91,48 +97,35 @@ async def list_users(
         query = query.where(DBUser.status == status)
     
     if email:
-        search_term = f"%{email}%"
+        # Roles are a handful of enum names; match those here, not per row
+        matching_roles = [r for r in UserRole if email.lower() in r.name.lower()]
         query = query.where(
             or_(
-                DBUser.email.ilike(search_term),
-                DBUser.full_name.ilike(search_term),
-                DBUser.username.ilike(search_term),
-                DBUser.role.cast(String).ilike(search_term)
+                substring_filter(db, [DBUser.email, DBUser.full_name, DBUser.username], email),
+                DBUser.role.in_(matching_roles)
             )
         )
     
-    # Get total count
-    from sqlalchemy import func
-    count_query = select(func.count(DBUser.id))
-    if role:
-        count_query = count_query.where(DBUser.role == role)
-    if status:
-        count_query = count_query.where(DBUser.status == status)
-    if email:
-        count_query = count_query.where(
-            or_(
-                DBUser.email.ilike(search_term),
-                DBUser.full_name.ilike(search_term),
-                DBUser.username.ilike(search_term),
-                DBUser.role.cast(String).ilike(search_term)
-            )
-        )
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-    
-    # Apply pagination
-    result = await db.execute(query.offset(skip).limit(limit))
-    users = result.scalars().all()
+    # Apply pagination; the total comes back with the page
+    unfiltered = not (role or status or email)
+    result = await fetch_page(
+        db, query,
+        sort_column=DBUser.created_at, id_column=DBUser.id,
+        size=limit, offset=skip, cursor=cursor,
+        estimate_table=DBUser.__table__ if estimate_total and unfiltered else None,
+    )
     
     page = (skip // limit) + 1
-    pages = (total + limit - 1) // limit
+    pages = (result.total + limit - 1) // limit
     
     return PaginatedResponse(
-        items=[User.model_validate(user) for user in users],
-        total=total,
+        items=[User.model_validate(user) for user in result.items],
+        total=result.total,
         page=page,
         size=limit,
-        pages=pages
+        pages=pages,
+        next_cursor=result.next_cursor,
+        total_estimated=result.total_estimated
     )
 
 
@@ -182,7 +175,10 @@ async def update_user_role(
     
     old_role = user.role
     user.role = request.new_role
+    if role_change_revokes_tokens(old_role, request.new_role):
+        user.token_version = (user.token_version or 0) + 1
     await db.commit()
+    invalidate_principal(user_id, token_version=user.token_version)
     
     return SuccessResponse(
         message=f"User role updated successfully",
@@ -213,7 +209,9 @@ async def delete_user(
             )
 
         await db.delete(user)
+        db.add(deleted_user_revocation(user_id, reason="user_deleted"))
         await db.commit()
+        invalidate_principal(user_id, token_version=DELETED_USER_VERSION)
 
         return SuccessResponse(
             message="User deleted successfully",
@@ -256,7 +254,9 @@ async def toggle_user_status(
         current = UserStatus.ACTIVE if str(user.status).lower() == "active" else UserStatus.INACTIVE
 
     user.status = UserStatus.INACTIVE if current == UserStatus.ACTIVE else UserStatus.ACTIVE
+    user.token_version = (user.token_version or 0) + 1
     await db.commit()
+    invalidate_principal(user_id, token_version=user.token_version)
 
     return SuccessResponse(
         message="User status updated successfully",
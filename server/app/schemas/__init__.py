@@ -18,7 +18,7 @@ __all__ = [
     "SuccessResponse", "ErrorResponse", "PaginatedResponse", "RoleUpgradeRequest",
     
     # Auth schemas
-    "Token", "TokenData", "LoginRequest", "RegisterRequest",
+    "Token", "TokenData", "TokenPrincipal", "LoginRequest", "RegisterRequest",
     
     # User schemas
     "User", "UserBase", "UserCreate", "UserUpdate", "UserInDB",
@@ -26,14 +26,14 @@ __all__ = [
     "RoleApplicationUpdate", "RoleApplicationInDB",
     
     # Course schemas
-    "Course", "CourseBase", "CourseCreate", "CourseUpdate",
+    "Course", "CourseBase", "CourseCreate", "CourseUpdate", "CourseSummary",
     "Enrollment", "EnrollmentBase", "EnrollmentCreate", "EnrollmentUpdate",
     
     # Article schemas
-    "Article", "ArticleBase", "ArticleCreate", "ArticleUpdate",
+    "Article", "ArticleBase", "ArticleCreate", "ArticleUpdate", "ArticleSummary",
     
     # Product schemas  
-    "Product", "ProductBase", "ProductCreate", "ProductUpdate",
+    "Product", "ProductBase", "ProductCreate", "ProductUpdate", "ProductSummary",
     
     # Content Management schemas
     "ContentActionRequest", "AdminNotesRequest", "ContentOverviewItem", 
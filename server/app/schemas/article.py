@@ -38,3 +38,23 @@ class Article(ArticleBase):
 
     class Config:
         from_attributes = True
+
+
+class ArticleSummary(BaseModel):
+    """Article card for lists (``view=summary``); leaves out the content."""
+    id: int
+    title: str
+    slug: str
+    excerpt: Optional[str] = None
+    featured_image_url: Optional[str] = None
+    tags: Optional[List[str]] = None
+    author_id: int
+    status: ArticleStatus
+    views_count: int
+    created_at: datetime
+    updated_at: datetime
+    published_at: Optional[datetime] = None
+    content_length: Optional[int] = None  # characters, for reading time estimates
+
+    class Config:
+        from_attributes = True
@@ -1,6 +1,6 @@
 from typing import Optional
 from pydantic import BaseModel, EmailStr
-from .common import UserRole
+from .common import UserRole, UserStatus
 
 
 class Token(BaseModel):
@@ -19,6 +19,15 @@ class TokenData(BaseModel):
     email: Optional[str] = None
 
 
+class TokenPrincipal(BaseModel):
+    """Caller identity built from verified access-token claims only."""
+    id: int
+    username: Optional[str] = None
+    email: Optional[str] = None
+    role: UserRole
+    status: UserStatus
+
+
 class LoginRequest(BaseModel):
     email: EmailStr
     password: str
@@ -153,6 +153,10 @@ class PaginatedResponse(BaseModel, Generic[T]):
     page: int
     size: int
     pages: int
+    # Set in cursor mode when another page follows (see app.core.pagination)
+    next_cursor: Optional[str] = None
+    # True when `total` is an estimate rather than an exact count
+    total_estimated: bool = False
 
 
 # Role Upgrade Request (for automatic upgrades)
@@ -45,6 +45,27 @@ class Course(CourseBase):
         from_attributes = True
 
 
+class CourseSummary(BaseModel):
+    """Course card for lists (``view=summary``); leaves out the description."""
+    id: int
+    title: str
+    slug: Optional[str] = None
+    short_description: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    level: CourseLevel
+    price: float
+    duration_hours: Optional[float] = None
+    max_students: Optional[int] = None
+    mentor_id: int
+    status: CourseStatus
+    enrolled_count: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 # Enrollment Models
 class EnrollmentBase(BaseModel):
     course_id: int
@@ -39,3 +39,21 @@ class Product(ProductBase):
 
     class Config:
         from_attributes = True
+
+
+class ProductSummary(BaseModel):
+    """Product card for lists (``view=summary``); leaves out the description."""
+    id: int
+    name: str
+    slug: Optional[str] = None
+    price: float
+    category: ProductCategory
+    image_urls: Optional[List[str]] = None
+    stock_quantity: Optional[int] = None
+    seller_id: int
+    status: ProductStatus
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -5,10 +5,11 @@ from sqlalchemy import select
 from fastapi import HTTPException, status
 from app.models.user import User as DBUser
 from app.schemas import User, LoginRequest, RegisterRequest, Token, PasswordChangeRequest
-from app.core.security import verify_password, create_access_token, get_password_hash
+from app.core.security import verify_password_async, verify_and_update_password_async, create_access_token, get_password_hash_async
 from app.services.user_service import UserService
 from app.schemas.common import UserStatus
 from app.core.config import settings
+from app.core.dependencies import invalidate_principal
 
 
 class AuthService:
@@ -16,15 +17,37 @@ class AuthService:
 
     @staticmethod
     async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[DBUser]:
-        """Authenticate user with email and password."""
+        """Authenticate user with email and password.
+
+        If the stored hash uses an outdated scheme or cost it is replaced on
+        the returned user; the caller's commit persists the upgrade.
+        """
         result = await db.execute(select(DBUser).where(DBUser.email == email))
         user = result.scalars().first()
         if not user:
             return None
-        if not verify_password(password, str(user.hashed_password)):
+        valid, new_hash = await verify_and_update_password_async(password, str(user.hashed_password))
+        if not valid:
             return None
+        if new_hash:
+            user.hashed_password = new_hash  # type: ignore
         return user
 
+    @staticmethod
+    def access_token_for(user: DBUser) -> str:
+        """Create an access token carrying the user's current role, status and token version."""
+        user_status = user.status.value if hasattr(user.status, 'value') else str(user.status)
+        return create_access_token(
+            data={
+                "sub": user.username,
+                "user_id": user.id,
+                "role": user.role.value if hasattr(user.role, 'value') else str(user.role),
+                "email": user.email,
+                "status": str(user_status).lower(),
+                "ver": user.token_version or 0
+            }
+        )
+
     @staticmethod
     async def login_user(db: AsyncSession, login_data: LoginRequest) -> Token:
         """Login user and return access token."""
@@ -65,16 +88,9 @@ class AuthService:
         }
         
         await db.commit()
+        invalidate_principal(user.id)
 
-        # Create access token
-        access_token = create_access_token(
-            data={
-                "sub": user.username,
-                "user_id": user.id,
-                "role": user.role.value if hasattr(user.role, 'value') else str(user.role),
-                "email": user.email
-            }
-        )
+        access_token = AuthService.access_token_for(user)
 
         return Token(
             access_token=access_token,
@@ -118,14 +134,14 @@ class AuthService:
         result = await db.execute(select(DBUser).where(DBUser.id == current_user.id))
         db_user = result.scalars().first()
 
-        if not db_user or not verify_password(password_data.current_password, str(db_user.hashed_password)):
+        if not db_user or not await verify_password_async(password_data.current_password, str(db_user.hashed_password)):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Current password is incorrect"
             )
 
         # Update password
-        db_user.hashed_password = get_password_hash(password_data.new_password)  # type: ignore
+        db_user.hashed_password = await get_password_hash_async(password_data.new_password)  # type: ignore
         db_user.updated_at = datetime.utcnow()  # type: ignore
         await db.commit()
 
@@ -4,6 +4,7 @@ from sqlalchemy import select
 from fastapi import HTTPException, status
 from app.models import Course as DBCourse, Enrollment as DBEnrollment, User as DBUser
 from app.schemas import Course, CourseCreate, CourseUpdate, Enrollment, UserRole
+from app.core.dependencies import invalidate_principal
 
 
 class CourseService:
@@ -121,4 +122,5 @@ class CourseService:
         
         await db.commit()
         await db.refresh(enrollment)
+        invalidate_principal(student_id)
         return enrollment
@@ -1,6 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import func, select
+from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
+from app.core.pagination import fetch_page
 from app.models.product import Product as DBProduct
 from app.models.order import Order as DBOrder
 from app.models.order_item import OrderItem as DBOrderItem
@@ -105,7 +107,7 @@ class OrderService:
                 db.add(db_item)
 
             await db.commit()
-            await db.refresh(db_order)
+            db_order = await OrderService._reload_order(db, db_order)
 
             # Graceful fallback: some DB backends (or driver configs) may not
             # populate server_default timestamps back into SQLAlchemy objects
@@ -136,6 +138,22 @@ class OrderService:
             await db.rollback()
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
+    @staticmethod
+    async def _reload_order(db: AsyncSession, db_order: DBOrder) -> DBOrder:
+        """Re-read an order and its items after a commit.
+
+        Replaces `db.refresh()`, which leaves `items` unloaded; lazy loading
+        is not available in async sessions, and loading items per access
+        would cost a query each time the order is serialized.
+        """
+        result = await db.execute(
+            select(DBOrder)
+            .where(DBOrder.id == db_order.id)
+            .options(selectinload(DBOrder.items))
+            .execution_options(populate_existing=True)
+        )
+        return result.scalars().one()
+
     @staticmethod
     def _ensure_order_timestamps(db_order: DBOrder):
         """Populate missing datetime fields on an order and its items.
@@ -160,7 +178,7 @@ class OrderService:
     @staticmethod
     async def get_order(db: AsyncSession, order_id: int):
         result = await db.execute(
-            select(DBOrder).where(DBOrder.id == int(order_id))
+            select(DBOrder).where(DBOrder.id == int(order_id)).options(selectinload(DBOrder.items))
         )
         order = result.scalars().first()
         if order is not None:
@@ -168,33 +186,36 @@ class OrderService:
         return order
 
     @staticmethod
-    async def list_orders(db: AsyncSession, buyer_id: Optional[int] = None, skip: int = 0, limit: int = 20):
-        query = select(DBOrder)
+    async def list_orders(
+        db: AsyncSession,
+        buyer_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ):
+        """List orders newest first; returns (orders, total, next_cursor).
+
+        ``cursor`` switches from offset to keyset pagination (see
+        app.core.pagination); next_cursor is only set in that mode.
+        """
+        query = select(DBOrder).options(selectinload(DBOrder.items))
         if buyer_id is not None:
             query = query.where(DBOrder.buyer_id == int(buyer_id))
         
-        # Get total count
-        count_query = select(func.count(DBOrder.id))
-        if buyer_id is not None:
-            count_query = count_query.where(DBOrder.buyer_id == int(buyer_id))
-        total_result = await db.execute(count_query)
-        total = total_result.scalar()
-        
-        # Get paginated results
-        result = await db.execute(
-            query.offset(int(skip)).limit(int(limit))
+        # Get paginated results; the total comes back with the page
+        page = await fetch_page(
+            db, query,
+            sort_column=DBOrder.created_at, id_column=DBOrder.id,
+            size=int(limit), offset=int(skip), cursor=cursor,
         )
-        orders = result.scalars().all()
         # Small fallback: ensure datetimes exist for Pydantic validation if DB didn't return them.
-        for o in orders:
+        for o in page.items:
             OrderService._ensure_order_timestamps(o)
-        return orders, total
+        return page.items, page.total, page.next_cursor
 
     @staticmethod
     async def list_orders_by_seller(db: AsyncSession, seller_id: int, skip: int = 0, limit: int = 20):
         """List orders that include items sold by the given seller (join on order_items/products)."""
-        from sqlalchemy.orm import selectinload
-        
         query = (
             select(DBOrder)
             .join(DBOrderItem, DBOrder.id == DBOrderItem.order_id)
@@ -255,7 +276,7 @@ class OrderService:
 
         setattr(cast(Any, db_order), "status", str(new_status))
         await db.commit()
-        await db.refresh(db_order)
+        db_order = await OrderService._reload_order(db, db_order)
         # Ensure created/updated timestamps exist before returning
         OrderService._ensure_order_timestamps(db_order)
         return db_order
@@ -287,7 +308,7 @@ class OrderService:
             setattr(cast(Any, db_order), "status", str(status_str))
 
         await db.commit()
-        await db.refresh(db_order)
+        db_order = await OrderService._reload_order(db, db_order)
         OrderService._ensure_order_timestamps(db_order)
         return db_order
 
@@ -355,7 +376,7 @@ class OrderService:
                     setattr(prod_any, "sold_quantity", max(current_sold - qty, 0))
             setattr(cast(Any, db_order), "status", "refunded")
             await db.commit()
-            await db.refresh(db_order)
+            db_order = await OrderService._reload_order(db, db_order)
             OrderService._ensure_order_timestamps(db_order)
             return db_order
         except Exception as e:
@@ -5,6 +5,8 @@ from sqlalchemy import select
 from fastapi import HTTPException, status
 from app.models import RoleApplication as DBRoleApplication, User as DBUser
 from app.schemas import RoleApplication, RoleApplicationCreate, RoleApplicationUpdate, UserRole
+from app.core.dependencies import invalidate_principal
+from app.core.revocation import role_change_revokes_tokens
 
 
 class RoleService:
@@ -134,8 +136,13 @@ class RoleService:
             )
             user = result.scalars().first()
             if user:
-                user.role = UserRole(application.requested_role)
+                new_role = UserRole(application.requested_role)
+                if role_change_revokes_tokens(user.role, new_role):
+                    user.token_version = (user.token_version or 0) + 1
+                user.role = new_role
         
         await db.commit()
         await db.refresh(application)
+        if review_data.status == "approved" and user:
+            invalidate_principal(application.user_id, token_version=user.token_version)
         return application
@@ -0,0 +1,397 @@
+"""
+Global search over articles, courses, products and users.
+
+Postgres matches ``websearch_to_tsquery`` against the generated
+``search_vector`` columns, ranks with ``ts_rank`` and cuts snippets with
+``ts_headline``. SQLite matches the FTS5 tables, ranks with ``bm25`` and
+cuts snippets with ``snippet``. Snippets are returned as plain text with
+the matched words as ``highlights`` offsets. Only published articles and
+courses and active products are searched. Users are matched by name and
+username through `substring_filter`. Each type is a separate statement; a
+multi-type search runs them concurrently and merges the hits on scores
+relative to each type's best hit.
+
+`substring_filter` builds the case-insensitive substring filters used by
+the admin lists.
+
+See `app.models.search_index` for the index definitions. With
+``settings.search_backend = "memory"`` searches are answered from the
+in-process index in `app.core.inverted_index` instead, once it is built.
+Complete results are cached by `app.core.search_cache`.
+"""
+
+import asyncio
+import heapq
+import logging
+import re
+from itertools import islice
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+from sqlalchemy import (
+    ColumnElement, Float, Select, String, case, column, func, literal, literal_column, or_, select, table,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.inverted_index import inverted_index
+from app.core.search_cache import normalize_query, search_cache
+from app.core.suggestions import SUGGEST_SOURCES, suggestion_index
+from app.models.product import Product as DBProduct
+from app.models.search_index import (
+    FTS5_WEIGHTS, HIGHLIGHT_END, HIGHLIGHT_START, SEARCH_COLUMNS, SEARCH_MODELS, TEXT_SEARCH_CONFIG,
+    fts_table_name,
+)
+from app.models.user import User as DBUser
+from app.schemas.common import UserStatus
+
+logger = logging.getLogger(__name__)
+
+# Result types in tie-break order: the full-text indexed content, then
+# active users matched by name or username
+SEARCH_TYPES = [*SEARCH_MODELS, "user"]
+
+HEADLINE_OPTIONS = (
+    f'MaxWords=35, MinWords=15, MaxFragments=1, StartSel="{HIGHLIGHT_START}", StopSel="{HIGHLIGHT_END}"'
+)
+SNIPPET_TOKENS = 24
+
+WORD = re.compile(r"\w+", re.UNICODE)
+HIGHLIGHT_MARKER = re.compile(f"({re.escape(HIGHLIGHT_START)}|{re.escape(HIGHLIGHT_END)})")
+
+# pg_trgm indexes only help terms with at least one whole trigram
+TRIGRAM_MIN_LENGTH = 3
+
+
+def _title_column(model):
+    return model.name if model is DBProduct else model.title
+
+
+def _visible(content_type: str, model) -> ColumnElement:
+    """Only published articles and courses and active products are public."""
+    return model.status == SUGGEST_SOURCES[content_type][2]
+
+
+def _postgres_hits(content_type: str, model, query: str, limit: int) -> Select:
+    tsquery = func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, query)
+    vector = literal_column(f"{model.__tablename__}.search_vector")
+    body_column = SEARCH_COLUMNS[model.__tablename__][-1][0]
+    # Normalization 32 scales ranks to [0, 1) so types merge on one scale
+    rank = func.ts_rank(vector, tsquery, 32)
+    return (
+        select(
+            literal(content_type, String).label("type"),
+            model.id.label("id"),
+            _title_column(model).label("title"),
+            getattr(model, body_column).label("body"),
+            rank.label("rank"),
+        )
+        .where(vector.op("@@")(tsquery), _visible(content_type, model))
+        .order_by(rank.desc())
+        .limit(limit)
+    )
+
+
+def _postgres_statement(query: str, content_types: Sequence[str], limit: int) -> Select:
+    hits = union_all(*(
+        select(*part.c).select_from(part)
+        for part in (
+            _postgres_hits(content_type, SEARCH_MODELS[content_type], query, limit).subquery()
+            for content_type in content_types
+        )
+    )).subquery("hits")
+    # Headlines are the expensive part; cut them only for the rows returned
+    snippet = func.ts_headline(
+        TEXT_SEARCH_CONFIG, func.coalesce(hits.c.body, ""),
+        func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, query), HEADLINE_OPTIONS,
+    )
+    return (
+        select(hits.c.type, hits.c.id, hits.c.title, snippet.label("snippet"), hits.c.rank)
+        .order_by(hits.c.rank.desc())
+        .limit(limit)
+    )
+
+
+def fts5_match_expression(query: str) -> str:
+    """Quote each word of ``query`` so FTS5 operators in user input are taken literally."""
+    return " ".join('"%s"' % word for word in WORD.findall(query))
+
+
+def _sqlite_hits(content_type: str, model, match: str, limit: int) -> Select:
+    name = model.__tablename__
+    fts = fts_table_name(name)
+    columns = SEARCH_COLUMNS[name]
+    weights = ", ".join(str(FTS5_WEIGHTS[weight]) for _, weight in columns)
+    fts_table = table(fts, column("rowid"))
+    # bm25() is lower-is-better; negate it so both backends rank descending
+    rank = literal_column(f"bm25({fts}, {weights})", Float)
+    snippet = literal_column(
+        f"snippet({fts}, {len(columns) - 1}, char({ord(HIGHLIGHT_START)}), char({ord(HIGHLIGHT_END)}), "
+        f"'...', {SNIPPET_TOKENS})",
+        String,
+    )
+    return (
+        select(
+            literal(content_type, String).label("type"),
+            model.id.label("id"),
+            _title_column(model).label("title"),
+            snippet.label("snippet"),
+            (-rank).label("rank"),
+        )
+        .select_from(fts_table.join(model.__table__, model.id == fts_table.c.rowid))
+        .where(literal_column(fts).op("MATCH")(match), _visible(content_type, model))
+        .order_by(rank)
+        .limit(limit)
+    )
+
+
+def _sqlite_statement(query: str, content_types: Sequence[str], limit: int) -> Select:
+    match = fts5_match_expression(query)
+    hits = union_all(*(
+        select(*part.c).select_from(part)
+        for part in (
+            _sqlite_hits(content_type, SEARCH_MODELS[content_type], match, limit).subquery()
+            for content_type in content_types
+        )
+    )).subquery("hits")
+    return select(*hits.c).order_by(hits.c.rank.desc()).limit(limit)
+
+
+def substring_filter(db: AsyncSession, columns: Sequence, term: str) -> ColumnElement:
+    """Match ``term`` anywhere in any of ``columns``, ignoring case.
+
+    On Postgres the columns carry ``pg_trgm`` GIN indexes (see
+    `app.models.search_index.TRIGRAM_COLUMNS`), which serve the leading
+    wildcard ILIKE, and the word-similarity operator ``<%`` adds
+    typo-tolerant matches ("jonh" finds "John") from the same indexes.
+    """
+    pattern = f"%{term}%"
+    clauses = [field.ilike(pattern) for field in columns]
+    if db.get_bind().dialect.name == "postgresql" and len(term) >= TRIGRAM_MIN_LENGTH:
+        clauses += [literal(term, String).op("<%", is_comparison=True)(field) for field in columns]
+    return or_(*clauses)
+
+
+def _user_statement(db: AsyncSession, query: str, limit: int) -> Select:
+    columns = [DBUser.username, DBUser.full_name]
+    if db.get_bind().dialect.name == "postgresql":
+        # Word similarity also scores the typo-tolerant trigram matches
+        score = func.greatest(*(func.word_similarity(query, field) for field in columns))
+    else:
+        # Share of the best matching name covered by the query
+        score = func.max(*(
+            case(
+                (func.lower(field).contains(query.lower(), autoescape=True), float(len(query)) / func.length(field)),
+                else_=0.0,
+            )
+            for field in columns
+        ))
+    return (
+        select(DBUser.id, DBUser.full_name, DBUser.username, DBUser.role, score.label("rank"))
+        .where(DBUser.status == UserStatus.ACTIVE, substring_filter(db, columns, query))
+        .order_by(score.desc(), DBUser.id)
+        .limit(limit)
+    )
+
+
+async def _search_type(db: AsyncSession, content_type: str, query: str, limit: int) -> List[Dict]:
+    """Best ``limit`` hits of one type, best first."""
+    if content_type == "user":
+        result = await db.execute(_user_statement(db, query, limit))
+        return [
+            {
+                "type": "user",
+                "id": row.id,
+                "title": row.full_name,
+                "snippet": f"@{row.username} \u00b7 {row.role.value}",
+                "score": round(float(row.rank or 0), 6),
+            }
+            for row in result.all()
+        ]
+
+    if _memory_index_ready():
+        return inverted_index.search(query, [content_type], limit)
+
+    if db.get_bind().dialect.name == "postgresql":
+        stmt = _postgres_statement(query, [content_type], limit)
+    else:
+        if not WORD.search(query):
+            return []
+        stmt = _sqlite_statement(query, [content_type], limit)
+
+    result = await db.execute(stmt)
+    return [
+        {
+            "type": row.type,
+            "id": row.id,
+            "title": row.title,
+            "snippet": row.snippet or "",
+            "score": round(float(row.rank), 6),
+        }
+        for row in result.all()
+    ]
+
+
+async def _search_type_in_own_session(bind, content_type: str, query: str, limit: int) -> List[Dict]:
+    async with AsyncSession(bind=bind) as session:
+        return await _search_type(session, content_type, query, limit)
+
+
+def _memory_index_ready() -> bool:
+    return settings.search_backend == "memory" and inverted_index.ready
+
+
+def _suggest_statement(prefix: str, content_types: Sequence[str], limit: int) -> Select:
+    """Title-prefix matches by popularity, for when the suggestion index is not built yet."""
+    parts = []
+    for content_type in content_types:
+        model = SEARCH_MODELS[content_type]
+        title, popularity, visible = SUGGEST_SOURCES[content_type]
+        title_column = getattr(model, title)
+        popularity_column = func.coalesce(getattr(model, popularity), 0)
+        parts.append(
+            select(
+                literal(content_type, String).label("type"),
+                model.id.label("id"),
+                title_column.label("title"),
+                model.slug.label("slug"),
+                popularity_column.label("popularity"),
+            )
+            .where(model.status == visible, title_column.istartswith(prefix, autoescape=True))
+            .order_by(popularity_column.desc())
+            .limit(limit)
+            .subquery()
+        )
+    hits = union_all(*(select(*part.c).select_from(part) for part in parts)).subquery("hits")
+    return select(hits.c.type, hits.c.id, hits.c.title, hits.c.slug).order_by(hits.c.popularity.desc()).limit(limit)
+
+
+class SearchResults(NamedTuple):
+    """Merged hits plus the types left out because they failed or timed out."""
+
+    hits: List[Dict]
+    incomplete: List[str]
+
+
+def split_highlights(marked: str) -> Tuple[str, List[List[int]]]:
+    """Strip highlight markers from a snippet.
+
+    Returns the plain text and the ``[start, end)`` character offsets of
+    the highlighted words in it.
+    """
+    text, highlights = [], []
+    length, start = 0, None
+    for part in HIGHLIGHT_MARKER.split(marked):
+        if part == HIGHLIGHT_START:
+            start = length
+        elif part == HIGHLIGHT_END:
+            if start is not None and length > start:
+                highlights.append([start, length])
+            start = None
+        else:
+            text.append(part)
+            length += len(part)
+    return "".join(text), highlights
+
+
+def _with_highlights(hit: Dict) -> Dict:
+    snippet, highlights = split_highlights(hit["snippet"])
+    return {**hit, "snippet": snippet, "highlights": highlights}
+
+
+def _relative_scores(hits: List[Dict]) -> List[Dict]:
+    """Rescale one type's scores so its best hit scores 1.
+
+    Types score on unrelated scales (ts_rank, bm25, name coverage), so
+    they are merged on scores relative to each type's best hit.
+    """
+    best = hits[0]["score"] if hits else 0
+    if best <= 0:
+        return [{**hit, "score": 0.0} for hit in hits]
+    return [{**hit, "score": round(hit["score"] / best, 6)} for hit in hits]
+
+
+async def _search(bind, query: str, content_types: Sequence[str], limit: int) -> SearchResults:
+    """Search ``content_types`` on sessions of ``bind``; see `SearchService.search`."""
+    in_memory = [t for t in content_types if t != "user" and _memory_index_ready()]
+    in_database = [t for t in content_types if t not in in_memory]
+
+    results = {t: inverted_index.search(query, [t], limit) for t in in_memory}
+    incomplete = []
+    if in_database:
+        tasks = {
+            asyncio.create_task(_search_type_in_own_session(bind, t, query, limit)): t
+            for t in in_database
+        }
+        done, pending = await asyncio.wait(tasks, timeout=settings.search_type_timeout_seconds)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+        for task, content_type in tasks.items():
+            if task in done and task.exception() is None:
+                results[content_type] = task.result()
+                continue
+            if task in done:
+                logger.error("Search of %ss failed", content_type, exc_info=task.exception())
+            else:
+                logger.warning(
+                    "Search of %ss timed out after %ss", content_type, settings.search_type_timeout_seconds
+                )
+            incomplete.append(content_type)
+
+    # Each list is sorted best first; ties keep SEARCH_TYPES order
+    merged = heapq.merge(
+        *(_relative_scores(results[t]) for t in content_types if t in results),
+        key=lambda hit: hit["score"], reverse=True,
+    )
+    return SearchResults([_with_highlights(hit) for hit in islice(merged, limit)], incomplete)
+
+
+class SearchService:
+    @staticmethod
+    async def search(
+        db: AsyncSession, query: str, content_types: Sequence[str], limit: int
+    ) -> SearchResults:
+        """Return up to ``limit`` hits across ``content_types``, best first.
+
+        Each hit is a dict with type, id, title, snippet (plain text),
+        highlights (``[start, end)`` offsets of the matched words in the
+        snippet) and score. Types that need the database are searched
+        concurrently, each on its own pooled session; a type that takes
+        longer than ``settings.search_type_timeout_seconds`` or fails is
+        left out and listed in ``incomplete``. Scores are relative to the
+        best hit of the same type, and hits are merged by them.
+
+        Complete results are cached until searchable content changes, and
+        identical searches arriving while one is running share its result
+        (see `app.core.search_cache`).
+        """
+        query = normalize_query(query)
+        content_types = tuple(content_type for content_type in SEARCH_TYPES if content_type in content_types)
+        return await search_cache.get_or_search(
+            (query, content_types, limit),
+            lambda: _search(db.bind, query, content_types, limit),
+            cacheable=lambda results: not results.incomplete,
+        )
+
+    @staticmethod
+    async def suggest(
+        db: AsyncSession, prefix: str, content_types: Sequence[str], limit: int
+    ) -> List[Dict]:
+        """Return up to ``limit`` published titles starting with ``prefix``, most popular first.
+
+        Served from `app.core.suggestions.suggestion_index`; until its first
+        sync completes, falls back to a title-prefix query.
+        """
+        content_types = [content_type for content_type in SEARCH_MODELS if content_type in content_types]
+        if not content_types or not prefix.strip():
+            return []
+        if suggestion_index.ready:
+            return suggestion_index.suggest(prefix, content_types, limit)
+
+        result = await db.execute(_suggest_statement(prefix.strip(), content_types, limit))
+        return [
+            {"type": row.type, "id": row.id, "title": row.title, "slug": row.slug}
+            for row in result.all()
+        ]
@@ -4,7 +4,9 @@ from sqlalchemy import select
 from fastapi import HTTPException, status
 from app.models import User as DBUser
 from app.schemas import User, UserCreate, UserUpdate, UserRole
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_async
+from app.core.dependencies import invalidate_principal
+from app.core.revocation import role_change_revokes_tokens
 
 
 class UserService:
@@ -56,7 +58,7 @@ class UserService:
                 )
 
         # Create new user
-        hashed_password = get_password_hash(user_create.password)
+        hashed_password = await get_password_hash_async(user_create.password)
         db_user = DBUser(
             email=user_create.email,
             username=user_create.username,
@@ -106,6 +108,7 @@ class UserService:
         
         await db.commit()
         await db.refresh(db_user)
+        invalidate_principal(user_id)
         return db_user
     
     @staticmethod
@@ -118,7 +121,10 @@ class UserService:
                 detail="User not found"
             )
         
+        if role_change_revokes_tokens(db_user.role, new_role):
+            db_user.token_version = (db_user.token_version or 0) + 1
         db_user.role = new_role
         await db.commit()
         await db.refresh(db_user)
+        invalidate_principal(user_id, token_version=db_user.token_version)
         return db_user
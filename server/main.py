@@ -1,9 +1,17 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.core.database import create_tables_async
-from app.core.logging import setup_logging
+from app.core.database import create_tables_async, engine, read_engine
+from app.core.logging import setup_logging, shutdown_logging
+from app.core.security import hashing_pool, token_cache
+from app.core.revocation import run_revocation_sync
+from app.core.inverted_index import inverted_index, run_search_index_sync
+from app.core.search_cache import search_cache
+from app.core.suggestions import run_suggestion_sync, suggestion_index
+from app.core.activity import activity_recorder
+from app.core.rate_limit import build_rate_limiter
 from app.core.middleware import (
     RequestLoggingMiddleware,
     SecurityHeadersMiddleware,
@@ -20,9 +28,42 @@ from app.routers import (
 async def lifespan(app: FastAPI):
     """Handle application startup and shutdown events."""
     setup_logging()
+    app.state.rate_limiter = build_rate_limiter()
     if settings.debug:
         await create_tables_async()
+    revocation_sync = asyncio.create_task(
+        run_revocation_sync(settings.revocation_sync_interval_seconds)
+    )
+    activity_flusher = asyncio.create_task(
+        activity_recorder.run(settings.activity_flush_interval_seconds)
+    )
+    suggestion_sync = asyncio.create_task(
+        run_suggestion_sync(settings.search_index_sync_interval_seconds)
+    )
+    search_index_sync = None
+    if settings.search_backend == "memory":
+        search_index_sync = asyncio.create_task(
+            run_search_index_sync(settings.search_index_sync_interval_seconds)
+        )
     yield
+    revocation_sync.cancel()
+    activity_flusher.cancel()
+    suggestion_sync.cancel()
+    if search_index_sync is not None:
+        search_index_sync.cancel()
+        await asyncio.gather(search_index_sync, return_exceptions=True)
+        # Let the next start map the index instead of rebuilding it
+        if settings.search_index_snapshot_path and inverted_index.dirty:
+            inverted_index.save_snapshot(settings.search_index_snapshot_path)
+    # Write whatever is still buffered before the process exits
+    await asyncio.gather(activity_flusher, return_exceptions=True)
+    await activity_recorder.flush()
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
+    app.state.rate_limiter.close()
+    hashing_pool.shutdown()
+    shutdown_logging()
 
 # Create FastAPI application
 app = FastAPI(
@@ -41,12 +82,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Search-Incomplete"],
 )
 
 # Add custom middleware AFTER CORS
 app.add_middleware(RequestLoggingMiddleware)
 app.add_middleware(SecurityHeadersMiddleware)
-app.add_middleware(RateLimitMiddleware, requests_per_minute=60)
+app.add_middleware(RateLimitMiddleware)
 
 # Register exception handlers
 for exception_class, handler_func in EXCEPTION_HANDLERS:
@@ -80,4 +122,14 @@ async def read_root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "service": "KFATS LMS API"}
+    return {
+        "status": "healthy",
+        "service": "KFATS LMS API",
+        "password_hashing": hashing_pool.stats(),
+        "token_cache": token_cache.stats(),
+        "activity": activity_recorder.stats(),
+        "rate_limit": app.state.rate_limiter.stats(),
+        "search_index": inverted_index.stats(),
+        "search_cache": search_cache.stats(),
+        "search_suggestions": suggestion_index.stats()
+    }
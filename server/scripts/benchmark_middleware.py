@@ -0,0 +1,101 @@
+"""
+Middleware overhead benchmark for KFATS LMS.
+
+Drives a `/health` endpoint through the middleware stack from main.py
+(request logging, security headers, rate limiting) by calling the ASGI app
+directly, and compares it with the same endpoint without middleware. The
+difference is the per-request cost of the middleware alone.
+
+Usage:
+    PYTHONPATH=. python scripts/benchmark_middleware.py --requests 5000
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from fastapi import FastAPI
+
+from app.core.middleware import (
+    RequestLoggingMiddleware,
+    SecurityHeadersMiddleware,
+    RateLimitMiddleware
+)
+from app.core.rate_limit import MemoryRateLimitBackend, RateLimiter
+
+
+def build_app(with_middleware: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health_check():
+        return {"status": "healthy", "service": "KFATS LMS API"}
+
+    if with_middleware:
+        app.add_middleware(RequestLoggingMiddleware)
+        app.add_middleware(SecurityHeadersMiddleware)
+        limiter = RateLimiter(10 ** 9, MemoryRateLimitBackend(max_keys=10000))
+        app.add_middleware(RateLimitMiddleware, limiter=limiter)
+    return app
+
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/health",
+    "raw_path": b"/health",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [(b"host", b"testserver"), (b"user-agent", b"benchmark")],
+    "client": ("127.0.0.1", 50000),
+    "server": ("testserver", 80),
+}
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def run(app: FastAPI, requests: int, rounds: int) -> float:
+    """Return the median per-request latency in microseconds."""
+    for _ in range(200):
+        await app(dict(SCOPE), receive, send)
+
+    per_request = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(requests):
+            await app(dict(SCOPE), receive, send)
+        per_request.append((time.perf_counter() - start) / requests * 1_000_000)
+    return statistics.median(per_request)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Measure middleware overhead on /health")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    # Measure middleware work, not log handler I/O
+    logging.disable(logging.CRITICAL)
+
+    bare = await run(build_app(False), args.requests, args.rounds)
+    stacked = await run(build_app(True), args.requests, args.rounds)
+
+    print(f"📊 /health over {args.requests} requests x {args.rounds} rounds (median)")
+    print(f"   without middleware: {bare:8.1f} µs/request")
+    print(f"   with middleware:    {stacked:8.1f} µs/request")
+    print(f"   overhead:           {stacked - bare:8.1f} µs/request")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,174 @@
+"""
+List projection benchmark for KFATS LMS.
+
+Seeds a scratch SQLite database with articles, courses and products that
+carry realistically long text, then requests one page of each public list
+with ``view=full`` and ``view=summary`` (and the admin content overview)
+through the ASGI app. For every page it reports:
+
+- DB bytes: size of the column values the page's rows carry from the
+  database (all mapped columns vs the summary projection);
+- response bytes: size of the JSON body;
+- peak allocation while serving the request (tracemalloc);
+- mean latency without tracing.
+
+Usage (from server/):
+    PYTHONPATH=. python scripts/benchmark_projections.py
+    PYTHONPATH=. python scripts/benchmark_projections.py --rows 5000 --size 50
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+# Configure the app before anything imports app.core.config
+_tmpdir = tempfile.TemporaryDirectory()
+DB_PATH = os.path.join(_tmpdir.name, "projections.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+os.environ["DEBUG"] = "false"
+os.environ["RATE_LIMIT_BACKEND"] = "memory"
+os.environ["RATE_LIMIT_REQUESTS_PER_MINUTE"] = "1000000"
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine, func, insert, inspect, select  # noqa: E402
+
+import app.models  # noqa: E402,F401  (registers every table on Base.metadata)
+from app.core.security import create_access_token  # noqa: E402
+from app.models.article import Article  # noqa: E402
+from app.models.base import Base  # noqa: E402
+from app.models.course import Course  # noqa: E402
+from app.models.product import Product  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.schemas.article import ArticleSummary  # noqa: E402
+from app.schemas.common import (  # noqa: E402
+    ArticleStatus, CourseLevel, CourseStatus, ProductCategory, ProductStatus, UserRole, UserStatus,
+)
+from app.schemas.course import CourseSummary  # noqa: E402
+from app.schemas.product import ProductSummary  # noqa: E402
+
+WORDS = "colour light shadow canvas brush pigment texture gesture perspective anatomy composition".split()
+
+# label -> (path, model, summary schema)
+LISTS = {
+    "articles": ("/api/v1/articles/", Article, ArticleSummary),
+    "courses": ("/api/v1/courses/", Course, CourseSummary),
+    "products": ("/api/v1/products/", Product, ProductSummary),
+}
+
+
+def text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(WORDS, k=words))
+
+
+def seed(engine, rows: int) -> None:
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{
+            "id": 1, "email": "admin@kfats.edu", "username": "admin", "full_name": "Admin",
+            "hashed_password": "x", "role": UserRole.ADMIN, "status": UserStatus.ACTIVE,
+        }])
+        conn.execute(insert(Article), [
+            {
+                "id": i, "title": text(rng, 6), "slug": f"article-{i}", "excerpt": text(rng, 30),
+                "content": text(rng, 2500), "tags": ["art", "tutorial"],
+                "status": ArticleStatus.PUBLISHED, "author_id": 1,
+            }
+            for i in range(1, rows + 1)
+        ])
+        conn.execute(insert(Course), [
+            {
+                "id": i, "title": text(rng, 5), "slug": f"course-{i}", "short_description": text(rng, 25),
+                "description": text(rng, 800), "level": CourseLevel.BEGINNER, "price": 10.0,
+                "status": CourseStatus.PUBLISHED, "mentor_id": 1,
+            }
+            for i in range(1, rows + 1)
+        ])
+        conn.execute(insert(Product), [
+            {
+                "id": i, "name": text(rng, 4), "slug": f"product-{i}", "description": text(rng, 300),
+                "price": 25.0, "category": ProductCategory.PAINTING, "stock_quantity": 5,
+                "status": ProductStatus.ACTIVE, "seller_id": 1,
+            }
+            for i in range(1, rows + 1)
+        ])
+
+
+def db_bytes(engine, model, columns, size: int) -> int:
+    """Bytes of column values in one newest-first page of ``columns``."""
+    stmt = select(*columns).order_by(model.created_at.desc(), model.id.desc()).limit(size)
+    with engine.connect() as conn:
+        return sum(len(str(value).encode()) for row in conn.execute(stmt) for value in row if value is not None)
+
+
+def summary_columns(model, schema):
+    names = inspect(model).column_attrs.keys()
+    columns = [getattr(model, name) for name in schema.model_fields if name in names]
+    if model is Article:
+        columns.append(func.length(Article.content))
+    return columns
+
+
+async def measure(client, path, params, headers, repeat: int):
+    tracemalloc.start()
+    response = await client.get(path, params=params, headers=headers)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    response.raise_for_status()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await client.get(path, params=params, headers=headers)
+        timings.append((time.perf_counter() - start) * 1000)
+    return len(response.content), peak, statistics.mean(timings)
+
+
+async def run(rows: int, size: int, repeat: int) -> None:
+    engine = create_engine(f"sqlite:///{DB_PATH}")
+    Base.metadata.create_all(engine)
+    print(f"🌱 Seeding {rows} rows per content table")
+    seed(engine, rows)
+
+    import main
+
+    admin = {"Authorization": "Bearer " + create_access_token(data={
+        "sub": "admin", "user_id": 1, "role": UserRole.ADMIN.value, "email": "admin@kfats.edu",
+        "status": UserStatus.ACTIVE.value, "ver": 0,
+    })}
+
+    print(f"\n{'page of ' + str(size):<28}{'DB KB':>10}{'response KB':>14}{'peak alloc KB':>16}{'mean ms':>10}")
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        for label, (path, model, schema) in LISTS.items():
+            for view in ("full", "summary"):
+                columns = list(model.__table__.c) if view == "full" else summary_columns(model, schema)
+                stored = db_bytes(engine, model, columns, size)
+                body, peak, mean = await measure(client, path, {"size": size, "view": view}, None, repeat)
+                print(f"{label + ' ' + view:<28}{stored / 1024:>10.1f}{body / 1024:>14.1f}{peak / 1024:>16.1f}{mean:>10.2f}")
+
+        body, peak, mean = await measure(
+            client, "/api/v1/content-management/all-content", {"size": size}, admin, repeat
+        )
+        print(f"{'admin all-content':<28}{'':>10}{body / 1024:>14.1f}{peak / 1024:>16.1f}{mean:>10.2f}")
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare full and summary list pages")
+    parser.add_argument("--rows", type=int, default=2000, help="rows per content table")
+    parser.add_argument("--size", type=int, default=20, help="page size")
+    parser.add_argument("--repeat", type=int, default=20, help="timed requests per page")
+    args = parser.parse_args()
+    try:
+        asyncio.run(run(args.rows, args.size, args.repeat))
+    finally:
+        _tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
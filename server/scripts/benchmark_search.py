@@ -0,0 +1,158 @@
+"""
+Global search benchmark for KFATS LMS.
+
+Seeds a scratch SQLite database with synthetic articles, courses and
+products, then times the same queries against:
+
+- the original ``ILIKE '%term%'`` scans over every text column;
+- the FTS5 tables used by the database search backend;
+- the in-process inverted index (``search_backend = "memory"``), including
+  its build time and snapshot save/load.
+
+Usage (from server/):
+    PYTHONPATH=. python scripts/benchmark_search.py
+    PYTHONPATH=. python scripts/benchmark_search.py --rows 50000 --repeat 50
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert, or_, select
+
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.core.inverted_index import InvertedIndex
+from app.models.base import Base
+from app.models.search_index import SEARCH_COLUMNS, SEARCH_MODELS
+from app.models.user import User
+from app.schemas.common import (
+    ArticleStatus, CourseLevel, CourseStatus, ProductCategory, ProductStatus, UserRole, UserStatus,
+)
+from app.services.search_service import _sqlite_statement
+
+VOCABULARY = (
+    "oil acrylic watercolour canvas portrait landscape sketch charcoal pastel bronze marble clay "
+    "sculpture ceramic glaze kiln print etching linocut colour theory perspective anatomy light "
+    "shadow composition gesture still life abstract figure study palette knife brush pigment "
+    "texture gallery exhibition beginner advanced workshop technique history modern classical "
+    "restoration frame paper ink calligraphy design digital photography mural fresco mosaic"
+).split()
+
+# Word frequencies follow Zipf's law: the art words above are the common
+# head, generated words the long tail
+TAIL_WORDS = [f"term{i}" for i in range(20000)]
+WORD_WEIGHTS = [1 / rank for rank in range(1, len(VOCABULARY) + len(TAIL_WORDS) + 1)]
+
+QUERIES = ["oil", "oil portrait", "bronze sculpture", "mosaic", "term250", "kiln term40"]
+CONTENT_TYPES = list(SEARCH_MODELS)
+LIMIT = 20
+
+
+def words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choices(VOCABULARY + TAIL_WORDS, weights=WORD_WEIGHTS, k=count))
+
+
+def seed(engine, rows: int) -> None:
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{
+            "id": 1, "email": "author@kfats.edu", "username": "author", "full_name": "Author",
+            "hashed_password": "x", "role": UserRole.ADMIN, "status": UserStatus.ACTIVE,
+        }])
+        conn.execute(insert(SEARCH_MODELS["article"]), [
+            {
+                "id": i, "title": words(rng, 5), "slug": f"article-{i}", "excerpt": words(rng, 20),
+                "content": words(rng, 300), "status": ArticleStatus.PUBLISHED, "author_id": 1,
+            }
+            for i in range(1, rows + 1)
+        ])
+        conn.execute(insert(SEARCH_MODELS["course"]), [
+            {
+                "id": i, "title": words(rng, 4), "short_description": words(rng, 15),
+                "description": words(rng, 120), "level": CourseLevel.BEGINNER, "price": 10.0,
+                "status": CourseStatus.PUBLISHED, "mentor_id": 1,
+            }
+            for i in range(1, rows + 1)
+        ])
+        conn.execute(insert(SEARCH_MODELS["product"]), [
+            {
+                "id": i, "name": words(rng, 3), "description": words(rng, 40), "price": 25.0,
+                "category": ProductCategory.PAINTING, "status": ProductStatus.ACTIVE, "seller_id": 1,
+            }
+            for i in range(1, rows + 1)
+        ])
+
+
+def ilike_statements(query: str):
+    """The per-type statements /search issued before full-text indexes."""
+    pattern = f"%{query}%"
+    for content_type, model in SEARCH_MODELS.items():
+        columns = [getattr(model, column) for column, _ in SEARCH_COLUMNS[model.__tablename__]]
+        yield select(model).where(or_(*(column.ilike(pattern) for column in columns))).limit(LIMIT)
+
+
+def timed(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.mean(timings)
+
+
+def build_index(engine) -> InvertedIndex:
+    index = InvertedIndex()
+    with engine.connect() as conn:
+        for content_type, model in SEARCH_MODELS.items():
+            columns = [getattr(model, column) for column, _ in SEARCH_COLUMNS[model.__tablename__]]
+            result = conn.execution_options(yield_per=1000).execute(select(model.id, model.updated_at, *columns))
+            for doc_id, updated_at, *fields in result:
+                index.add(content_type, doc_id, fields, updated_at)
+    index.ready = True
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare ILIKE, FTS5 and in-memory index search")
+    parser.add_argument("--rows", type=int, default=10000, help="rows per content table")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per query")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmpdir, 'search.db')}")
+        Base.metadata.create_all(engine)
+        print(f"🌱 Seeding {args.rows} rows per content table")
+        seed(engine, args.rows)
+
+        start = time.perf_counter()
+        index = build_index(engine)
+        print(f"\n📚 Memory index: built in {time.perf_counter() - start:.2f}s, {index.stats()}")
+
+        snapshot = os.path.join(tmpdir, "search_index.snapshot")
+        start = time.perf_counter()
+        index.save_snapshot(snapshot)
+        saved = time.perf_counter() - start
+        loaded = InvertedIndex()
+        start = time.perf_counter()
+        loaded.load_snapshot(snapshot)
+        print(
+            f"💾 Snapshot: {os.path.getsize(snapshot) / 1e6:.1f} MB, saved in {saved:.2f}s, "
+            f"loaded in {time.perf_counter() - start:.2f}s"
+        )
+
+        print(f"\n{'query':<24}{'ILIKE ms':>12}{'FTS5 ms':>12}{'memory ms':>12}{'mapped ms':>12}")
+        with engine.connect() as conn:
+            for query in QUERIES:
+                ilike = timed(lambda: [conn.execute(stmt).all() for stmt in ilike_statements(query)], args.repeat)
+                fts = timed(lambda: conn.execute(_sqlite_statement(query, CONTENT_TYPES, LIMIT)).all(), args.repeat)
+                memory = timed(lambda: index.search(query, CONTENT_TYPES, LIMIT), args.repeat)
+                mapped = timed(lambda: loaded.search(query, CONTENT_TYPES, LIMIT), args.repeat)
+                print(f"{query:<24}{ilike:>12.2f}{fts:>12.2f}{memory:>12.2f}{mapped:>12.2f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Password hash cost calibration for KFATS LMS.
+
+Measures hashes/sec per core for a range of bcrypt rounds or argon2 time
+costs on this machine and recommends the strongest cost that keeps login
+p99 under a target, given the hashing pool size from settings.
+
+Usage:
+    PYTHONPATH=. python scripts/calibrate_password_hash.py --target-ms 250
+    PYTHONPATH=. python scripts/calibrate_password_hash.py --scheme argon2 --memory-cost 65536
+"""
+
+import argparse
+import math
+import statistics
+import time
+
+from app.core.config import settings
+from app.core.security import build_pwd_context
+
+
+def measure(context, samples: int):
+    """Return sorted per-hash latencies (seconds) for `samples` hashes."""
+    context.hash("warm-up password")
+    timings = []
+    for i in range(samples):
+        start = time.perf_counter()
+        context.hash(f"calibration password {i}")
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)
+
+
+def percentile(sorted_values, pct: float) -> float:
+    index = min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[max(index, 0)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate password hash cost")
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2"], default=settings.password_hash_scheme)
+    parser.add_argument("--target-ms", type=float, default=250.0, help="login p99 budget for hashing")
+    parser.add_argument("--samples", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=settings.password_hash_workers)
+    parser.add_argument(
+        "--concurrency", type=int, default=None,
+        help="expected concurrent logins per process (defaults to --workers)"
+    )
+    parser.add_argument("--memory-cost", type=int, default=settings.password_argon2_memory_cost)
+    parser.add_argument("--parallelism", type=int, default=settings.password_argon2_parallelism)
+    args = parser.parse_args()
+
+    concurrency = args.concurrency or args.workers
+    # Logins beyond the pool size queue behind in-flight hashes
+    queue_factor = math.ceil(concurrency / args.workers)
+
+    if args.scheme == "bcrypt":
+        costs = range(10, 16)
+        label = "rounds"
+    else:
+        costs = range(1, 7)
+        label = "time_cost"
+
+    print(f"🔐 Calibrating {args.scheme} (workers={args.workers}, concurrency={concurrency}, "
+          f"target p99={args.target_ms:.0f}ms)")
+    print(f"{label:>10} {'p50 ms':>9} {'p99 ms':>9} {'load p99':>9} {'hash/s/core':>12} {'pool hash/s':>12}")
+
+    recommended = None
+    for cost in costs:
+        context = build_pwd_context(
+            scheme=args.scheme,
+            bcrypt_rounds=cost if args.scheme == "bcrypt" else settings.password_bcrypt_rounds,
+            argon2_memory_cost=args.memory_cost,
+            argon2_time_cost=cost if args.scheme == "argon2" else settings.password_argon2_time_cost,
+            argon2_parallelism=args.parallelism,
+        )
+        timings = measure(context, args.samples)
+        p50 = statistics.median(timings) * 1000
+        p99 = percentile(timings, 99) * 1000
+        load_p99 = p99 * queue_factor
+        per_core = 1 / statistics.mean(timings)
+        print(f"{cost:>10} {p50:>9.1f} {p99:>9.1f} {load_p99:>9.1f} {per_core:>12.1f} "
+              f"{per_core * args.workers:>12.1f}")
+
+        if load_p99 <= args.target_ms:
+            recommended = cost
+        else:
+            # Cost grows monotonically; stronger settings only get slower
+            break
+
+    if recommended is None:
+        print("❌ No cost meets the target; raise --target-ms or PASSWORD_HASH_WORKERS")
+        return
+
+    env_name = "PASSWORD_BCRYPT_ROUNDS" if args.scheme == "bcrypt" else "PASSWORD_ARGON2_TIME_COST"
+    print(f"✅ Recommended: PASSWORD_HASH_SCHEME={args.scheme} {env_name}={recommended}")
+
+
+if __name__ == "__main__":
+    main()
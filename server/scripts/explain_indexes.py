@@ -0,0 +1,241 @@
+"""
+Query-plan check for the KFATS LMS hot list and analytics queries.
+
+Seeds a scratch database with a synthetic catalog (users, products,
+courses, articles, orders, role applications), then prints the plan and
+mean run time of each query twice: once with the indexes as they were
+before revision 50a51b3a277f (single-column foreign key indexes only) and
+once with the schema from the models. The queries mirror the statements
+issued by the routers.
+
+SQLite uses ``EXPLAIN QUERY PLAN``; pass a Postgres URL to get ``EXPLAIN
+ANALYZE`` output instead (the database must be empty and disposable).
+
+Usage (from server/):
+    PYTHONPATH=. python scripts/explain_indexes.py
+    PYTHONPATH=. python scripts/explain_indexes.py --rows 100000 --url postgresql://localhost/kfats_explain
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, func, insert, select, text
+
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.models.article import Article
+from app.models.base import Base
+from app.models.course import Course
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.product import Product
+from app.models.user import RoleApplication, User
+from app.schemas.common import (
+    ArticleStatus, CourseLevel, CourseStatus, ProductCategory, ProductStatus, UserRole, UserStatus,
+)
+
+# Indexes added by 50a51b3a277f -> the single-column index each one replaced
+NEW_INDEXES = {
+    "ix_order_items_product_id_order_id": ("order_items", "product_id"),
+    "ix_products_status_category_created_at_id": None,
+    "ix_products_seller_id_status_created_at_id": ("products", "seller_id"),
+    "ix_courses_mentor_id_created_at_id": ("courses", "mentor_id"),
+    "ix_articles_author_id_status_created_at_id": ("articles", "author_id"),
+    "ix_role_applications_status_applied_at_id": ("role_applications", "status"),
+}
+
+SELLER_ID = 2
+MENTOR_ID = 3
+AUTHOR_ID = 4
+
+
+def build_queries():
+    """Statements shaped like the ones the routers issue."""
+    return {
+        "seller revenue (seller_analytics /revenue)": (
+            select(func.coalesce(func.sum(OrderItem.unit_price * OrderItem.quantity), 0))
+            .join(Product, OrderItem.product_id == Product.id)
+            .where(Product.seller_id == SELLER_ID)
+        ),
+        "seller distinct orders (seller_analytics /orders)": (
+            select(func.count(func.distinct(OrderItem.order_id)))
+            .join(Product, OrderItem.product_id == Product.id)
+            .where(Product.seller_id == SELLER_ID)
+        ),
+        "products by category (GET /products?category=)": (
+            select(Product)
+            .where(Product.status == ProductStatus.ACTIVE, Product.category == ProductCategory.SCULPTURE)
+            .order_by(Product.created_at.desc(), Product.id.desc())
+            .limit(20)
+        ),
+        "products by seller (GET /products?seller_id=)": (
+            select(Product)
+            .where(Product.status == ProductStatus.ACTIVE, Product.seller_id == SELLER_ID)
+            .order_by(Product.created_at.desc(), Product.id.desc())
+            .limit(20)
+        ),
+        "mentor courses (mentors dashboard)": (
+            select(Course)
+            .where(Course.mentor_id == MENTOR_ID)
+            .order_by(Course.created_at.desc())
+            .limit(20)
+        ),
+        "articles by author (GET /articles?author_id=)": (
+            select(Article)
+            .where(Article.status == ArticleStatus.PUBLISHED, Article.author_id == AUTHOR_ID)
+            .order_by(Article.created_at.desc(), Article.id.desc())
+            .limit(20)
+        ),
+        "pending applications (GET /role-applications?status=pending)": (
+            select(RoleApplication)
+            .where(RoleApplication.status == "pending")
+            .order_by(RoleApplication.applied_at.desc(), RoleApplication.id.desc())
+            .limit(20)
+        ),
+    }
+
+
+def seed(engine, rows: int) -> None:
+    rng = random.Random(42)
+    now = datetime.utcnow()
+
+    def created(i):
+        return now - timedelta(minutes=i)
+
+    users = [
+        {
+            "id": i, "email": f"user{i}@kfats.edu", "username": f"user{i}", "full_name": f"User {i}",
+            "hashed_password": "x", "role": UserRole.USER, "status": UserStatus.ACTIVE,
+        }
+        for i in range(1, rows // 10 + 1)
+    ]
+    n_users = len(users)
+    products = [
+        {
+            "id": i, "name": f"Product {i}", "description": "", "price": rng.uniform(5, 500),
+            "category": rng.choice(list(ProductCategory)),
+            "status": ProductStatus.ACTIVE if rng.random() < 0.8 else ProductStatus.DRAFT,
+            "seller_id": rng.randint(1, n_users), "created_at": created(i),
+        }
+        for i in range(1, rows + 1)
+    ]
+    courses = [
+        {
+            "id": i, "title": f"Course {i}", "description": "", "level": CourseLevel.BEGINNER, "price": 10.0,
+            "status": CourseStatus.PUBLISHED, "mentor_id": rng.randint(1, n_users), "created_at": created(i),
+        }
+        for i in range(1, rows + 1)
+    ]
+    articles = [
+        {
+            "id": i, "title": f"Article {i}", "slug": f"article-{i}", "content": "",
+            "status": ArticleStatus.PUBLISHED if rng.random() < 0.7 else ArticleStatus.DRAFT,
+            "author_id": rng.randint(1, n_users), "created_at": created(i),
+        }
+        for i in range(1, rows + 1)
+    ]
+    orders = [
+        {"id": i, "buyer_id": rng.randint(1, n_users), "status": "paid", "total_amount": 0.0, "created_at": created(i)}
+        for i in range(1, rows + 1)
+    ]
+    order_items = [
+        {
+            "order_id": rng.randint(1, rows), "product_id": rng.randint(1, rows),
+            "unit_price": 10.0, "quantity": rng.randint(1, 3), "sold_at": created(i),
+        }
+        for i in range(1, rows * 3 + 1)
+    ]
+    applications = [
+        {
+            "user_id": rng.randint(1, n_users), "requested_role": "seller", "reason": "",
+            "status": "pending" if rng.random() < 0.05 else rng.choice(["approved", "rejected"]),
+            "applied_at": created(i),
+        }
+        for i in range(1, rows + 1)
+    ]
+
+    with engine.begin() as conn:
+        for model, data in [
+            (User, users), (Product, products), (Course, courses), (Article, articles),
+            (Order, orders), (OrderItem, order_items), (RoleApplication, applications),
+        ]:
+            conn.execute(insert(model), data)
+
+
+def use_old_indexes(engine) -> None:
+    """Swap the composite indexes for the single-column ones they replaced."""
+    with engine.begin() as conn:
+        for name, replaced in NEW_INDEXES.items():
+            conn.execute(text(f"DROP INDEX {name}"))
+            if replaced:
+                table, column = replaced
+                conn.execute(text(f"CREATE INDEX ix_{table}_{column} ON {table} ({column})"))
+        conn.execute(text("ANALYZE"))
+
+
+def use_new_indexes(engine) -> None:
+    with engine.begin() as conn:
+        for name, replaced in NEW_INDEXES.items():
+            if replaced:
+                conn.execute(text(f"DROP INDEX ix_{replaced[0]}_{replaced[1]}"))
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name in NEW_INDEXES:
+                    index.create(conn)
+        conn.execute(text("ANALYZE"))
+
+
+def report(engine, queries, repeat: int) -> None:
+    explain = "EXPLAIN QUERY PLAN" if engine.dialect.name == "sqlite" else "EXPLAIN ANALYZE"
+    with engine.connect() as conn:
+        for label, stmt in queries.items():
+            sql = str(stmt.compile(engine, compile_kwargs={"literal_binds": True}))
+            plan = conn.execute(text(f"{explain} {sql}")).all()
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                conn.execute(stmt).all()
+                timings.append((time.perf_counter() - start) * 1000)
+            print(f"\n  {label}: {statistics.mean(timings):.2f} ms")
+            for row in plan:
+                print(f"    {row[-1]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare query plans before/after the composite indexes")
+    parser.add_argument("--rows", type=int, default=20000, help="rows per content table")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per query")
+    parser.add_argument("--url", default=None, help="scratch database URL (default: temporary SQLite file)")
+    args = parser.parse_args()
+
+    tmpdir = None
+    url = args.url
+    if url is None:
+        tmpdir = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{os.path.join(tmpdir.name, 'explain.db')}"
+
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    print(f"🌱 Seeding {args.rows} rows per table into {engine.url.render_as_string(hide_password=True)}")
+    seed(engine, args.rows)
+    queries = build_queries()
+
+    print("\n=== Before: single-column foreign key indexes ===")
+    use_old_indexes(engine)
+    report(engine, queries, args.repeat)
+
+    print("\n=== After: query-shaped composite indexes ===")
+    use_new_indexes(engine)
+    report(engine, queries, args.repeat)
+
+    engine.dispose()
+    if tmpdir is not None:
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
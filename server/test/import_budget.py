@@ -0,0 +1,113 @@
+"""
+Import-time budget check for KFATS LMS startup.
+
+Imports modules in a fresh interpreter under ``python -X importtime`` and
+fails when:
+- importing `main` (what each new uvicorn worker does) takes longer than
+  the budget, or
+- a module that is deliberately deferred to first use is imported anyway
+  (the psycopg2 sync engine, smtplib for reset emails, jose/passlib when
+  only settings are needed).
+
+The slowest top-level imports and the cost of the watched heavy
+dependencies are printed so regressions are easy to pin down.
+
+Usage (from server/):
+    PYTHONPATH=. python test/import_budget.py
+    PYTHONPATH=. python test/import_budget.py --budget-ms 1500 --runs 5
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parents[1]
+
+# module imported -> modules that must not be loaded as a side effect
+DEFERRED = {
+    "main": ["psycopg2", "smtplib", "email.mime.text"],
+    "app.core.config": ["jose", "passlib", "sqlalchemy"],
+}
+
+# Heavy dependencies whose cumulative import cost is reported for `main`
+WATCHED = [
+    "fastapi", "sqlalchemy", "pydantic", "pydantic_settings", "jose.jwt", "passlib.context",
+    "app.core.database", "app.core.security", "app.models", "app.routers",
+]
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(module: str) -> dict:
+    """Import `module` in a new interpreter; return {name: (self_us, cumulative_us, depth)}."""
+    env = {**os.environ, "PYTHONPATH": str(SERVER_DIR)}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SERVER_DIR, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"❌ import {module} failed:\n{proc.stderr[-2000:]}")
+
+    times = {}
+    for line in proc.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            times[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check import-time budget for app startup")
+    parser.add_argument("--budget-ms", type=float, default=2000.0, help="max time to import main")
+    parser.add_argument("--runs", type=int, default=3, help="take the fastest of this many runs")
+    parser.add_argument("--top", type=int, default=10, help="number of slowest imports to list")
+    args = parser.parse_args()
+
+    failures = []
+
+    runs = [import_times("main") for _ in range(args.runs)]
+    best = min(runs, key=lambda times: times["main"][1])
+    total_ms = best["main"][1] / 1000
+
+    print(f"📦 import main: {total_ms:.0f} ms (fastest of {args.runs}, budget {args.budget_ms:.0f} ms)")
+    if total_ms > args.budget_ms:
+        failures.append(f"import main took {total_ms:.0f} ms")
+
+    print("\nWatched dependencies (cumulative, first import wins):")
+    for name in WATCHED:
+        if name in best:
+            print(f"   {name:<24} {best[name][1] / 1000:8.1f} ms")
+        else:
+            print(f"   {name:<24} {'not imported':>11}")
+
+    print("\nSlowest top-level imports of main:")
+    direct = sorted(
+        ((cumulative, name) for name, (_, cumulative, depth) in best.items() if depth == 1),
+        reverse=True,
+    )
+    for cumulative, name in direct[:args.top]:
+        print(f"   {name:<40} {cumulative / 1000:8.1f} ms")
+
+    print("\nDeferred imports:")
+    for module, deferred in DEFERRED.items():
+        times = best if module == "main" else import_times(module)
+        for name in deferred:
+            loaded = name in times
+            print(f"   import {module:<16} -> {name:<18} {'❌ loaded' if loaded else '✅ deferred'}")
+            if loaded:
+                failures.append(f"import {module} loads {name}")
+
+    if failures:
+        print(f"\n❌ Import budget failed: {'; '.join(failures)}")
+        return 1
+
+    print("\n✅ Startup imports within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,390 @@
+"""
+Query-count budget check for KFATS LMS API routes.
+
+Boots the app against a freshly seeded SQLite database, calls every route
+in the OpenAPI schema through httpx.ASGITransport and records how many SQL
+statements each request issued (read from the Server-Timing header). The
+run fails when a route exceeds its budget in query_budgets.json, when a
+route has no recorded budget yet, or when a route answers with a 5xx
+(its count would only cover the queries issued before the error). Routes
+that cannot run on SQLite are listed in `SKIPPED_ROUTES` with the reason.
+
+Seed data has several rows per table so per-row lookups (N+1 queries)
+show up as budget overruns rather than staying hidden behind one row.
+
+Usage (from server/):
+    PYTHONPATH=. python test/query_budget.py            # check budgets
+    PYTHONPATH=. python test/query_budget.py --update   # record current counts
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+# Configure the app before anything imports app.core.config
+DB_PATH = Path(tempfile.gettempdir()) / "kfats_query_budget.db"
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+os.environ["DEBUG"] = "false"
+os.environ["RATE_LIMIT_BACKEND"] = "memory"
+os.environ["RATE_LIMIT_REQUESTS_PER_MINUTE"] = "1000000"
+os.environ["PASSWORD_BCRYPT_ROUNDS"] = "4"
+# Measure the uncached path so counts do not depend on request order
+os.environ["PRINCIPAL_CACHE_TTL_SECONDS"] = "0"
+os.environ["SEARCH_CACHE_TTL_SECONDS"] = "0"
+os.environ["AUTH_STATELESS_MODE"] = "false"
+
+import httpx  # noqa: E402
+
+from app.core.database import AsyncSessionLocal, create_tables_async  # noqa: E402
+from app.core.security import create_access_token, get_password_hash  # noqa: E402
+from app.models.article import Article  # noqa: E402
+from app.models.course import Course, Enrollment  # noqa: E402
+from app.models.order import Order  # noqa: E402
+from app.models.order_item import OrderItem  # noqa: E402
+from app.models.product import Product  # noqa: E402
+from app.models.user import RoleApplication, User as DBUser  # noqa: E402
+from app.schemas.common import (  # noqa: E402
+    ArticleStatus, CourseLevel, CourseStatus, ProductCategory, UserRole, UserStatus
+)
+
+BUDGET_FILE = Path(__file__).with_name("query_budgets.json")
+SEED_ROWS = 5
+PASSWORD = "password123"
+
+# Who calls each route; anything not listed runs as admin
+ROUTE_ACTORS = {
+    "GET /api/v1/courses/my-courses": "mentor",
+    "GET /api/v1/courses/my-enrollments": "student",
+    "GET /api/v1/articles/my-articles": "writer",
+    "GET /api/v1/products/my-products": "seller",
+    "GET /api/v1/mentors/me/overview": "mentor",
+    "GET /api/v1/mentors/me/students": "mentor",
+    "GET /api/v1/mentors/me/activity": "mentor",
+    "GET /api/v1/seller/analytics/revenue": "seller",
+    "GET /api/v1/seller/analytics/orders": "seller",
+    "GET /api/v1/seller/analytics/products": "seller",
+    "GET /api/v1/orders/": "student",
+    "GET /api/v1/orders/seller/": "seller",
+    "GET /api/v1/role-applications/my-applications": "user",
+    "POST /api/v1/role-applications/apply": "user",
+    "POST /api/v1/auth/role-upgrade": "user",
+    "POST /api/v1/auth/logout": "leaving",
+    "POST /api/v1/courses/{course_id}/enroll": "writer",
+    "POST /api/v1/courses/": "mentor",
+    "POST /api/v1/articles/": "writer",
+    "POST /api/v1/products/": "seller",
+    "POST /api/v1/orders/": "student",
+    "POST /api/v1/password/change": "student",
+    "PUT /api/v1/users/me": "student",
+    "DELETE /api/v1/role-applications/{application_id}": "doomed",
+}
+
+# Request bodies for routes whose generated example would be rejected
+ROUTE_BODIES = {
+    "POST /api/v1/auth/register": lambda ids: {
+        "email": "newcomer@kfats.edu", "username": "newcomer", "full_name": "New Comer",
+        "password": PASSWORD, "confirm_password": PASSWORD,
+    },
+    "POST /api/v1/auth/login": lambda ids: {"email": "student@kfats.edu", "password": PASSWORD},
+    "POST /api/v1/auth/role-upgrade": lambda ids: {"new_role": "student"},
+    "PUT /api/v1/users/{user_id}/role": lambda ids: {"new_role": "writer"},
+    "PUT /api/v1/courses/enrollments/{enrollment_id}/progress": lambda ids: {"progress_percentage": 50},
+    "POST /api/v1/role-applications/apply": lambda ids: {
+        "requested_role": "writer", "reason": "I would like to write articles",
+    },
+    "PUT /api/v1/role-applications/{application_id}/review": lambda ids: {"status": "approved"},
+    "PUT /api/v1/content-management/content/{content_type}/{content_id}/toggle-status": lambda ids: {
+        "action": "publish",
+    },
+    "POST /api/v1/password/change": lambda ids: {
+        "current_password": PASSWORD, "new_password": "newpassword123", "confirm_new_password": "newpassword123",
+    },
+    "POST /api/v1/password/forgot": lambda ids: {"email": "student@kfats.edu"},
+    "POST /api/v1/password/reset": lambda ids: {"token": "not-a-real-token", "new_password": "newpassword123"},
+    "POST /api/v1/orders/": lambda ids: {
+        "buyer_id": ids["student"],
+        "items": [{"product_id": ids["product_id"], "unit_price": 25.0, "quantity": 1}],
+    },
+    "PUT /api/v1/orders/{order_id}/status": lambda ids: {"status": "shipped"},
+    "POST /api/v1/orders/payments/webhook": lambda ids: {"payment_reference": "ref-0", "status": "paid"},
+}
+
+# Path parameters that differ from the defaults below
+ROUTE_PARAMS = {
+    "DELETE /api/v1/users/{user_id}": {"user_id": "doomed"},
+    "PUT /api/v1/users/{user_id}/role": {"user_id": "leaving"},
+    "PUT /api/v1/users/{user_id}/toggle-status": {"user_id": "leaving"},
+    "DELETE /api/v1/role-applications/{application_id}": {"application_id": "doomed_application_id"},
+    "DELETE /api/v1/courses/{course_id}": {"course_id": "last_course_id"},
+    "DELETE /api/v1/articles/{article_id}": {"article_id": "last_article_id"},
+    "DELETE /api/v1/products/{product_id}": {"product_id": "last_product_id"},
+}
+
+# Query strings for routes with required query parameters
+ROUTE_QUERY = {
+    "GET /api/v1/search/": {"query": "painting"},
+    "GET /api/v1/search/suggest": {"query": "pa"},
+}
+
+# Routes not measured here, with the reason
+POSTGRES_ONLY = "groups by date_trunc(), which SQLite does not have"
+SKIPPED_ROUTES = {
+    "GET /api/v1/analytics/courses": POSTGRES_ONLY,
+    "GET /api/v1/analytics/users": POSTGRES_ONLY,
+    "GET /api/v1/seller/analytics/orders": POSTGRES_ONLY,
+    "GET /api/v1/seller/analytics/revenue": POSTGRES_ONLY,
+}
+
+
+async def seed() -> dict:
+    """Create tables and sample rows; returns ids used to fill path params."""
+    if DB_PATH.exists():
+        DB_PATH.unlink()
+    await create_tables_async()
+
+    ids = {}
+    async with AsyncSessionLocal() as db:
+        hashed = get_password_hash(PASSWORD)
+        users = {}
+        for name, role in [
+            ("admin", UserRole.ADMIN), ("mentor", UserRole.MENTOR), ("student", UserRole.STUDENT),
+            ("writer", UserRole.WRITER), ("seller", UserRole.SELLER), ("user", UserRole.USER),
+            ("leaving", UserRole.STUDENT), ("doomed", UserRole.STUDENT),
+        ]:
+            users[name] = DBUser(
+                email=f"{name}@kfats.edu", username=name, full_name=name.title(),
+                hashed_password=hashed, role=role, status=UserStatus.ACTIVE,
+            )
+            db.add(users[name])
+        await db.flush()
+
+        courses, articles, products = [], [], []
+        for i in range(SEED_ROWS):
+            courses.append(Course(
+                title=f"Course {i}", slug=f"course-{i}", description="Drawing basics",
+                level=CourseLevel.BEGINNER, price=10.0 + i, status=CourseStatus.PUBLISHED,
+                mentor_id=users["mentor"].id,
+            ))
+            articles.append(Article(
+                title=f"Article {i}", slug=f"article-{i}", content="Colour theory",
+                status=ArticleStatus.PUBLISHED, author_id=users["writer"].id,
+            ))
+            products.append(Product(
+                name=f"Painting {i}", slug=f"painting-{i}", description="Oil on canvas",
+                price=25.0, category=ProductCategory.PAINTING, stock_quantity=100,
+                seller_id=users["seller"].id,
+            ))
+        db.add_all(courses + articles + products)
+        await db.flush()
+
+        # The last course has no enrollments so it can be deleted
+        enrollments = [
+            Enrollment(student_id=users["student"].id, course_id=course.id) for course in courses[:-1]
+        ]
+        db.add_all(enrollments)
+
+        orders = []
+        for i in range(SEED_ROWS):
+            order = Order(
+                buyer_id=users["student"].id, seller_id=users["seller"].id, status="pending",
+                total_amount=50.0, payment_reference=f"ref-{i}",
+            )
+            db.add(order)
+            await db.flush()
+            orders.append(order)
+            db.add_all([
+                OrderItem(order_id=order.id, product_id=product.id, unit_price=25.0, quantity=1)
+                for product in products[:2]
+            ])
+
+        applications = [
+            RoleApplication(user_id=users[name].id, requested_role="mentor", reason="Teaching experience")
+            for name in ("student", "leaving", "doomed")
+        ]
+        db.add_all(applications)
+        await db.commit()
+
+        ids.update({name: user.id for name, user in users.items()})
+        ids.update({
+            "user_id": users["student"].id,
+            "course_id": courses[0].id,
+            "last_course_id": courses[-1].id,
+            "article_id": articles[0].id,
+            "last_article_id": articles[-1].id,
+            "product_id": products[0].id,
+            "last_product_id": products[-1].id,
+            "enrollment_id": enrollments[0].id,
+            "order_id": orders[0].id,
+            "application_id": applications[0].id,
+            "doomed_application_id": applications[-1].id,
+            "content_id": courses[0].id,
+        })
+    return ids
+
+
+def token_for(user_id: int, name: str, role: UserRole) -> str:
+    return create_access_token(data={
+        "sub": name, "user_id": user_id, "role": role.value, "email": f"{name}@kfats.edu",
+        "status": UserStatus.ACTIVE.value, "ver": 0,
+    })
+
+
+def fill_path(path: str, key: str, ids: dict) -> str:
+    overrides = ROUTE_PARAMS.get(key, {})
+
+    def value(match):
+        name = match.group(1)
+        if name in overrides:
+            return str(ids[overrides[name]])
+        if name == "slug":
+            prefix = path.split("/")[3]
+            return {"courses": "course-0", "articles": "article-0", "products": "painting-0"}[prefix]
+        if name == "category":
+            return ProductCategory.PAINTING.value
+        if name == "content_type":
+            return "courses"
+        return str(ids[name])
+
+    return re.sub(r"{(\w+)}", value, path)
+
+
+def example_for(schema: dict, components: dict):
+    """Build a minimal instance of a JSON schema (required fields only)."""
+    if "$ref" in schema:
+        return example_for(components[schema["$ref"].rsplit("/", 1)[-1]], components)
+    if "anyOf" in schema:
+        options = [option for option in schema["anyOf"] if option.get("type") != "null"]
+        return example_for(options[0], components) if options else None
+    if "enum" in schema:
+        return schema["enum"][0]
+    kind = schema.get("type")
+    if kind == "object":
+        return {
+            name: example_for(prop, components)
+            for name, prop in schema.get("properties", {}).items()
+            if name in schema.get("required", [])
+        }
+    if kind == "array":
+        return []
+    if kind == "integer":
+        return max(1, schema.get("minimum", 1))
+    if kind == "number":
+        return 10.0
+    if kind == "boolean":
+        return True
+    if schema.get("format") == "email":
+        return "example@kfats.edu"
+    return "sample text"
+
+
+def request_body(key: str, operation: dict, components: dict, ids: dict):
+    if key in ROUTE_BODIES:
+        return {"json": ROUTE_BODIES[key](ids)}
+    content = operation.get("requestBody", {}).get("content", {})
+    if "application/x-www-form-urlencoded" in content:
+        return {"data": {"username": "student@kfats.edu", "password": PASSWORD}}
+    if "application/json" in content:
+        return {"json": example_for(content["application/json"]["schema"], components)}
+    return {}
+
+
+def query_count(response: httpx.Response) -> int:
+    match = re.search(r'desc="(\d+) queries"', response.headers.get("server-timing", ""))
+    return int(match.group(1)) if match else 0
+
+
+async def measure() -> dict:
+    """Call every route once and return {route: (status, queries)}."""
+    ids = await seed()
+
+    import main
+
+    schema = main.app.openapi()
+    components = schema.get("components", {}).get("schemas", {})
+    roles = {
+        "admin": UserRole.ADMIN, "mentor": UserRole.MENTOR, "student": UserRole.STUDENT,
+        "writer": UserRole.WRITER, "seller": UserRole.SELLER, "user": UserRole.USER,
+        "leaving": UserRole.STUDENT, "doomed": UserRole.STUDENT,
+    }
+    headers = {
+        name: {"Authorization": f"Bearer {token_for(ids[name], name, role)}"}
+        for name, role in roles.items()
+    }
+
+    # Reads first, then writes, deletes last so every route sees the seed data
+    order = {"get": 0, "post": 1, "put": 2, "delete": 3}
+    routes = sorted(
+        (order.get(method, 4), path, method, operation)
+        for path, operations in schema["paths"].items()
+        for method, operation in operations.items()
+    )
+
+    results = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        for _, path, method, operation in routes:
+            key = f"{method.upper()} {path}"
+            if key in SKIPPED_ROUTES:
+                continue
+            response = await client.request(
+                method.upper(),
+                fill_path(path, key, ids),
+                headers=headers[ROUTE_ACTORS.get(key, "admin")],
+                params=ROUTE_QUERY.get(key),
+                **request_body(key, operation, components, ids),
+            )
+            results[key] = (response.status_code, query_count(response))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check SQL query budgets for every API route")
+    parser.add_argument("--update", action="store_true", help="record current counts as budgets")
+    args = parser.parse_args()
+
+    results = asyncio.run(measure())
+    budgets = json.loads(BUDGET_FILE.read_text()) if BUDGET_FILE.exists() else {}
+
+    failures = []
+    print(f"{'route':<90} {'status':>6} {'queries':>7} {'budget':>6}")
+    for key, (status_code, count) in results.items():
+        budget = budgets.get(key)
+        flag = ""
+        if status_code >= 500:
+            flag = "  ❌ server error"
+            failures.append(key)
+        elif budget is None:
+            flag = "  ❌ no budget"
+            failures.append(key)
+        elif count > budget:
+            flag = "  ❌ over budget"
+            failures.append(key)
+        print(f"{key:<90} {status_code:>6} {count:>7} {budget if budget is not None else '-':>6}{flag}")
+
+    for key, reason in SKIPPED_ROUTES.items():
+        print(f"{key:<90} {'skipped':>6}  {reason}")
+
+    if args.update:
+        errors = [key for key, (status_code, _) in results.items() if status_code >= 500]
+        if errors:
+            print(f"❌ Not recording budgets: {len(errors)} route(s) answered with a server error")
+            return 1
+        BUDGET_FILE.write_text(json.dumps({key: count for key, (_, count) in results.items()}, indent=2) + "\n")
+        print(f"✅ Recorded budgets for {len(results)} routes in {BUDGET_FILE.name}")
+        return 0
+
+    if failures:
+        print(f"❌ {len(failures)} route(s) failed, over or missing a query budget")
+        return 1
+
+    print(f"✅ All {len(results)} routes within their query budgets")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())